@@ -0,0 +1,2 @@
+"""Performance benchmarks for the engine.
+Run a module directly, e.g. `python -m benchmarks.spatial_index`."""
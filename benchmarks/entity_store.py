@@ -0,0 +1,73 @@
+"""Integrate N moving sprites per tick, per-sprite Rect.move vs one EntityStore step.
+Only the movement path is timed, collision is covered by benchmarks.spatial_index.
+Exits non-zero when the store path misses the frame budget."""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from wrapper.vagrantengine.entities import EntityStore
+from wrapper.vagrantengine.sprites import MoveableSprite
+
+MOVER_COUNTS = [100, 1000, 10000]
+FRAME_BUDGET_MS = 16
+
+def build(count: int, seed: int = 0) -> list[MoveableSprite]:
+    rng = random.Random(seed)
+    sprites = []
+    for _ in range(count):
+        s = MoveableSprite(x=rng.randrange(4000), y=rng.randrange(4000), width=24, height=36)
+        s.apply_movement_vector(rng.choice((-1, 1)), rng.choice((-1, 0, 1)))
+        sprites.append(s)
+    return sprites
+
+def run_rects(count: int, ticks: int) -> float:
+    sprites = build(count)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for s in sprites:
+            s.update()
+    return ((time.perf_counter() - start) / ticks) * 1000
+
+def run_store(count: int, ticks: int) -> float:
+    sprites = build(count)
+    store = EntityStore()
+    for s in sprites:
+        store.add(s)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        # Attached sprites aren't update()d, same as Stage.update
+        store.step()
+    return ((time.perf_counter() - start) / ticks) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--movers", type=int, nargs="*", default=MOVER_COUNTS)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    print(f"{'movers':>8} {'path':>8} {'ms/tick':>10} {'budget':>8}")
+    over_budget = []
+    for count in args.movers:
+        for name, run in (("rects", run_rects), ("store", run_store)):
+            ms = run(count, args.ticks)
+            within = "ok" if ms <= FRAME_BUDGET_MS else "over"
+            print(f"{count:>8} {name:>8} {ms:>10.3f} {within:>8}")
+            if name == "store" and ms > FRAME_BUDGET_MS:
+                over_budget.append(f"{count} movers: {ms:.3f} ms")
+
+    # The store path has to fit a frame, plain rects are only the comparison
+    if over_budget:
+        print(f"OVER BUDGET ({FRAME_BUDGET_MS} ms) store path, {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
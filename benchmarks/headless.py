@@ -0,0 +1,56 @@
+"""Headless sim throughput: Stage.update ticks per second on a synthetic map,
+with no display mode set at all. Uncapped by default, or on a virtual clock."""
+import argparse
+import logging
+import os
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from wrapper.vagrantengine.assets import AssetCache
+from wrapper.vagrantengine.driver import run_headless
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.map_loader import MapLoader
+from wrapper.vagrantengine.scheduler import Scheduler, VirtualClock
+
+from .synthetic import make_assets, make_map, populate, write_map
+
+MOVER_COUNTS = [0, 100, 1000]
+
+def build_stage(assets: str, map_file: str, movers: int, seed: int = 0) -> Stage:
+    stage = Stage()
+    loader = MapLoader(assets, cache=AssetCache())
+    loader.load_map_to_stage(map_file, stage)
+    for sprite, script in populate(loader, stage, movers, seed):
+        # Keep walking the first direction of the script
+        sprite.movement_vector = script[0]
+    return stage
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--movers", type=int, nargs="*", default=MOVER_COUNTS)
+    parser.add_argument("--tick-rate", type=int, default=None, help="Run on a virtual clock at this rate instead of uncapped")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    pygame.init() # No display mode, everything stays unconverted
+
+    with tempfile.TemporaryDirectory() as root:
+        assets = make_assets(root)
+        map_file = write_map(assets, "headless.json", make_map(128, 128, 500, 500))
+
+        print(f"{'movers':>8} {'ticks/s':>10} {'ms/tick':>10}")
+        for movers in args.movers:
+            stage = build_stage(assets, map_file, movers)
+            scheduler = None
+            if args.tick_rate:
+                scheduler = Scheduler(tick_rate=args.tick_rate, render_rate=args.tick_rate,
+                    clock=VirtualClock(1000 / args.tick_rate))
+            result = run_headless(stage, args.ticks, scheduler)
+            print(f"{movers:>8} {result['tps']:>10.0f} {result['ms_per_tick']:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Map load time, Tiled JSON (plain & zlib layers) vs baked binary bundle, across map sizes.
+Every load is cold: a fresh asset cache, so nothing is reused between runs."""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from wrapper.vagrantengine.assets import AssetCache
+from wrapper.vagrantengine.bundle import bake_map
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.map_loader import MapLoader
+
+from .synthetic import make_assets, make_map, write_map
+
+# (columns, rows, walls, props)
+MAP_SIZES = [(32, 32, 50, 50), (128, 128, 500, 500), (512, 512, 5000, 5000)]
+
+def time_load(assets: str, map_file: str, repeat: int) -> float:
+    """Best of repeat, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        loader = MapLoader(assets, cache=AssetCache())
+        stage = Stage()
+        start = time.perf_counter()
+        if map_file.endswith(".json"):
+            loader.load_map_to_stage(map_file, stage)
+        else:
+            loader.load_bundle_to_stage(map_file, stage)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    with tempfile.TemporaryDirectory() as root:
+        assets = make_assets(root)
+        baker = MapLoader(assets, cache=AssetCache())
+
+        print(f"{'map':>12} {'objects':>8} {'json ms':>10} {'zlib ms':>10} {'bundle ms':>10} {'json KB':>8} {'zlib KB':>8}")
+        for columns, rows, walls, props in MAP_SIZES:
+            name = write_map(assets, f"synthetic_{columns}x{rows}.json", make_map(columns, rows, walls, props))
+            zlib_name = write_map(assets, f"synthetic_{columns}x{rows}_zlib.json", make_map(columns, rows, walls, props, compression="zlib"))
+            bundle = os.path.basename(bake_map(baker, name))
+
+            json_ms = time_load(assets, name, args.repeat)
+            zlib_ms = time_load(assets, zlib_name, args.repeat)
+            bundle_ms = time_load(assets, bundle, args.repeat)
+            json_kb = os.path.getsize(os.path.join(assets, "maps", name)) / 1024
+            zlib_kb = os.path.getsize(os.path.join(assets, "maps", zlib_name)) / 1024
+            print(f"{columns}x{rows:<8} {walls + props:>8} {json_ms:>10.1f} {zlib_ms:>10.1f} {bundle_ms:>10.1f} {json_kb:>8.0f} {zlib_kb:>8.0f}")
+
+if __name__ == "__main__":
+    main()
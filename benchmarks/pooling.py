@@ -0,0 +1,88 @@
+"""Spawn & despawn churn: every tick spawns a burst of short-lived actors
+(projectiles, NPCs) and despawns the expired ones, either building fresh
+sprites each time or reusing them from the stage's SpritePool.
+Reports tick time spread and how many GC collections the churn triggered."""
+import argparse
+import gc
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from wrapper.vagrantengine.assets import AssetCache
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.map_loader import MapLoader
+from wrapper.vagrantengine.pooling import SpritePools
+
+from .synthetic import make_assets, make_map, write_map
+
+SPAWNS_PER_TICK = [5, 20, 50]
+LIFETIME = 30 # Ticks a spawned actor lives
+
+def run(assets: str, map_file: str, spawns: int, ticks: int, pooled: bool) -> dict:
+    stage = Stage()
+    loader = MapLoader(assets, cache=AssetCache())
+    loader.load_map_to_stage(map_file, stage)
+    if not pooled:
+        # No pools at all, despawned sprites are dropped
+        stage.pools = SpritePools()
+    width, height = stage.boundary
+
+    def spawn(i: int):
+        x, y = (i * 37) % width, (i * 53) % height
+        if pooled:
+            sprite = loader.load_actor_to_stage("Player", x, y, stage, 2)
+        else:
+            sprite = loader.build_actor("Player", x, y)
+            stage.spawn(sprite, 2)
+        sprite.movement_vector = (sprite.speed, 0)
+        return sprite
+
+    live = [] # type: list[tuple[int, object]]
+    samples = []
+    collections = sum(s["collections"] for s in gc.get_stats())
+    for tick in range(ticks):
+        start = time.perf_counter()
+        while live and live[0][0] <= tick:
+            stage.despawn(live.pop(0)[1])
+        for i in range(spawns):
+            live.append((tick + LIFETIME, spawn(tick * spawns + i)))
+        stage.update()
+        samples.append((time.perf_counter() - start) * 1000)
+    collections = sum(s["collections"] for s in gc.get_stats()) - collections
+
+    samples.sort()
+    return {
+        "median": statistics.median(samples),
+        "p99": samples[min(int(len(samples) * 0.99), len(samples) - 1)],
+        "max": samples[-1],
+        "gc": collections
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--spawns", type=int, nargs="*", default=SPAWNS_PER_TICK)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    with tempfile.TemporaryDirectory() as root:
+        assets = make_assets(root)
+        map_file = write_map(assets, "pooling.json", make_map(128, 128, 200, 200))
+
+        print(f"{'spawns':>8} {'path':>8} {'median ms':>10} {'p99 ms':>10} {'max ms':>10} {'gc runs':>8}")
+        for spawns in args.spawns:
+            for name, pooled in (("fresh", False), ("pooled", True)):
+                r = run(assets, map_file, spawns, args.ticks, pooled)
+                print(f"{spawns:>8} {name:>8} {r['median']:>10.3f} {r['p99']:>10.3f} {r['max']:>10.3f} {r['gc']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Replay a recorded input session headless and time every tick of it:
+
+    VAGRANT_RECORD_INPUT=session.vgir python -m wrapper.sandbox
+    python -m benchmarks.replay session.vgir --output replay.json --baseline replay_baseline.json
+
+The recording's map is loaded from --assets (the sandbox assets by default).
+Results use the suite's JSON shape, so baselines are checked the same way."""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from wrapper.vagrantengine.assets import AssetCache
+from wrapper.vagrantengine.driver import run_headless
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.inputs import InputReplay
+from wrapper.vagrantengine.map_loader import MapLoader
+
+from .suite import DEFAULT_THRESHOLD, compare, summarize
+
+SANDBOX_ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "wrapper", "assets")
+
+def replay_session(assets: str, recording: str) -> tuple[Stage, list[float]]:
+    """Load the recording's map fresh and replay it, returns the stage & ms per tick."""
+    replay = InputReplay(recording)
+    stage = Stage()
+    MapLoader(assets, cache=AssetCache()).load_map_to_stage(replay.metadata["map"], stage)
+    replay.attach(stage)
+
+    samples = [] # type: list[float]
+    def timed_update():
+        start = time.perf_counter()
+        replay.update()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    run_headless(stage, replay.ticks, update=timed_update)
+    return stage, samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording")
+    parser.add_argument("--assets", default=SANDBOX_ASSETS)
+    parser.add_argument("--repeat", type=int, default=3, help="Replays, tick times are pooled")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, as a fraction")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    pygame.init()
+
+    samples = []
+    positions = None
+    for _ in range(args.repeat):
+        stage, run = replay_session(args.assets, args.recording)
+        samples.extend(run)
+        # Same input, same map: every replay has to end up in the same place
+        ended = [tuple(s.rect) for s in stage.sprite_layers]
+        if positions is not None and ended != positions:
+            logging.disable(logging.NOTSET)
+            logging.warning("Replays diverged, the session isn't deterministic")
+        positions = ended
+
+    name = os.path.splitext(os.path.basename(args.recording))[0]
+    metrics = {"update_ms": summarize(samples)}
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "scenarios": {name: {"ticks": len(samples) // args.repeat, "metrics": metrics}}
+    }
+    m = metrics["update_ms"]
+    print(f"{name}: {len(samples) // args.repeat} ticks x {args.repeat}, update ms "
+        f"median {m['median']:.3f} p95 {m['p95']:.3f} max {m['max']:.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, {})
+        for r in regressions:
+            print(f"REGRESSION {r}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the collision index backends under moving crowds.
+Each tick, every mover takes a step, is re-indexed and queries its neighbourhood,
+which is what Stage.update does per moved sprite."""
+import argparse
+import random
+import time
+
+from wrapper.vagrantengine.spatial import INDEX_BACKENDS
+
+MOVER_COUNTS = [100, 1000, 10000]
+MOVER_SIZE = 24
+# World grows with the crowd so density stays comparable
+AREA_PER_MOVER = 64 * 64
+
+class Mover:
+    """Bare stand-in for a sprite, only needs identity & a bbox."""
+    __slots__ = ("x", "y", "dx", "dy")
+
+    def __init__(self, x, y, dx, dy):
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+
+    @property
+    def bbox(self):
+        return (self.x, self.y, self.x + MOVER_SIZE, self.y + MOVER_SIZE)
+
+def run(backend: str, movers: int, ticks: int, seed: int = 0, **options) -> float:
+    """Returns mean milliseconds per tick."""
+    rng = random.Random(seed)
+    side = int((movers * AREA_PER_MOVER) ** 0.5)
+    world = (0, 0, side, side)
+
+    index = INDEX_BACKENDS[backend](bbox=world, **options)
+    population = [
+        Mover(rng.randrange(side - MOVER_SIZE), rng.randrange(side - MOVER_SIZE), rng.choice((-3, 0, 3)), rng.choice((-3, 0, 3)))
+        for _ in range(movers)
+    ]
+    for m in population:
+        index.insert(m, m.bbox)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for m in population:
+            old_bbox = m.bbox
+            # Bounce off the world edges
+            if not 0 <= m.x + m.dx <= side - MOVER_SIZE: m.dx = -m.dx
+            if not 0 <= m.y + m.dy <= side - MOVER_SIZE: m.dy = -m.dy
+            m.x += m.dx
+            m.y += m.dy
+            index.move(m, old_bbox, m.bbox)
+            index.intersect(m.bbox)
+    elapsed = time.perf_counter() - start
+
+    return (elapsed / ticks) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--cell-size", type=int, default=64)
+    parser.add_argument("--movers", type=int, nargs="*", default=MOVER_COUNTS)
+    args = parser.parse_args()
+
+    print(f"{'movers':>8} {'backend':>10} {'ms/tick':>10}")
+    for count in args.movers:
+        for backend in INDEX_BACKENDS:
+            options = {"cell_size": args.cell_size} if backend == "hash" else {}
+            ms = run(backend, count, args.ticks, **options)
+            print(f"{count:>8} {backend:>10} {ms:>10.3f}")
+
+if __name__ == "__main__":
+    main()
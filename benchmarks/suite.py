@@ -0,0 +1,215 @@
+"""Scenario benchmark suite: map load, Stage.update, the collision pass inside it,
+and offscreen Renderer.render, timed separately per synthetic scenario.
+Results are written as JSON and can be checked against a stored baseline:
+
+    python -m benchmarks.suite --output results.json --baseline benchmarks/baseline.json
+
+Every run also times a fixed reference workload. Baseline timings are scaled by
+the ratio of the two runs' reference times before comparing, so a baseline
+recorded on another (faster or slower) host still compares like for like.
+Exits non-zero when any metric regressed past its threshold."""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from wrapper.vagrantengine import game
+from wrapper.vagrantengine.assets import AssetCache
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.map_loader import MapLoader
+from wrapper.vagrantengine.rendering import Renderer
+
+from .synthetic import drive, make_assets, make_map, populate, write_map
+
+SCENARIOS = {
+    # name: map columns, rows, walls, props, scripted actors
+    "small": {"columns": 32, "rows": 32, "walls": 50, "props": 50, "actors": 10},
+    "medium": {"columns": 128, "rows": 128, "walls": 500, "props": 500, "actors": 100},
+    "crowd": {"columns": 64, "rows": 64, "walls": 200, "props": 200, "actors": 1000},
+    "large": {"columns": 512, "rows": 512, "walls": 5000, "props": 5000, "actors": 100}
+}
+SCREEN_SIZE = (800, 600)
+# Slower by more than this fraction of the baseline is a regression
+DEFAULT_THRESHOLD = 0.25
+# Differences under this many ms are noise, never regressions
+NOISE_FLOOR_MS = 0.05
+REFERENCE_REPEAT = 15 # Reference workload runs, the median is kept
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 0.95),
+        "max": max(samples)
+    }
+
+def reference_ms(repeat: int = REFERENCE_REPEAT) -> float:
+    """Median time of a fixed workload shaped like a frame: interpreted loops
+    over tuples plus small blits. Stands in for the host's speed."""
+    target = pygame.Surface((256, 256))
+    tile = pygame.Surface((32, 32))
+    boxes = [(i % 97, i % 89, i % 97 + 24, i % 89 + 36) for i in range(2000)]
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hits = 0
+        for a in boxes:
+            if a[0] <= 48 and a[2] >= 16 and a[1] <= 48 and a[3] >= 16:
+                hits += 1
+        for i in range(500):
+            target.blit(tile, ((i * 37) % 224, (i * 53) % 224))
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+class CollisionTimer:
+    """Stands in for game.resolve_batch, timing each call of the collision pass."""
+    def __init__(self, resolve_batch):
+        self._resolve_batch = resolve_batch
+        self.samples = [] # type: list[float]
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = self._resolve_batch(*args, **kwargs)
+        self.samples.append((time.perf_counter() - start) * 1000)
+        return result
+
+def run_scenario(assets: str, name: str, spec: dict, ticks: int, load_repeat: int, seed: int = 0) -> dict:
+    map_file = write_map(assets, f"suite_{name}.json",
+        make_map(spec["columns"], spec["rows"], spec["walls"], spec["props"], seed=seed))
+
+    # Cold loads, fresh cache each time
+    load_samples = []
+    for _ in range(load_repeat):
+        stage = Stage()
+        loader = MapLoader(assets, cache=AssetCache())
+        start = time.perf_counter()
+        loader.load_map_to_stage(map_file, stage)
+        load_samples.append((time.perf_counter() - start) * 1000)
+
+    population = populate(loader, stage, spec["actors"], seed)
+    renderer = Renderer(stage, dirty_rects=True)
+    renderer.render() # First frame composes everything, not timed
+
+    update_samples = []
+    render_samples = []
+    collision = CollisionTimer(game.resolve_batch)
+    game.resolve_batch = collision
+    try:
+        for tick in range(ticks):
+            drive(population, tick)
+            start = time.perf_counter()
+            stage.update()
+            update_samples.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            renderer.render()
+            render_samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        game.resolve_batch = collision._resolve_batch
+
+    return {
+        "spec": spec,
+        "ticks": ticks,
+        "metrics": {
+            "load_ms": summarize(load_samples),
+            "update_ms": summarize(update_samples),
+            "collision_ms": summarize(collision.samples or [0.0]),
+            "render_ms": summarize(render_samples)
+        }
+    }
+
+def host_scale(results: dict, baseline: dict) -> float:
+    """How much slower this host ran the reference workload than the baseline's.
+    1 when either run has no reference time (an absolute comparison)."""
+    current, before = results.get("reference_ms"), baseline.get("reference_ms")
+    if not current or not before:
+        return 1.0
+    return current / before
+
+def compare(results: dict, baseline: dict, threshold: float, thresholds: dict[str, float]) -> list[str]:
+    """Regressions of results against baseline, as readable lines.
+    Medians are compared, baseline ones scaled to this host (see host_scale);
+    per-metric thresholds override the default."""
+    scale = host_scale(results, baseline)
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for metric, values in scenario["metrics"].items():
+            base_values = base["metrics"].get(metric)
+            if base_values is None:
+                continue
+            current, before = values["median"], base_values["median"] * scale
+            limit = thresholds.get(metric, threshold)
+            if current - before > NOISE_FLOOR_MS and current > before * (1 + limit):
+                regressions.append(f"{name}.{metric}: {before:.3f} -> {current:.3f} ms (+{(current / before - 1) * 100 if before else float('inf'):.0f}%, limit {limit * 100:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--load-repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, as a fraction")
+    parser.add_argument("--metric-threshold", nargs=2, action="append", default=[], metavar=("METRIC", "FRACTION"),
+        help="Per-metric threshold, e.g. --metric-threshold render_ms 0.5")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE) # Offscreen with the dummy video driver
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "reference_ms": reference_ms(),
+        "scenarios": {}
+    }
+    print(f"Reference workload: {results['reference_ms']:.3f} ms")
+    with tempfile.TemporaryDirectory() as root:
+        assets = make_assets(root)
+        print(f"{'scenario':>10} {'load ms':>10} {'update ms':>10} {'collide ms':>10} {'render ms':>10}")
+        for name in args.scenarios:
+            result = run_scenario(assets, name, SCENARIOS[name], args.ticks, args.load_repeat)
+            results["scenarios"][name] = result
+            m = result["metrics"]
+            print(f"{name:>10} {m['load_ms']['median']:>10.2f} {m['update_ms']['median']:>10.3f} "
+                f"{m['collision_ms']['median']:>10.3f} {m['render_ms']['median']:>10.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        thresholds = {metric: float(fraction) for metric, fraction in args.metric_threshold}
+        if "reference_ms" not in baseline:
+            print("Baseline has no reference time, comparing absolute timings: regenerate it on this host")
+        else:
+            print(f"Host scale against baseline: x{host_scale(results, baseline):.2f}")
+        regressions = compare(results, baseline, args.threshold, thresholds)
+        for r in regressions:
+            print(f"REGRESSION {r}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
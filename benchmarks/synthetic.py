@@ -0,0 +1,122 @@
+"""Synthetic Tiled-format assets and actor populations for benchmarks.
+Maps reuse the repo's tileset, actors and object types, so only the map json is generated."""
+import base64
+import gzip
+import json
+import os
+import random
+import shutil
+import struct
+import zlib
+
+REPO_ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "wrapper", "assets")
+TILESET_SOURCE = "..\\/tilesets\\/ryokan_nightmare.json"
+TILE_COUNT = 256
+TILE_SIZE = 32
+PROP_GID = 215 # Coffee table
+
+def make_assets(root: str) -> str:
+    """Copy the shared (non-map) assets under root, returns the assets path."""
+    assets = os.path.join(root, "assets")
+    for folder in ("tilesets", "images", "actors"):
+        shutil.copytree(os.path.join(REPO_ASSETS, folder), os.path.join(assets, folder), dirs_exist_ok=True)
+    shutil.copy(os.path.join(REPO_ASSETS, "objecttypes.json"), assets)
+    os.makedirs(os.path.join(assets, "maps"), exist_ok=True)
+    return assets
+
+COMPRESSORS = {
+    "": lambda data: data,
+    "zlib": zlib.compress,
+    "gzip": gzip.compress
+}
+
+def encode_layer(layer: dict, compression: str = "zlib"):
+    """Re-encode a plain tile layer as Tiled base64 (optionally compressed) data."""
+    raw = struct.pack(f"<{len(layer['data'])}I", *layer["data"])
+    layer["encoding"] = "base64"
+    if compression:
+        layer["compression"] = compression
+    layer["data"] = base64.b64encode(COMPRESSORS[compression](raw)).decode("ascii")
+
+def make_map(columns: int, rows: int, walls: int = 0, props: int = 0, seed: int = 0, compression: str = None) -> dict:
+    """Tiled JSON map dict: one tile layer and one object layer with
+    walls, props (tile objects) and a spawn point in the middle.
+    Tile data is a plain array unless a compression ("" for none) is given."""
+    rng = random.Random(seed)
+    width = columns * TILE_SIZE
+    height = rows * TILE_SIZE
+
+    objects = []
+    def add(**o):
+        o.setdefault("rotation", 0)
+        o.setdefault("visible", True)
+        o["id"] = len(objects) + 1
+        objects.append(o)
+
+    add(name="Starting Point", type="Spawn Point", x=width / 2, y=height / 2, width=0, height=0)
+    for _ in range(walls):
+        w = rng.choice((8, 16, 64, 128))
+        h = rng.choice((8, 16, 64, 128))
+        add(name="Wall", type="Wall", x=rng.uniform(0, width - w), y=rng.uniform(0, height - h), width=w, height=h)
+    for _ in range(props):
+        # Tile objects are anchored bottom-left in Tiled
+        add(name="Coffee Table", type="Solid", gid=PROP_GID, x=rng.uniform(0, width - 32), y=rng.uniform(32, height), width=32, height=32)
+
+    tilemap = {
+        "compressionlevel": -1,
+        "height": rows,
+        "width": columns,
+        "infinite": False,
+        "orientation": "orthogonal",
+        "renderorder": "right-down",
+        "tileheight": TILE_SIZE,
+        "tilewidth": TILE_SIZE,
+        "type": "map",
+        "tilesets": [{"firstgid": 1, "source": TILESET_SOURCE}],
+        "layers": [
+            {
+                "data": [rng.randint(1, TILE_COUNT) for _ in range(columns * rows)],
+                "height": rows, "width": columns, "id": 1, "name": "Main Map",
+                "opacity": 1, "type": "tilelayer", "visible": True, "x": 0, "y": 0
+            },
+            {
+                "draworder": "topdown", "id": 2, "name": "Environment", "objects": objects,
+                "opacity": 1, "type": "objectgroup", "visible": True, "x": 0, "y": 0
+            }
+        ]
+    }
+    if compression is not None:
+        encode_layer(tilemap["layers"][0], compression)
+    return tilemap
+
+def write_map(assets: str, name: str, tilemap: dict) -> str:
+    with open(os.path.join(assets, "maps", name), "w") as f:
+        json.dump(tilemap, f)
+    return name
+
+# Scripted actors change direction every SCRIPT_PERIOD ticks, cycling their script
+SCRIPT_PERIOD = 30
+SCRIPT_LENGTH = 4
+DIRECTIONS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+def populate(loader, stage, actors: int, seed: int = 0, layer: int = 2) -> list:
+    """Add actors at random spots, each with a seeded script of movement vectors.
+    Actors reuse the player's actor file, spawning them leaves stage.player alone.
+    Returns [(sprite, script)], see drive."""
+    rng = random.Random(seed)
+    width, height = stage.boundary
+    population = []
+    for _ in range(actors):
+        sprite = loader.load_actor_to_stage("Player", rng.randrange(width), rng.randrange(height), stage, layer)
+        speed = sprite.speed
+        script = [(dx * speed, dy * speed) for dx, dy in rng.choices(DIRECTIONS, k=SCRIPT_LENGTH)]
+        population.append((sprite, script))
+    return population
+
+def drive(population: list, tick: int):
+    """Apply every actor's scripted movement vector for this tick."""
+    if tick % SCRIPT_PERIOD:
+        return
+    step = (tick // SCRIPT_PERIOD) % SCRIPT_LENGTH
+    for sprite, script in population:
+        sprite.movement_vector = script[step]
@@ -7,5 +7,6 @@ setup(
     description="Vagrant Technology Pygame-based Engine",
     author="Vagrant Technology",
     license="GNU GPL v3",
-    install_requires=["pygame", "pyqtree", "transitions"]
+    install_requires=["pygame", "pyqtree", "transitions"],
+    extras_require={"numpy": ["numpy"], "zstd": ["zstandard"]}
 )
\ No newline at end of file
@@ -0,0 +1,29 @@
+import os
+
+# Headless: no window, surfaces stay in their loaded format
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from wrapper.vagrantengine.assets import AssetCache
+from wrapper.vagrantengine.map_loader import MapLoader
+
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "wrapper", "assets")
+MAP = "sandbox_3.json"
+
+@pytest.fixture(scope="session", autouse=True)
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+@pytest.fixture
+def map_file() -> str:
+    """The repo's sample map, in the loader's maps folder."""
+    return MAP
+
+@pytest.fixture
+def loader():
+    """MapLoader on the repo's assets, with a cache of its own."""
+    return MapLoader(ASSETS, cache=AssetCache())
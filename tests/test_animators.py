@@ -0,0 +1,114 @@
+"""Frame-table animations against the stack animator they replaced."""
+import pytest
+
+from wrapper.vagrantengine.animators import Animation, AnimationSystem, SpriteAnimator
+
+ANIMATIONS = {
+    "walk": {"slices": [0, 1, 2, 3], "durations": [4, 3, 5, 2]},
+    "run": {"slices": [4, 5, 6], "durations": [2, 2, 3]},
+    "hold": {"slices": [7, 8], "durations": [1, 6]}
+}
+
+class StackAnimator:
+    """The animator as it was before frame tables: a frame counter per sprite,
+    stepped every tick. Kept here as the reference behaviour."""
+    def __init__(self, animations: dict):
+        self.animations = {k: (v["slices"], [sum(v["durations"][:i + 1]) for i in range(len(v["durations"]))])
+            for k, v in animations.items()}
+        self.stack = [] # type: list[str]
+        self.frame_count = 0
+        self.current_index = 0
+        self.threshold = 0
+        self.current_slice = 0
+
+    def step(self):
+        if self.stack:
+            slices, slice_frames = self.animations[self.stack[-1]]
+            self.frame_count += 1
+            if self.frame_count > self.threshold:
+                self.current_index += 1
+                if self.current_index >= len(slice_frames):
+                    self.frame_count = 0
+                    self.current_index = 0
+                self.threshold = slice_frames[self.current_index]
+                self.current_slice = slices[self.current_index]
+
+    def start(self, action: str):
+        self.stack.append(action)
+        self._restart()
+
+    def stop(self, action: str):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i] == action:
+                del self.stack[i]
+                break
+        if self.stack:
+            self._restart()
+        else:
+            self.current_index = self.threshold = self.frame_count = 0
+            self.current_slice = self.animations[action][0][0]
+
+    def _restart(self):
+        # Starts on the second slice
+        slices, slice_frames = self.animations[self.stack[-1]]
+        self.current_index = 1
+        self.threshold = slice_frames[1]
+        self.frame_count = slice_frames[0] + 1
+        self.current_slice = slices[1]
+
+def play(script: list) -> tuple[list[int], list[int]]:
+    """Run a script of ("start"/"stop", action) and tick counts on both animators,
+    recording the slice shown after every call and every tick."""
+    reference = StackAnimator(ANIMATIONS)
+    shown = []
+    animator = SpriteAnimator(ANIMATIONS, on_change=shown.append)
+    system = AnimationSystem()
+    system.add(animator)
+
+    expected, actual = [], []
+    for step in script:
+        if isinstance(step, int):
+            for _ in range(step):
+                reference.step()
+                system.step()
+                expected.append(reference.current_slice)
+                actual.append(animator.current_slice)
+        else:
+            call, action = step
+            getattr(reference, call)(action)
+            getattr(animator, call)(action)
+            expected.append(reference.current_slice)
+            actual.append(animator.current_slice)
+            # The sprite always heard about the slice it should show
+            assert shown[-1] == animator.current_slice
+    return expected, actual
+
+@pytest.mark.parametrize("script", [
+    [("start", "walk"), 60],
+    [("start", "walk"), 7, ("stop", "walk"), 10],
+    [("start", "walk"), 5, ("start", "run"), 11, ("stop", "run"), 13, ("stop", "walk"), 4],
+    [("start", "walk"), 3, ("start", "run"), 4, ("start", "hold"), 9, ("stop", "run"), 6, ("stop", "hold"), 20],
+    [("start", "walk"), 2, ("start", "walk"), 5, ("stop", "walk"), 8, ("stop", "walk"), 3],
+    [("start", "hold"), 30, ("stop", "hold"), ("start", "run"), 17]
+])
+def test_matches_stack_animator(script):
+    expected, actual = play(script)
+    assert actual == expected
+
+def test_frame_table_is_one_loop():
+    animation = Animation(**ANIMATIONS["walk"])
+    reference = StackAnimator(ANIMATIONS)
+    reference.start("walk")
+    loop = [reference.current_slice]
+    for _ in range(animation.period * 3 - 1):
+        reference.step()
+        loop.append(reference.current_slice)
+    assert list(animation.frames) * 3 == loop
+    assert all(animation.slice_at(t) == loop[t] for t in range(len(loop)))
+
+def test_animations_are_immutable():
+    animation = Animation(**ANIMATIONS["run"])
+    with pytest.raises(AttributeError):
+        animation.period = 1
+    with pytest.raises(ValueError):
+        Animation([0, 1], [1])
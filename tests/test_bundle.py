@@ -0,0 +1,85 @@
+"""Baking a Tiled map into a bundle and loading it back."""
+import json
+import os
+
+import pygame
+import pytest
+
+from wrapper.vagrantengine.bundle import BUNDLE_EXTENSION, LAYER_TILES, MapBundle, bake_map
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.tiled import decode_layer_data
+
+np = pytest.importorskip("numpy")
+
+@pytest.fixture
+def bundle_file(loader, map_file, tmp_path):
+    return bake_map(loader, map_file, str(tmp_path / ("map" + BUNDLE_EXTENSION)))
+
+def stage_contents(stage: Stage) -> dict:
+    return {
+        "boundary": stage.boundary,
+        "props": sorted((type(s).__name__, s.name, tuple(s.rect)) for s in stage.props),
+        "static": len(stage.static_index),
+        "tiles": [t.gids.tolist() for t in stage.tilemap],
+        "player": tuple(stage.player.rect)
+    }
+
+def test_bundle_matches_map(loader, map_file, bundle_file):
+    tilemap = loader.load_json(os.path.join(loader.maps_path, map_file))
+    object_types = loader.load_json(os.path.join(loader.assets_path, "objecttypes.json"))
+    bundle = MapBundle(bundle_file)
+    try:
+        assert (bundle.width, bundle.height) == (tilemap["width"], tilemap["height"])
+        assert (bundle.tile_width, bundle.tile_height) == (tilemap["tilewidth"], tilemap["tileheight"])
+        assert [t.name for t in bundle.object_types] == [t["name"] for t in object_types]
+
+        tile_layers = [l for l in tilemap["layers"] if l["type"] == "tilelayer"]
+        object_layers = [l for l in tilemap["layers"] if l["type"] == "objectgroup"]
+        baked_tiles = [l for l in bundle.layers if l[0] == LAYER_TILES]
+        baked_objects = [l for l in bundle.layers if l[0] != LAYER_TILES]
+        for layer, baked in zip(tile_layers, baked_tiles, strict=True):
+            assert bundle.gids(baked).tolist() == decode_layer_data(layer).ravel().tolist()
+        for layer, baked in zip(object_layers, baked_objects, strict=True):
+            expected = [(o["type"], o["name"], o["x"], o["y"], o["width"], o["height"], o.get("gid"))
+                for o in layer["objects"]]
+            assert list(bundle.objects(baked)) == expected
+    finally:
+        bundle.close()
+
+def test_bundle_tileset_pixels(loader, map_file, bundle_file):
+    tileset_source = loader.load_json(os.path.join(loader.maps_path, map_file))["tilesets"][0]["source"]
+    tileset = loader.load_json(os.path.join(loader.tilesets_path, os.path.basename(tileset_source)))
+    image = pygame.image.load(os.path.join(loader.images_path, os.path.basename(tileset["image"])))
+    bundle = MapBundle(bundle_file)
+    # Headless, the surface reads straight out of the mapping
+    baked = bundle.tileset_image(0)
+    assert baked.get_size() == image.get_size()
+    assert pygame.image.tobytes(baked, "RGBA") == pygame.image.tobytes(image, "RGBA")
+
+def test_bundle_loads_like_map(loader, map_file, bundle_file):
+    from_map, from_bundle = Stage(), Stage()
+    loader.load_map_to_stage(map_file, from_map)
+    loader.load_bundle_to_stage(bundle_file, from_bundle)
+    assert stage_contents(from_bundle) == stage_contents(from_map)
+
+def test_bake_skips_unknown_types(loader, map_file, tmp_path):
+    tilemap = json.loads(json.dumps(loader.load_json(os.path.join(loader.maps_path, map_file))))
+    objects = next(l for l in tilemap["layers"] if l["type"] == "objectgroup")["objects"]
+    known = len(objects)
+    objects.append({"id": 900, "name": "Mystery", "type": "Not A Type", "x": 0, "y": 0, "width": 8, "height": 8})
+    objects.append({"id": 901, "name": "Untyped", "x": 0, "y": 0, "width": 8, "height": 8})
+    unknown = tmp_path / "unknown.json"
+    unknown.write_text(json.dumps(tilemap))
+
+    bundle = MapBundle(bake_map(loader, str(unknown)))
+    try:
+        layer = next(l for l in bundle.layers if l[0] != LAYER_TILES)
+        assert len(list(bundle.objects(layer))) == known
+    finally:
+        bundle.close()
+
+def test_not_a_bundle(tmp_path):
+    path = tmp_path / ("junk" + BUNDLE_EXTENSION)
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        MapBundle(str(path))
@@ -0,0 +1,110 @@
+""".vgir input recordings: what's recorded replays into the same session."""
+import random
+
+import pygame
+import pytest
+
+from wrapper.vagrantengine import eventhandler
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.inputs import RECORDING_EXTENSION, InputReplay
+
+ACTIONS = ["player_up", "player_down", "player_left", "player_right"]
+TICKS = 600
+
+def new_stage(loader, map_file) -> Stage:
+    stage = Stage()
+    loader.load_map_to_stage(map_file, stage)
+    return stage
+
+def trace(stage: Stage) -> tuple:
+    return (tuple(stage.player.rect), stage.player.animator.current_slice)
+
+@pytest.fixture
+def recording(loader, map_file, tmp_path):
+    """Random play session recorded through the event handler.
+    Returns the recording's path and the player's state after every tick."""
+    stage = new_stage(loader, map_file)
+    eventhandler.register_game(stage)
+    eventhandler.start_recording(str(tmp_path / ("session" + RECORDING_EXTENSION)), map=map_file)
+
+    rng = random.Random(7)
+    held = set()
+    states = []
+    try:
+        for _ in range(TICKS):
+            if rng.random() < 0.08:
+                action = rng.choice(ACTIONS)
+                if action in held:
+                    eventhandler.dispatch(action, pygame.KEYUP)
+                    held.discard(action)
+                else:
+                    eventhandler.dispatch(action, pygame.KEYDOWN)
+                    held.add(action)
+            stage.update()
+            states.append(trace(stage))
+        path = eventhandler.stop_recording()
+    finally:
+        eventhandler.stop_recording()
+        eventhandler.register_game(None)
+    return path, states
+
+def test_replay_is_deterministic(loader, map_file, recording):
+    path, states = recording
+    replay = InputReplay(path)
+    assert replay.ticks == TICKS
+    assert replay.metadata == {"map": map_file}
+    assert set(replay.actions) <= set(ACTIONS)
+
+    stage = new_stage(loader, map_file)
+    replay.attach(stage)
+    replayed = []
+    while not replay.done:
+        replay.update()
+        replayed.append(trace(stage))
+    assert replayed == states
+
+def test_replay_twice(loader, map_file, recording):
+    path, _ = recording
+    runs = []
+    for _ in range(2):
+        stage = new_stage(loader, map_file)
+        replay = InputReplay(path)
+        replay.attach(stage)
+        while not replay.done:
+            replay.update()
+        runs.append((trace(stage), stage.ticks))
+    assert runs[0] == runs[1]
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / ("junk" + RECORDING_EXTENSION)
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        InputReplay(str(path))
+
+def recording_stage(loader, map_file, tmp_path) -> Stage:
+    stage = new_stage(loader, map_file)
+    eventhandler.register_game(stage)
+    eventhandler.start_recording(str(tmp_path / ("changed" + RECORDING_EXTENSION)))
+    eventhandler.dispatch("player_right", pygame.KEYDOWN)
+    return stage
+
+def test_recording_refuses_another_stage(loader, map_file, tmp_path):
+    recording_stage(loader, map_file, tmp_path)
+    try:
+        # e.g. a StageStack push while recording
+        eventhandler.register_game(new_stage(loader, map_file))
+        with pytest.raises(RuntimeError):
+            eventhandler.dispatch("player_left", pygame.KEYDOWN)
+    finally:
+        eventhandler.stop_recording()
+        eventhandler.register_game(None)
+
+def test_recording_refuses_an_adopted_map(loader, map_file, tmp_path):
+    stage = recording_stage(loader, map_file, tmp_path)
+    try:
+        stage.adopt(new_stage(loader, map_file))
+        with pytest.raises(RuntimeError):
+            eventhandler.dispatch("player_right", pygame.KEYUP)
+    finally:
+        eventhandler.stop_recording()
+        eventhandler.register_game(None)
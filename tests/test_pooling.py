@@ -0,0 +1,77 @@
+"""Sprite pools: reuse, double releases & runtime actor spawns."""
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.pooling import SpritePool
+from wrapper.vagrantengine.sprites import GameSprite
+
+def new_sprite() -> GameSprite:
+    return GameSprite(x=0, y=0, width=8, height=8)
+
+def test_acquire_reuses_released():
+    pool = SpritePool(new_sprite)
+    sprite = pool.acquire(1, 2)
+    pool.release(sprite)
+    again = pool.acquire(3, 4)
+    assert again is sprite
+    assert again.rect.topleft == (3, 4)
+    assert (pool.created, pool.reused) == (1, 1)
+
+def test_double_release_hands_out_once():
+    pool = SpritePool(new_sprite)
+    sprite = pool.acquire(0, 0)
+    pool.release(sprite)
+    pool.release(sprite)
+    assert len(pool) == 1
+    assert pool.acquire(0, 0) is not pool.acquire(0, 0)
+
+def test_capacity():
+    pool = SpritePool(new_sprite, capacity=2)
+    sprites = [pool.acquire(0, 0) for _ in range(3)]
+    for s in sprites:
+        pool.release(s)
+    assert len(pool) == 2
+
+def test_double_despawn(loader, map_file):
+    stage = Stage()
+    loader.load_map_to_stage(map_file, stage)
+    actor = loader.load_actor_to_stage("Player", 10, 10, stage, 2)
+    stage.despawn(actor)
+    stage.despawn(actor)
+    first = loader.load_actor_to_stage("Player", 20, 20, stage, 2)
+    second = loader.load_actor_to_stage("Player", 30, 30, stage, 2)
+    assert first is actor
+    assert second is not first
+
+def test_spawning_actors_keeps_the_player(loader, map_file):
+    stage = Stage()
+    loader.load_map_to_stage(map_file, stage)
+    player = stage.player
+    assert player is not None
+    for i in range(5):
+        loader.load_actor_to_stage("Player", i * 10, 0, stage, 2)
+    assert stage.player is player
+    # A reload spawns the map's player again, and only that
+    loader.load_map_to_stage(map_file, stage)
+    assert stage.player is not None
+    assert stage.player in stage.actors
+
+def test_adopt_pools_the_old_movers(loader, map_file):
+    stage = Stage()
+    loader.load_map_to_stage(map_file, stage)
+    old_player = stage.player
+    old_animations = stage.animations
+    for _ in range(3):
+        stage.update()
+    ticks = stage.ticks
+
+    staging = stage.blank()
+    loader.load_map_to_stage(map_file, staging)
+    stage.adopt(staging)
+
+    assert stage.player is staging.player and stage.player is not old_player
+    assert stage.ticks == ticks
+    # Back in the pool, out of the old world's schedule
+    assert stage.pools.stats()["Player"]["free"] == 1
+    assert old_player.animator.system is None
+    assert not old_player.alive()
+    assert loader.load_actor_to_stage("Player", 0, 0, stage, 2) is old_player
+    assert old_animations is not stage.animations
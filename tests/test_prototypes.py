@@ -0,0 +1,35 @@
+"""Tiled type properties live on the generated prototype classes."""
+from wrapper.vagrantengine.prototypes import PrototypeRegistry
+from wrapper.vagrantengine.sprites import ActorSprite, GameSprite
+from wrapper.vagrantengine.tiled import TiledType
+
+def registry() -> PrototypeRegistry:
+    return PrototypeRegistry([
+        TiledType("Wall", [{"name": "solid", "value": True}]),
+        TiledType("Spawn Point", [{"name": "solid", "value": False}, {"name": "rect", "value": 1}])
+    ])
+
+def test_properties_are_class_attributes():
+    prototypes = registry()
+    wall = prototypes["Wall"](0, 0, 8, 8)
+    assert wall.solid is True
+    assert "solid" in vars(type(wall))
+    assert type(wall).__name__ == "WallGameSprite"
+    assert wall.type is prototypes.types["Wall"]
+
+def test_shadowing_properties_stay_on_the_type():
+    spawn = registry()["Spawn Point"](0, 0, 0, 0)
+    assert spawn.solid is False
+    # rect is the sprite's own, the property is only on the type
+    assert spawn.rect.size == (0, 0)
+    assert spawn.type.additional_properties["rect"] == 1
+
+def test_classes_are_made_once_per_base():
+    prototypes = registry()
+    assert prototypes.sprite_class("Wall") is prototypes.sprite_class("Wall")
+    actor_class = prototypes.sprite_class("Wall", ActorSprite)
+    assert issubclass(actor_class, ActorSprite) and actor_class.solid is True
+
+def test_untyped_sprites_have_no_properties():
+    sprite = GameSprite(0, 0, 8, 8)
+    assert not hasattr(sprite, "solid")
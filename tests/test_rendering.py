@@ -0,0 +1,47 @@
+"""Dirty-rect rendering draws exactly what a full redraw does."""
+import pygame
+import pytest
+
+from wrapper.vagrantengine.game import Stage
+from wrapper.vagrantengine.rendering import DebugRenderer, Renderer, outline
+
+# Held actions, by the frame they start on; each is let go 40 frames later
+SCRIPT = {0: "player_right", 10: "player_up", 45: "player_left", 60: "player_down", 90: "player_right"}
+FRAMES = 140
+
+def render_frames(loader, map_file, dirty_rects: bool, overlay: bool) -> list[bytes]:
+    display = pygame.display.set_mode((320, 240))
+    stage = Stage()
+    loader.load_map_to_stage(map_file, stage)
+    renderer = Renderer(stage, dirty_rects=dirty_rects)
+    if overlay:
+        # Panel rebuilt every frame, so it doesn't depend on wall time
+        debug = DebugRenderer(stage, renderer, refresh_rate=float("inf"))
+        renderer.add_pipeline_step(display, debug.draw_debug)
+
+    frames = []
+    for frame in range(FRAMES):
+        if frame in SCRIPT:
+            stage.actions[SCRIPT[frame]](pygame.KEYDOWN)
+        if frame - 40 in SCRIPT:
+            stage.actions[SCRIPT[frame - 40]](pygame.KEYUP)
+        stage.update()
+        renderer.render()
+        frames.append(pygame.image.tobytes(display, "RGB"))
+    return frames
+
+@pytest.mark.parametrize("overlay", [False, True])
+def test_dirty_rects_match_full_redraw(loader, map_file, overlay):
+    full = render_frames(loader, map_file, False, overlay)
+    dirty = render_frames(loader, map_file, True, overlay)
+    mismatched = [i for i, (a, b) in enumerate(zip(full, dirty)) if a != b]
+    assert not mismatched, f"frames differ from frame {mismatched[0]} on"
+
+def test_outline_is_clipped_to_the_display():
+    area = pygame.Rect(0, 0, 320, 240)
+    assert outline(pygame.Rect(310, -64, 20, 195), area) == [
+        pygame.Rect(310, 130, 10, 1), pygame.Rect(310, 0, 1, 131)
+    ]
+    # Zero-area rects and rects off the display outline nothing
+    assert outline(pygame.Rect(159, 207, 0, 1), area) == []
+    assert outline(pygame.Rect(0, -80, 8, 1), area) == []
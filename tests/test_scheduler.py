@@ -0,0 +1,86 @@
+"""Scheduler catch-up, dropped ticks & frame skipping, on scripted clocks."""
+import pytest
+
+from wrapper.vagrantengine.scheduler import Scheduler, VirtualClock
+
+class ScriptedClock:
+    """Clock whose ticks report the given frame times, then repeat the last."""
+    def __init__(self, *frame_ms: float):
+        self.frame_ms = list(frame_ms)
+
+    def tick(self, rate: int = 0) -> float:
+        return self.frame_ms.pop(0) if len(self.frame_ms) > 1 else self.frame_ms[0]
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+
+def run(scheduler: Scheduler, frames: int) -> tuple[list[int], Counter, Counter]:
+    updates, renders = Counter(), Counter()
+    ticks = [scheduler.frame(lambda: None, updates, renders) for _ in range(frames)]
+    return ticks, updates, renders
+
+def test_one_tick_per_frame():
+    scheduler = Scheduler(tick_rate=60, render_rate=60, clock=VirtualClock(1000 / 60))
+    scheduler.start()
+    ticks, updates, renders = run(scheduler, 100)
+    # Time only becomes owed at the end of a frame, the first one has none
+    assert ticks == [0] + [1] * 99
+    assert updates.calls == 99
+    assert renders.calls == 100
+    assert scheduler.stats.dropped_ticks == 0
+
+def test_slow_sim_ticks_every_other_frame():
+    scheduler = Scheduler(tick_rate=30, render_rate=60, clock=VirtualClock(1000 / 60))
+    scheduler.start()
+    ticks, updates, renders = run(scheduler, 100)
+    assert ticks[:2] == [0, 0]
+    assert ticks[2:] == [1, 0] * 49
+    assert renders.calls == 100
+
+@pytest.mark.parametrize("max_catch_up", [1, 3, 5])
+def test_catch_up_is_capped(max_catch_up):
+    # One 1 second stall, then back to normal
+    clock = ScriptedClock(0, 1000, 10)
+    scheduler = Scheduler(tick_rate=100, render_rate=0, max_catch_up=max_catch_up, budgets={"update": None}, clock=clock)
+    scheduler.start()
+    ticks, updates, _ = run(scheduler, 4)
+    # Nothing owed yet, then the stall's ticks run (capped) the frame after it
+    assert ticks[:2] == [0, max_catch_up]
+    assert ticks[2:] == [1, 1]
+    # The rest of the stall is dropped, not carried into later frames
+    assert scheduler.stats.dropped_ticks == 100 - max_catch_up
+    # All that's owed is the last frame's time
+    assert scheduler.time_buffer == pytest.approx(10)
+    assert updates.calls == sum(ticks)
+
+def test_backlog_below_cap_is_kept():
+    clock = ScriptedClock(0, 30, 10)
+    scheduler = Scheduler(tick_rate=100, render_rate=0, max_catch_up=5, budgets={"update": None}, clock=clock)
+    scheduler.start()
+    ticks, _, _ = run(scheduler, 3)
+    assert ticks == [0, 3, 1]
+    assert scheduler.stats.dropped_ticks == 0
+
+def test_frame_skip_is_capped():
+    # Every update is over budget, renders are skipped at most max_frame_skip in a row
+    scheduler = Scheduler(tick_rate=60, render_rate=60, max_frame_skip=3, budgets={"update": -1}, clock=VirtualClock(1000 / 60))
+    scheduler.start()
+    rendered = []
+    for _ in range(12):
+        before = scheduler.stats.skipped_renders
+        scheduler.frame(lambda: None, lambda: None, lambda: None)
+        rendered.append(scheduler.stats.skipped_renders == before)
+    assert rendered == [False, False, False, True] * 3
+    assert scheduler.stats.skipped_renders == 9
+
+def test_alpha():
+    scheduler = Scheduler(tick_rate=10, render_rate=0, budgets={"update": None}, clock=ScriptedClock(0, 25))
+    scheduler.start()
+    assert scheduler.alpha == 0.0
+    scheduler.frame(lambda: None, lambda: None, lambda: None)
+    # 25 ms owed at 100 ms per tick
+    assert scheduler.alpha == pytest.approx(0.25)
@@ -0,0 +1,100 @@
+"""SpatialHash & StaticIndex against a brute force overlap check."""
+import random
+
+import pytest
+
+from wrapper.vagrantengine.collision import overlaps
+from wrapper.vagrantengine.spatial import QuadtreeIndex, SpatialHash, StaticIndex
+
+WORLD = (0, 0, 1024, 1024)
+
+def random_bbox(rng: random.Random, max_size: int = 100) -> tuple:
+    x, y = rng.uniform(-50, 1000), rng.uniform(-50, 1000)
+    return (x, y, x + rng.uniform(0, max_size), y + rng.uniform(0, max_size))
+
+def brute_force(bboxes: dict, query: tuple) -> set:
+    return {item for item, bbox in bboxes.items() if overlaps(bbox, query)}
+
+@pytest.fixture
+def rng():
+    return random.Random(1234)
+
+def test_spatial_hash_intersect(rng):
+    index = SpatialHash(WORLD, cell_size=32)
+    bboxes = {i: random_bbox(rng) for i in range(300)}
+    for item, bbox in bboxes.items():
+        index.insert(item, bbox)
+    assert len(index) == len(bboxes)
+    for _ in range(200):
+        query = random_bbox(rng, 200)
+        assert set(index.intersect(query)) == brute_force(bboxes, query)
+
+def test_spatial_hash_edges_touch():
+    index = SpatialHash(WORLD, cell_size=64)
+    index.insert("a", (0, 0, 64, 64))
+    # Touching edges overlap, like pyqtree
+    assert index.intersect((64, 64, 80, 80)) == ["a"]
+    assert index.intersect((64.5, 0, 80, 10)) == []
+
+def test_spatial_hash_move(rng):
+    index = SpatialHash(WORLD, cell_size=32)
+    bboxes = {i: random_bbox(rng) for i in range(200)}
+    for item, bbox in bboxes.items():
+        index.insert(item, bbox)
+    for _ in range(1000):
+        item = rng.randrange(len(bboxes))
+        # Mostly small steps (same cells), sometimes a jump across the map
+        dx, dy = (rng.uniform(-3, 3), rng.uniform(-3, 3)) if rng.random() < 0.8 else (rng.uniform(-500, 500), 0)
+        old = bboxes[item]
+        new = (old[0] + dx, old[1] + dy, old[2] + dx, old[3] + dy)
+        index.move(item, old, new)
+        bboxes[item] = new
+    for _ in range(200):
+        query = random_bbox(rng, 200)
+        assert set(index.intersect(query)) == brute_force(bboxes, query)
+
+def test_spatial_hash_remove(rng):
+    index = SpatialHash(WORLD, cell_size=32)
+    bboxes = {i: random_bbox(rng) for i in range(200)}
+    for item, bbox in bboxes.items():
+        index.insert(item, bbox)
+    for item in range(0, 200, 2):
+        index.remove(item, bboxes.pop(item))
+    assert len(index) == len(bboxes)
+    assert set(index.intersect(WORLD)) == brute_force(bboxes, WORLD)
+    for item in list(bboxes):
+        index.remove(item, bboxes.pop(item))
+    # Emptied cells are dropped, the grid stays sparse
+    assert index.intersect(WORLD) == []
+    assert not index._cells
+
+def test_spatial_hash_move_unknown_inserts():
+    index = SpatialHash(WORLD)
+    index.move("a", None, (10, 10, 20, 20))
+    assert index.intersect((15, 15, 16, 16)) == ["a"]
+
+def test_quadtree_matches_spatial_hash(rng):
+    spatial_hash, quadtree = SpatialHash(WORLD), QuadtreeIndex(WORLD)
+    for item in range(200):
+        bbox = random_bbox(rng)
+        spatial_hash.insert(item, bbox)
+        quadtree.insert(item, bbox)
+    for _ in range(100):
+        query = random_bbox(rng, 200)
+        assert set(spatial_hash.intersect(query)) == set(quadtree.intersect(query))
+
+def test_static_index_intersect(rng):
+    # One very wide entry, so the left edge search has to look far back
+    bboxes = {i: random_bbox(rng, 40) for i in range(300)}
+    bboxes["wall"] = (-100, 500, 1100, 510)
+    index = StaticIndex(bboxes.items())
+    assert len(index) == len(bboxes)
+    for _ in range(300):
+        query = random_bbox(rng, 120)
+        assert set(index.intersect(query)) == brute_force(bboxes, query)
+    assert set(index.intersect((0, 505, 1, 506))) >= {"wall"}
+
+def test_static_index_empty():
+    index = StaticIndex([])
+    assert len(index) == 0
+    assert index.intersect(WORLD) == []
@@ -0,0 +1,59 @@
+"""Tile layer decoding, every encoding & compression Tiled writes."""
+import base64
+import gzip
+import struct
+import zlib
+
+import pytest
+
+from wrapper.vagrantengine.tiled import FLIPPED_HORIZONTALLY, FLIPPED_VERTICALLY, decode_layer_data
+
+np = pytest.importorskip("numpy")
+
+WIDTH, HEIGHT = 7, 5
+# Some flipped tiles in there, the flags have to survive decoding
+GIDS = [(i % 11) | (FLIPPED_HORIZONTALLY if i % 5 == 0 else 0) | (FLIPPED_VERTICALLY if i % 7 == 0 else 0)
+    for i in range(WIDTH * HEIGHT)]
+
+def zstd_compress(data: bytes) -> bytes:
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+COMPRESSORS = {
+    None: lambda data: data,
+    "": lambda data: data,
+    "zlib": zlib.compress,
+    "gzip": gzip.compress,
+    "zstd": zstd_compress
+}
+
+def encoded_layer(compression) -> dict:
+    raw = struct.pack(f"<{len(GIDS)}I", *GIDS)
+    layer = {
+        "width": WIDTH,
+        "height": HEIGHT,
+        "encoding": "base64",
+        "data": base64.b64encode(COMPRESSORS[compression](raw)).decode("ascii")
+    }
+    if compression is not None:
+        layer["compression"] = compression
+    return layer
+
+def test_csv():
+    gids = decode_layer_data({"width": WIDTH, "height": HEIGHT, "data": GIDS})
+    assert gids.shape == (HEIGHT, WIDTH)
+    assert gids.dtype == np.uint32
+    assert gids.ravel().tolist() == GIDS
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+def test_base64(compression):
+    gids = decode_layer_data(encoded_layer(compression))
+    assert gids.shape == (HEIGHT, WIDTH)
+    assert gids.dtype == np.uint32
+    assert gids.ravel().tolist() == GIDS
+
+def test_unsupported():
+    with pytest.raises(ValueError):
+        decode_layer_data({**encoded_layer("zlib"), "compression": "lz4"})
+    with pytest.raises(ValueError):
+        decode_layer_data({"width": WIDTH, "height": HEIGHT, "encoding": "xml", "data": ""})
@@ -9,10 +9,10 @@ print('__file__={0:<35} | __name__={1:<20} | __package__={2:<20}'.format(__file_
 
 # from .vagrantengine.game import Stage, load_scene
 from .vagrantengine.game import Stage
-from .vagrantengine.eventhandler import register_game, register_key_bindings
+from .vagrantengine.eventhandler import register_game, register_key_bindings, start_recording
 from .vagrantengine.rendering import Renderer, DebugRenderer
 from .vagrantengine.driver import game_start
-from .vagrantengine.map_loader import MapLoader
+from .vagrantengine.stages import STAGE_STACK
 
 # TODO: Environment Variables
 ASSET_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "assets")
@@ -36,15 +36,13 @@ pygame.init()
 
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
-# Debug Surface/HUD
-debug_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert_alpha()
-
 # Game State Initialization
 stage = Stage()
 
 # Initial Scene Load
 # game.load_scene(SCENES, IMAGES, MAPS, 1, stage)
-loader = MapLoader(ASSET_PATH)
+# Loads through the stack's asset cache, shared by every stage pushed later
+loader = STAGE_STACK.loader(ASSET_PATH)
 loader.load_map_to_stage("sandbox_3.json", stage)
 
 # Event Handler config
@@ -61,17 +59,21 @@ key_bindings = {
 }
 register_key_bindings(key_bindings)
 
+# Record the session's input for replays, saved on quit
+INPUT_RECORDING = os.environ.get("VAGRANT_RECORD_INPUT")
+if INPUT_RECORDING:
+    start_recording(INPUT_RECORDING, map="sandbox_3.json")
+
 # Renderer Setup
 renderer = Renderer(stage
     # , overworld_menu=overworld_menu
     # , battle_hud=battle_hud
     )
-debug_renderer = DebugRenderer(stage, debug_surface)
-
-# TODO: Stage Stack
+# Debug HUD, drawn straight onto the display
+debug_renderer = DebugRenderer(stage, renderer)
 
 # Render pipeline defines surface rendering order and functions to use
-renderer.add_pipeline_step(debug_surface, debug_renderer.draw_debug)
+renderer.add_pipeline_step(screen, debug_renderer.draw_debug)
 
 # Game Loop Start
 game_start(stage, renderer)
\ No newline at end of file
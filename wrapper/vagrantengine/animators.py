@@ -1,129 +1,182 @@
 import logging
-import bisect
+import heapq
+from itertools import accumulate, count
 
 class Animation:
     def __init__(self, slices: list, durations: list):
-        """Creates a single animation instance.
-        Functionality in this class is geared towards running
-        this individual animation."""
+        """Creates a single, immutable animation.
+        Shared by every sprite of an actor type; the whole loop is
+        precomputed into a frame table, one slice per tick."""
         # Check matching length on slice list and duration list
         if len(slices) != len(durations):
             raise ValueError("Lengths of slices and durations need to be equal.")
-        self.slices = slices
-        self.slice_frames = []
-        self.paused = False
-
-        # Set up frame counts
-        frame_counter = 0
-        for d in durations:
-            frame_counter += d
-            self.slice_frames.append(frame_counter)
+        _set = super().__setattr__
+        _set("slices", tuple(slices))
+        _set("durations", tuple(durations))
+        _set("slice_frames", tuple(accumulate(durations)))
+        _set("frames", frame_table(self.slices, self.slice_frames))
+        _set("period", len(self.frames))
+
+        # Ticks from each frame until the slice next changes, 0 if it never does
+        next_change = []
+        for i, s in enumerate(self.frames):
+            wait = 0
+            for k in range(1, self.period):
+                if self.frames[(i + k) % self.period] != s:
+                    wait = k
+                    break
+            next_change.append(wait)
+        _set("next_change", tuple(next_change))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Animations are shared, and immutable")
+
+    def slice_at(self, ticks: int) -> int:
+        """Slice shown ticks after the animation started."""
+        return self.frames[ticks % self.period]
+
+def frame_table(slices: tuple, slice_frames: tuple) -> tuple:
+    """Play the animation through once, tick by tick, recording the slice shown.
+    Playback starts on the second slice, one tick in, and the first slice is
+    held one extra tick on every loop, as the animator always did."""
+    if len(slices) == 1:
+        return (slices[0],)
+
+    index, frame_count = 1, slice_frames[0] + 1
+    start = (index, frame_count)
+    frames = []
+    while True:
+        frames.append(slices[index])
+        frame_count += 1
+        if frame_count > slice_frames[index]:
+            index += 1
+            # Loop around at the end
+            if index >= len(slices):
+                index, frame_count = 0, 0
+        if (index, frame_count) == start:
+            return tuple(frames)
+
+def build_animations(animations: dict) -> dict[str, Animation]:
+    """Animations from their json specs, build once per actor type and share."""
+    return {k: v if isinstance(v, Animation) else Animation(**v) for (k, v) in animations.items()}
 
 class SpriteAnimator:
-    def __init__(self, animations: dict):
-        """Takes a dictionary of animations and builds functionality around
-        them to play, stop, load and track animation frames for a sprite."""
-        self.animations = {k:Animation(**v) for (k, v) in animations.items()}
-        self.reverse_lookup = {v:k for k, v in self.animations.items()}
-        
-        self.current_animation = None # type: str
-        # self.default_animation = Animation(animations[initial_animation])
-        # self.default_animation.paused = True
-        self.stack = [] # type: list[Animation]
+    def __init__(self, animations: dict, on_change=None):
+        """Tracks which of a set of (shared) animations a sprite plays.
+        The current slice is derived from the AnimationSystem's tick and the tick
+        the animation started on; on_change(slice) is called when it changes."""
+        self.animations = build_animations(animations)
+        self.on_change = on_change
+        self.system = None # type: AnimationSystem
 
-        self.frame_count = 0
-        # self.current_index = left_search(self.current.slice_frames, self.frame_count)
-        self.current_index = 0
-
-        # self.threshold = self.current.slice_frames[self.current_index]
-        self.threshold = 0
-        # self.current_slice = self.current.slices[self.current_index]
+        self.current_animation = None # type: str
+        self.stack = [] # type: list[str]
+        self.start_tick = 0
         self.current_slice = 0
-
-        self.dirty = False
+        # Bumped on every start/stop, stale schedule entries are skipped
+        self.generation = 0
 
     @property
-    def current(self):
+    def current(self) -> Animation:
         try:
-            return self.stack[-1]
+            return self.animations[self.stack[-1]]
         except IndexError:
             return None
 
-    def step(self):
-        if (self.current is not None) and (not self.current.paused):
-            self.frame_count += 1
-
-            if self.frame_count > self.threshold:
-                # Move to next frame
-                self.current_index += 1
-                # Loop around at the end
-                if self.current_index >= len(self.current.slice_frames):
-                    self.frame_count = 0
-                    self.current_index = 0
-
-                self.threshold = self.current.slice_frames[self.current_index]
-                self.current_slice = self.current.slices[self.current_index]
-                self.dirty = True
+    @property
+    def phase(self) -> int:
+        """Ticks into the current animation's loop."""
+        if self.current is None:
+            return 0
+        tick = self.system.tick if self.system is not None else self.start_tick
+        return (tick - self.start_tick) % self.current.period
 
     def start(self, action: str):
         """Add a new animation to the stack.
         Top of the stack should be the playing animation."""
-        # try:
-        #     self.stack.remove(self.animations[action])
-        # except ValueError:
-        #     pass
-        self.current_animation = action
-        self.stack.append(self.animations[action])
-
-        # self.frame_count = initial_frame
-        # self.frame_count = 0
-        # self.current_index = left_search(self.current.slice_frames, self.frame_count)
-        # Start on the second frame/slice
-        self.current_index = 1
-        self.threshold = self.current.slice_frames[self.current_index]
-        self.frame_count = self.current.slice_frames[0] + 1
-
-        self.current_slice = self.current.slices[self.current_index]
-
-        self.dirty = True
+        self.stack.append(action)
+        self._play()
 
     def stop(self, action: str):
         # Pop last instance of this action off the animation stack
-        self.stack.reverse()
-        try:
-            self.stack.remove(self.animations[action])
-        except ValueError:
-            pass
-        self.stack.reverse()
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i] == action:
+                del self.stack[i]
+                break
 
         # If we're stopping the last animation in the stack
         if self.current is None:
-            last_animation = self.animations[action]
-            # logging.info(f"Last Animation: {action}")
             self.current_animation = None
-            self.current_index = 0
-            self.threshold = 0
-            self.frame_count = 0
-            self.current_slice = last_animation.slices[self.current_index]
+            self.generation += 1
+            self.show(self.animations[action].slices[0])
         else:
-            self.current_animation = self.reverse_lookup[self.current]
-
-            # self.current_index = left_search(self.current.slice_frames, self.frame_count)
-            # self.threshold = self.current.slice_frames[self.current_index]
-            
-            # Start on the second frame/slice
-            self.current_index = 1
-            self.threshold = self.current.slice_frames[self.current_index]
-            self.frame_count = self.current.slice_frames[0] + 1
-            self.current_slice = self.current.slices[self.current_index]
-
-        self.dirty = True
-
-def left_search(nums, item):
-    # From https://stackoverflow.com/questions/39358092/range-as-dictionary-key-in-python
-    # adjust, as bisect returns not exactly what we want
-    i = bisect.bisect_left(nums, item)
-    # if i == len(nums) or nums[i] != item:
-    #     i -= 1
-
-    return i
\ No newline at end of file
+            self._play()
+
+    def reset(self):
+        """Nothing playing, as built. For sprites reused from a pool."""
+        self.stack.clear()
+        self.current_animation = None
+        self.start_tick = 0
+        self.current_slice = 0
+        self.generation += 1
+
+    def _play(self):
+        """(Re)start the animation on top of the stack, from its first frame."""
+        self.current_animation = self.stack[-1]
+        self.start_tick = self.system.tick if self.system is not None else 0
+        self.generation += 1
+        self.show(self.current.frames[0])
+        if self.system is not None:
+            self.system.schedule(self)
+
+    def show(self, slice: int):
+        self.current_slice = slice
+        if self.on_change is not None:
+            self.on_change(slice)
+
+class AnimationSystem:
+    """Global animation tick for a stage.
+    Keeps a schedule of when each playing animator's slice next changes,
+    so step() only touches the sprites that actually change this tick."""
+    def __init__(self):
+        self.tick = 0
+        self._queue = [] # type: list[tuple[int, int, int, SpriteAnimator]]
+        self._order = count() # Tie breaker, animators don't compare
+
+    def __len__(self):
+        return len(self._queue)
+
+    def add(self, animator: SpriteAnimator):
+        animator.system = self
+        if animator.current is not None:
+            # Restart on this system's clock
+            animator._play()
+
+    def remove(self, animator: SpriteAnimator):
+        animator.system = None
+        animator.generation += 1
+
+    def schedule(self, animator: SpriteAnimator):
+        animation = animator.current
+        wait = animation.next_change[(self.tick - animator.start_tick) % animation.period]
+        if wait:
+            heapq.heappush(self._queue, (self.tick + wait, next(self._order), animator.generation, animator))
+
+    def step(self) -> int:
+        """Advance the tick, update animators whose slice changes now.
+        Returns how many changed."""
+        self.tick += 1
+        changed = 0
+        queue = self._queue
+        while queue and queue[0][0] <= self.tick:
+            _, _, generation, animator = heapq.heappop(queue)
+            if generation != animator.generation or animator.system is not self:
+                continue # Restarted or stopped since it was scheduled
+            animation = animator.current
+            animator.show(animation.frames[(self.tick - animator.start_tick) % animation.period])
+            self.schedule(animator)
+            changed += 1
+        return changed
+
+    def clear(self):
+        self._queue.clear()
@@ -0,0 +1,134 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import pygame
+import pygame.display
+import pygame.mask
+
+DEFAULT_BYTE_BUDGET = 256 * 1024 * 1024 # 256 MB
+
+class CacheEntry:
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+
+class AssetCache:
+    """Central cache for decoded/sliced assets, shared by every loader.
+    Keyed by whatever identifies the asset (file path, slice spec, zoom...).
+    Tracks an estimated byte size per entry and evicts least recently used
+    entries past the byte budget. Evicting only drops the cache's reference,
+    sprites still holding the surfaces keep them alive.
+    Safe to share with background map loads; loads themselves run unlocked."""
+    def __init__(self, byte_budget: int = DEFAULT_BYTE_BUDGET):
+        self.byte_budget = byte_budget
+        self._lock = threading.RLock()
+        self._entries = OrderedDict() # type: OrderedDict[Hashable, CacheEntry]
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable, load: Callable[[], Any], size: int = None) -> Any:
+        """Return the cached asset for key, calling load() on a miss.
+        Size is estimated from the value unless given."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            self.misses += 1
+
+        # Two threads missing the same key both load it, last put wins
+        value = load()
+        self.put(key, value, size)
+        return value
+
+    def put(self, key: Hashable, value: Any, size: int = None):
+        entry = CacheEntry(value, asset_size(value) if size is None else size)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes_used -= old.size
+
+            self._entries[key] = entry
+            self.bytes_used += entry.size
+            self._evict()
+
+    def _evict(self):
+        # Never evict the newest entry, even if it alone is over budget
+        while self.bytes_used > self.byte_budget and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self.bytes_used -= entry.size
+            self.evictions += 1
+            logging.info(f"AssetCache: evicted {key} ({entry.size} bytes)")
+
+    def size_of(self, key: Hashable) -> int:
+        entry = self._entries.get(key)
+        return entry.size if entry is not None else 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes_used,
+            "budget": self.byte_budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+def asset_size(value: Any, _seen: set = None) -> int:
+    """Rough resident size of an asset in bytes.
+    Surfaces & masks count their pixels, containers are summed.
+    Subsurfaces share pixels, so only their root surface is counted, once."""
+    if _seen is None:
+        _seen = set()
+    if isinstance(value, pygame.Surface):
+        while value.get_parent() is not None:
+            value = value.get_parent()
+        if id(value) in _seen:
+            return 0
+        _seen.add(id(value))
+        return value.get_width() * value.get_height() * value.get_bytesize()
+    if isinstance(value, pygame.mask.Mask):
+        w, h = value.get_size()
+        return (w * h + 7) // 8
+    if isinstance(value, dict):
+        return sum(asset_size(v, _seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(asset_size(v, _seen) for v in value)
+    return 0
+
+def headless() -> bool:
+    """No display mode set, so there's no display format to convert to."""
+    return pygame.display.get_surface() is None
+
+def alpha_surface(size: tuple[int, int]) -> pygame.Surface:
+    """New per-pixel alpha surface in the display's format, like
+    Surface(size).convert_alpha(). Headless, a plain SRCALPHA surface
+    filled the same (opaque black)."""
+    if not headless():
+        return pygame.Surface(size).convert_alpha()
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 255))
+    return surface
+
+def convert_alpha(surface: pygame.Surface) -> pygame.Surface:
+    """surface.convert_alpha() for fast blits, or the surface as-is when headless."""
+    return surface if headless() else surface.convert_alpha()
+
+# Default cache, shared by every MapLoader unless one is passed in
+ASSET_CACHE = AssetCache()
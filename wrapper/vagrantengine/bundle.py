@@ -0,0 +1,289 @@
+"""Precompiled binary map bundles.
+
+bake_map turns a Tiled JSON map, its tilesets and objecttypes.json into one
+little-endian file; MapBundle memory-maps it back without any JSON parsing.
+
+Layout, all offsets absolute:
+    header      magic, version, map width/height, tile width/height
+    strings     u32 count, then (u16 length, utf-8 bytes) each
+    types       u32 count, then name, property count, (name, tag, value) each
+    tilesets    u32 count, then firstgid, tile w/h, image w/h, pixel offset each
+    layers      u32 count, then kind, name, and per kind:
+                tile layer:   width, height, offset of u32 gids
+                object layer: count, offset of packed object records
+    payload     gid arrays, object records and raw RGBA pixels, 8 byte aligned
+
+Tilesets are kept as whole sheets, not pre-sliced tiles: slicing is subsurfaces
+without pixel copies, and pygame only builds masks from surfaces, so per-tile
+pixels and masks in the file wouldn't save any work at load.
+"""
+import argparse
+import logging
+import mmap
+import os
+import pathlib
+import struct
+import sys
+from array import array
+
+import pygame
+import pygame.image
+
+try:
+    import numpy as np
+except ImportError: # Optional, gids are then a plain u32 buffer
+    np = None
+
+from .assets import convert_alpha
+from .tiled import TiledType, decode_layer_data
+
+MAGIC = b"VGMB"
+VERSION = 1
+BUNDLE_EXTENSION = ".vgmb"
+
+HEADER = struct.Struct("<4sHHIIII")
+COUNT = struct.Struct("<I")
+STRING_LENGTH = struct.Struct("<H")
+TYPE = struct.Struct("<IH")
+PROPERTY = struct.Struct("<IB")
+TILESET = struct.Struct("<IIIIIQ")
+LAYER = struct.Struct("<BI")
+TILE_LAYER = struct.Struct("<IIQ")
+OBJECT_LAYER = struct.Struct("<IQ")
+# id, name, type, gid (0 = none), x, y, width, height
+OBJECT = struct.Struct("<IIIIdddd")
+
+LAYER_TILES = 0
+LAYER_OBJECTS = 1
+
+# Property value tags
+TAG_BOOL = 0
+TAG_INT = 1
+TAG_FLOAT = 2
+TAG_STRING = 3
+PROPERTY_VALUES = {
+    TAG_BOOL: struct.Struct("<?"),
+    TAG_INT: struct.Struct("<q"),
+    TAG_FLOAT: struct.Struct("<d"),
+    TAG_STRING: struct.Struct("<I")
+}
+
+ALIGNMENT = 8
+
+class _StringTable:
+    def __init__(self):
+        self.strings = [] # type: list[str]
+        self._index = dict() # type: dict[str, int]
+
+    def add(self, value: str) -> int:
+        value = "" if value is None else str(value)
+        i = self._index.get(value)
+        if i is None:
+            i = len(self.strings)
+            self.strings.append(value)
+            self._index[value] = i
+        return i
+
+def _property_tag(value) -> int:
+    if isinstance(value, bool): return TAG_BOOL
+    if isinstance(value, int): return TAG_INT
+    if isinstance(value, float): return TAG_FLOAT
+    return TAG_STRING
+
+def bake_map(loader, map_file: str, bundle_file: str = None) -> str:
+    """Compile a Tiled JSON map into a bundle next to it (or at bundle_file).
+    Uses the loader's asset paths. Returns the bundle path."""
+    map_path = os.path.join(loader.maps_path, map_file)
+    if bundle_file is None:
+        bundle_file = os.path.splitext(map_path)[0] + BUNDLE_EXTENSION
+
+    tilemap = loader.load_json(map_path)
+    object_types = loader.load_json(os.path.join(loader.assets_path, "objecttypes.json"))
+    strings = _StringTable()
+
+    # Variable sized head, fixed size payload pieces are placed after it
+    head = bytearray()
+    payload = [] # type: list[tuple[bytearray, int, bytes]]
+    def defer(target: bytearray, at: int, data: bytes):
+        # Patch the absolute offset in once the head size is known
+        payload.append((target, at, data))
+
+    types_part = bytearray(COUNT.pack(len(object_types)))
+    type_index = dict() # type: dict[str, int]
+    for i, ot in enumerate(object_types):
+        type_index[ot["name"]] = i
+        properties = ot.get("properties", [])
+        types_part += TYPE.pack(strings.add(ot["name"]), len(properties))
+        for p in properties:
+            value = p.get("value")
+            tag = _property_tag(value)
+            types_part += PROPERTY.pack(strings.add(p.get("name")), tag)
+            types_part += PROPERTY_VALUES[tag].pack(strings.add(value) if tag == TAG_STRING else value)
+
+    tilesets_part = bytearray(COUNT.pack(len(tilemap["tilesets"])))
+    for ts in tilemap["tilesets"]:
+        tileset = loader.load_json(os.path.join(loader.tilesets_path, pathlib.PurePath(ts["source"]).name))
+        image_path = os.path.join(loader.images_path, pathlib.PurePath(tileset["image"]).name)
+        image = pygame.image.load(image_path)
+        at = len(tilesets_part) + TILESET.size - 8
+        tilesets_part += TILESET.pack(ts["firstgid"], tileset["tilewidth"], tileset["tileheight"],
+            image.get_width(), image.get_height(), 0)
+        defer(tilesets_part, at, pygame.image.tobytes(image, "RGBA"))
+
+    layers_part = bytearray(COUNT.pack(len(tilemap["layers"])))
+    for layer in tilemap["layers"]:
+        if layer["type"] == "tilelayer":
+            layers_part += LAYER.pack(LAYER_TILES, strings.add(layer.get("name")))
+            at = len(layers_part) + TILE_LAYER.size - 8
+            layers_part += TILE_LAYER.pack(layer["width"], layer["height"], 0)
+            gids = decode_layer_data(layer)
+            if isinstance(gids, list):
+                defer(layers_part, at, struct.pack(f"<{len(gids)}I", *gids))
+            else:
+                defer(layers_part, at, gids.astype("<u4").tobytes())
+        elif layer["type"] == "objectgroup":
+            # Untyped objects & types missing from objecttypes.json are never built, leave them out
+            objects = [o for o in layer["objects"] if o.get("type") in type_index]
+            layers_part += LAYER.pack(LAYER_OBJECTS, strings.add(layer.get("name")))
+            at = len(layers_part) + OBJECT_LAYER.size - 8
+            layers_part += OBJECT_LAYER.pack(len(objects), 0)
+            records = bytearray()
+            for o in objects:
+                records += OBJECT.pack(o.get("id", 0), strings.add(o.get("name")), type_index[o.get("type")],
+                    o.get("gid") or 0, o.get("x"), o.get("y"), o.get("width"), o.get("height"))
+            defer(layers_part, at, bytes(records))
+
+    strings_part = bytearray(COUNT.pack(len(strings.strings)))
+    for value in strings.strings:
+        encoded = value.encode("utf-8")
+        strings_part += STRING_LENGTH.pack(len(encoded)) + encoded
+
+    head += HEADER.pack(MAGIC, VERSION, 0, tilemap["width"], tilemap["height"], tilemap["tilewidth"], tilemap["tileheight"])
+    # Offsets within each part become absolute once parts are laid out
+    part_starts = dict()
+    for part in (strings_part, types_part, tilesets_part, layers_part):
+        part_starts[id(part)] = len(head)
+        head += part
+
+    offset = len(head)
+    blobs = []
+    for target, at, data in payload:
+        offset += -offset % ALIGNMENT
+        struct.pack_into("<Q", head, part_starts[id(target)] + at, offset)
+        blobs.append((offset, data))
+        offset += len(data)
+
+    with open(bundle_file, "wb") as f:
+        f.write(head)
+        for at, data in blobs:
+            f.write(b"\0" * (at - f.tell()))
+            f.write(data)
+
+    logging.info(f"Baked {map_file} -> {bundle_file} ({offset} bytes)")
+    return bundle_file
+
+class MapBundle:
+    """Memory-mapped view of a baked map bundle.
+    Gid arrays and pixels are read straight out of the mapping."""
+    def __init__(self, bundle_file: str):
+        self.path = bundle_file
+        with open(bundle_file, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version, _, self.width, self.height, self.tile_width, self.tile_height = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{bundle_file} is not a map bundle")
+        if version != VERSION:
+            raise ValueError(f"{bundle_file} is bundle version {version}, expected {VERSION}")
+        at = HEADER.size
+
+        count, = COUNT.unpack_from(self._mmap, at)
+        at += COUNT.size
+        self.strings = [] # type: list[str]
+        for _ in range(count):
+            length, = STRING_LENGTH.unpack_from(self._mmap, at)
+            at += STRING_LENGTH.size
+            self.strings.append(str(self._view[at:at + length], "utf-8"))
+            at += length
+
+        count, = COUNT.unpack_from(self._mmap, at)
+        at += COUNT.size
+        self.object_types = [] # type: list[TiledType]
+        for _ in range(count):
+            name, prop_count = TYPE.unpack_from(self._mmap, at)
+            at += TYPE.size
+            props = []
+            for _ in range(prop_count):
+                prop_name, tag = PROPERTY.unpack_from(self._mmap, at)
+                at += PROPERTY.size
+                value, = PROPERTY_VALUES[tag].unpack_from(self._mmap, at)
+                at += PROPERTY_VALUES[tag].size
+                props.append({"name": self.strings[prop_name], "value": self.strings[value] if tag == TAG_STRING else value})
+            self.object_types.append(TiledType(self.strings[name], props))
+
+        count, = COUNT.unpack_from(self._mmap, at)
+        at += COUNT.size
+        self.tilesets = [TILESET.unpack_from(self._mmap, at + i * TILESET.size) for i in range(count)]
+        at += count * TILESET.size
+
+        count, = COUNT.unpack_from(self._mmap, at)
+        at += COUNT.size
+        self.layers = [] # type: list[tuple]
+        for _ in range(count):
+            kind, name = LAYER.unpack_from(self._mmap, at)
+            at += LAYER.size
+            if kind == LAYER_TILES:
+                self.layers.append((kind, self.strings[name]) + TILE_LAYER.unpack_from(self._mmap, at))
+                at += TILE_LAYER.size
+            else:
+                self.layers.append((kind, self.strings[name]) + OBJECT_LAYER.unpack_from(self._mmap, at))
+                at += OBJECT_LAYER.size
+
+    def close(self):
+        self._view.release()
+        self._mmap.close()
+
+    def tileset_image(self, index: int) -> pygame.Surface:
+        """Tileset pixels as a Surface, converted for fast blits (one copy, none headless)."""
+        _, _, _, width, height, offset = self.tilesets[index]
+        pixels = self._view[offset:offset + width * height * 4]
+        return convert_alpha(pygame.image.frombuffer(pixels, (width, height), "RGBA"))
+
+    def gids(self, layer: tuple):
+        """Tile layer gids, zero-copy out of the mapping on little-endian hosts.
+        A little-endian u32 array with numpy, else a flat buffer of native u32s."""
+        _, _, width, height, offset = layer
+        if np is not None:
+            return np.frombuffer(self._view, dtype="<u4", count=width * height, offset=offset)
+        gids = self._view[offset:offset + width * height * 4].cast("I")
+        if sys.byteorder == "big":
+            # Stored little-endian, swapped into a copy
+            gids = array("I", gids)
+            gids.byteswap()
+        return gids
+
+    def objects(self, layer: tuple):
+        """Object records straight from the packed data, no intermediate objects:
+        (type name, name, x, y, width, height, gid), see MapLoader.build_object."""
+        _, _, count, offset = layer
+        strings = self.strings
+        object_types = self.object_types
+        for _, name, type_index, gid, x, y, width, height in OBJECT.iter_unpack(self._view[offset:offset + count * OBJECT.size]):
+            yield (object_types[type_index].name, strings[name], x, y, width, height, gid or None)
+
+def main():
+    from .map_loader import MapLoader
+
+    parser = argparse.ArgumentParser(description="Bake Tiled JSON maps into binary bundles")
+    parser.add_argument("assets", help="Assets folder (with maps/, tilesets/, images/)")
+    parser.add_argument("maps", nargs="+", help="Map file names inside assets/maps")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    loader = MapLoader(args.assets)
+    for map_file in args.maps:
+        bake_map(loader, map_file)
+
+if __name__ == "__main__":
+    main()
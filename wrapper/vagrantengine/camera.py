@@ -0,0 +1,175 @@
+import pygame
+from pygame.sprite import LayeredDirty
+
+from .assets import alpha_surface
+from .game import Stage
+
+COLOR_BACKGROUND = (0, 0, 0)
+
+# Pans bigger than this fraction of the view redraw everything instead of scrolling
+SCROLL_LIMIT = 0.5
+
+class Camera:
+    """Composes the visible part of the stage into a viewport-sized buffer.
+    Small pans shift the last frame with Surface.scroll and only redraw the
+    newly exposed edge strips, plus wherever dirty sprites were and are now."""
+    def __init__(self, game: Stage, size: tuple[int, int], scroll_limit: float = SCROLL_LIMIT):
+        self._game = game
+        self.size = (int(size[0]), int(size[1]))
+        self.scroll_limit = scroll_limit
+
+        self.buffer = alpha_surface(self.size)
+        self.buffer.fill(COLOR_BACKGROUND)
+
+        # Viewport is cached until the focus point (or stage boundary) moves
+        self._viewport_key = None # type: tuple
+        self._viewport = None # type: pygame.Rect
+        # Viewport the buffer currently holds, None forces a full redraw
+        self._composed = None # type: pygame.Rect
+        # World rect each sprite was last drawn at
+        self._drawn = dict() # type: dict[pygame.sprite.Sprite, pygame.Rect]
+
+        self.scrolled = False
+
+    @property
+    def viewport(self) -> pygame.Rect:
+        """Calculate and return the Camera's current viewport
+        based on viewport size and current stage's focus point & boundary.
+        Follows the interpolated focus, so it pans smoothly between sim ticks.
+        Only re-calculated when the focus point moves."""
+        focus = self._game.render_focus_point
+        key = (focus, self._game.boundary)
+        if key == self._viewport_key:
+            return self._viewport
+
+        _viewport = pygame.Rect(
+            focus[0] - (self.size[0] / 2), # left
+            focus[1] - (self.size[1] / 2), # top
+            self.size[0], self.size[1] # width, height
+        )
+
+        # Too far left or right?
+        if _viewport.left < 0: _viewport.left = 0
+        if _viewport.right > self._game.boundary[0]:
+            _viewport.right = self._game.boundary[0]
+        # Too far up or down?
+        if _viewport.top < 0: _viewport.top = 0
+        if _viewport.bottom > self._game.boundary[1]:
+            _viewport.bottom = self._game.boundary[1]
+
+        self._viewport_key = key
+        self._viewport = _viewport
+        return _viewport
+
+    def invalidate(self):
+        """Force the next draw to recompose the whole view."""
+        self._composed = None
+        self._viewport_key = None
+
+    def draw(self, sprites: LayeredDirty) -> list[pygame.Rect]:
+        """Bring the buffer up to date with the sprites, in layer order.
+        Returns the view-space rects that changed."""
+        viewport = self.viewport
+        regions = [] # type: list[pygame.Rect]
+        self.scrolled = False
+
+        if self._composed is None:
+            full = True
+        else:
+            dx = viewport.x - self._composed.x
+            dy = viewport.y - self._composed.y
+            full = abs(dx) >= self.size[0] * self.scroll_limit or abs(dy) >= self.size[1] * self.scroll_limit
+            if not full and (dx or dy):
+                # Reuse what's still on screen, only strips are new
+                self.buffer.scroll(-dx, -dy)
+                self.scrolled = True
+                if dx > 0:
+                    regions.append(pygame.Rect(viewport.right - dx, viewport.top, dx, viewport.h))
+                elif dx < 0:
+                    regions.append(pygame.Rect(viewport.left, viewport.top, -dx, viewport.h))
+                if dy > 0:
+                    regions.append(pygame.Rect(viewport.left, viewport.bottom - dy, viewport.w, dy))
+                elif dy < 0:
+                    regions.append(pygame.Rect(viewport.left, viewport.top, viewport.w, -dy))
+        self._composed = pygame.Rect(viewport)
+
+        sprite_list = sprites.sprites() # Layer ordered
+        if full:
+            regions = [pygame.Rect(viewport)]
+            self._drawn = {s: pygame.Rect(draw_rect(s)) for s in sprite_list if s.visible}
+        else:
+            # Sprites that left the group still need erasing
+            alive = set(sprite_list)
+            for s in [s for s in self._drawn if s not in alive]:
+                regions.append(self._drawn.pop(s))
+
+            for s in sprite_list:
+                if s.dirty:
+                    # Erase where it was, draw where it is
+                    last = self._drawn.pop(s, None)
+                    if last is not None:
+                        regions.append(last)
+                    if s.visible:
+                        rect = draw_rect(s)
+                        regions.append(rect)
+                        self._drawn[s] = pygame.Rect(rect)
+
+        regions = [r.clip(viewport) for r in merge_rects(regions)]
+        regions = [r for r in regions if r.w > 0 and r.h > 0]
+        if regions:
+            self._redraw(sprite_list, regions, viewport)
+
+        for s in sprite_list:
+            if s.dirty == 1:
+                s.dirty = 0
+
+        if full or self.scrolled:
+            return [self.buffer.get_rect()]
+        return [r.move(-viewport.x, -viewport.y) for r in regions]
+
+    def _redraw(self, sprite_list: list, regions: list[pygame.Rect], viewport: pygame.Rect):
+        """Repaint world-space regions of the buffer. Regions must not overlap."""
+        offset = (-viewport.x, -viewport.y)
+        buffer = self.buffer
+        for r in regions:
+            buffer.fill(COLOR_BACKGROUND, r.move(offset))
+
+        for s in sprite_list:
+            if not s.visible:
+                continue
+            draw_region = getattr(s, "draw_region", None)
+            if draw_region is not None:
+                # Chunked tile layers draw straight from their chunks
+                for r in regions:
+                    draw_region(buffer, r, offset)
+                continue
+
+            rect = draw_rect(s)
+            hits = rect.collidelistall(regions)
+            if not hits:
+                continue
+            dest = (rect.x + offset[0], rect.y + offset[1])
+            for i in hits:
+                buffer.set_clip(regions[i].move(offset))
+                buffer.blit(s.image, dest, s.source_rect)
+        buffer.set_clip(None)
+
+def draw_rect(sprite) -> pygame.Rect:
+    """Where a sprite is drawn: its interpolated render_rect if it has one."""
+    render_rect = getattr(sprite, "render_rect", None)
+    return render_rect if render_rect is not None else sprite.rect
+
+def merge_rects(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+    """Union overlapping (or touching) rects until none overlap."""
+    merged = [] # type: list[pygame.Rect]
+    for r in rects:
+        if r.w <= 0 or r.h <= 0:
+            continue
+        r = pygame.Rect(r)
+        # Absorb anything this rect touches, repeat since it grows
+        i = r.inflate(2, 2).collidelist(merged)
+        while i != -1:
+            r.union_ip(merged.pop(i))
+            i = r.inflate(2, 2).collidelist(merged)
+        merged.append(r)
+    return merged
@@ -0,0 +1,71 @@
+import logging
+from heapq import heappop, heappush
+
+from .spatial import BBox, StaticIndex
+
+def overlaps(a: BBox, b: BBox) -> bool:
+    """AABB overlap test, edges touching count (same as the indexes)."""
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+def sweep_and_prune(sprites: list) -> list[tuple]:
+    """Broad phase over every dynamic sprite in a single pass.
+    Sorts AABBs once along x, then scans keeping the open intervals active.
+    Only pairs with at least one moving sprite are returned, in sweep order."""
+    # Snapshot each bbox once, sprites at rest still block movers
+    entries = sorted(
+        ((s.bbox, s.is_moving, s) for s in sprites),
+        key=lambda e: (e[0][0], e[0][1])
+    )
+
+    pairs = []
+    active = dict() # type: dict[int, tuple] # Insertion ordered, i.e. sweep order
+    closing = [] # type: list[tuple[int, int]] # (right edge, entry), soonest closed first
+    for i, entry in enumerate(entries):
+        bbox, moving, sprite = entry
+        left, top, right, bottom = bbox
+        # Drop intervals that closed before this one opens, never rebuilding the rest
+        while closing and closing[0][0] < left:
+            del active[heappop(closing)[1]]
+        for other_bbox, other_moving, other in active.values():
+            if (moving or other_moving) and other_bbox[1] <= bottom and other_bbox[3] >= top:
+                pairs.append((other, sprite))
+        active[i] = entry
+        heappush(closing, (right, i))
+
+    return pairs
+
+def resolve_batch(sprites: list, static_index: StaticIndex = None) -> dict:
+    """Batched collision phase for one tick.
+    Movers are checked against baked static geometry first, then against each
+    other from a single sweep-and-prune taken after those pushes, so mover pairs
+    see where the walls left them. Pairs are resolved in one ordered pass each.
+    Returns {sprite: bbox before resolution} for every sprite that got pushed,
+    so the caller can update the dynamic index once per sprite."""
+    movers = [s for s in sprites if s.is_moving]
+    if not movers:
+        return {}
+
+    pushed = dict()
+    # Walls first, same priority as the per-sprite resolution
+    if static_index is not None:
+        static_pairs = []
+        for s in sorted(movers, key=lambda m: (m.left, m.top)):
+            static_pairs.extend((s, c) for c in static_index.intersect(s.bbox))
+        resolve_pairs(static_pairs, pushed)
+    resolve_pairs(sweep_and_prune(sprites), pushed)
+
+    logging.debug(f"Collision batch: {len(movers)} movers, {len(pushed)} pushed")
+    return pushed
+
+def resolve_pairs(pairs: list[tuple], pushed: dict):
+    """Push movers out of the solids they overlap, pair by pair, in order.
+    Records each pushed sprite's first bbox in pushed."""
+    for a, b in pairs:
+        # An earlier push might have already separated the pair
+        if not overlaps(a.bbox, b.bbox):
+            continue
+        for mover, solid in ((a, b), (b, a)):
+            if mover.is_moving and getattr(solid, "solid", False) and hasattr(mover, "push_out_of"):
+                pushed.setdefault(mover, mover.bbox)
+                mover.push_out_of(solid)
+                break
@@ -1,4 +1,5 @@
 import logging
+import time
 
 import pygame
 import pygame.display
@@ -6,37 +7,91 @@ import pygame.time
 
 from .game import Stage
 from .eventhandler import handle_events
+from .map_loader import MapLoader, PendingMap
 from .rendering import Renderer
+from .scheduler import Scheduler
+from .stages import STAGE_STACK
 
-FRAME_RATE = 60
-MS_PER_FRAME = (1 / FRAME_RATE) * 1000
-GAME_CLOCK = pygame.time.Clock()
+_SCHEDULER = None # type: Scheduler
+# Background map loads waiting to be swapped in
+_PENDING_MAPS = [] # type: list[PendingMap]
 
-_GAME = None # type: Stage
+def change_map(loader: MapLoader, map_file: str) -> PendingMap:
+    """Start loading a map in the background, the game keeps running meanwhile.
+    The loop swaps it into the running stage on the first frame it's ready."""
+    pending = loader.load_map_async(map_file, STAGE_STACK.top)
+    _PENDING_MAPS.append(pending)
+    return pending
 
-def game_start(game: Stage, renderer: Renderer):
-    """Setup the game to run, and then run!"""
-    global _GAME
-    _GAME = game
+def apply_pending_maps():
+    """Swap in any finished background loads, in the order they were started."""
+    while _PENDING_MAPS and _PENDING_MAPS[0].ready:
+        pending = _PENDING_MAPS.pop(0)
+        pending.apply()
+        renderer = STAGE_STACK.renderer_for(pending.stage)
+        if renderer is not None:
+            # New boundary, and nothing on screen belongs to the new map
+            renderer.reset_view()
 
-    GAME_CLOCK.tick(FRAME_RATE) # Setup initial frame
-    game_loop(renderer)
+def game_start(game: Stage, renderer: Renderer, scheduler: Scheduler = None):
+    """Setup the game to run, and then run!
+    game goes on the stage stack, the loop always runs whichever stage is on top.
+    Tick & render rates, catch-up and budgets come from the scheduler."""
+    global _SCHEDULER
+    if STAGE_STACK.top is not game:
+        STAGE_STACK.push(game, renderer)
+    _SCHEDULER = scheduler if scheduler is not None else Scheduler()
 
-def game_loop(renderer: Renderer):
-    time_buffer = 0 # How many MS have passed since last frame
+    _SCHEDULER.start() # Setup initial frame
+    game_loop()
 
-    while True:
-        time_buffer += GAME_CLOCK.get_time()
-        # If enough time has passed for at least one frame
-        while time_buffer >= MS_PER_FRAME:
-            handle_events()
-            _GAME.update()
-            time_buffer -= MS_PER_FRAME
+def game_loop():
+    def render():
+        # Render the game after catching-up on updates,
+        # movers part way to the next sim tick when interpolating
+        STAGE_STACK.render(_SCHEDULER.alpha if _SCHEDULER.interpolate else None)
+        pygame.display.set_caption(f"FPS: {_SCHEDULER.stats.fps:2f}")
 
-        # Render the game after catching-up on updates
-        renderer.render()
+    while True:
+        apply_pending_maps()
+        # Events once per frame, then as many sim ticks as are owed (capped)
+        _SCHEDULER.frame(handle_events, STAGE_STACK.update, render)
 
-        pygame.display.set_caption(f"FPS: {GAME_CLOCK.get_fps():2f}")
+def run_headless(game: Stage, ticks: int, scheduler: Scheduler = None, events=None, update=None) -> dict:
+    """Run ticks of game.update with no display or renderer, for server-side
+    sims and benchmarks. Without a scheduler the updates run back to back,
+    uncapped; with one (e.g. on a VirtualClock) they run on its fixed-step
+    schedule, minus the rendering. Reports ticks per (wall clock) second.
+    update replaces game.update, e.g. InputReplay.update to replay a session."""
+    if events is None:
+        events = lambda: None
+    if update is None:
+        update = game.update
+    start = time.perf_counter()
+    if scheduler is None:
+        for _ in range(ticks):
+            events()
+            update()
+        frames = ticks
+    else:
+        scheduler.start()
+        frames = 0
+        ran = 0
+        while ran < ticks:
+            # Stops at the frame that completes the run, may overshoot by a catch-up
+            ran += scheduler.frame(events, update, lambda: None)
+            frames += 1
+        ticks = ran
+    elapsed = time.perf_counter() - start
 
-        # Tick to the next frame
-        GAME_CLOCK.tick(FRAME_RATE)
\ No newline at end of file
+    result = {
+        "ticks": ticks,
+        "frames": frames,
+        "seconds": elapsed,
+        "tps": ticks / elapsed if elapsed else 0.0,
+        "ms_per_tick": (elapsed * 1000) / ticks if ticks else 0.0
+    }
+    if scheduler is not None:
+        result["stats"] = scheduler.stats.summary()
+    logging.info(f"Headless: {ticks} ticks in {elapsed:.3f}s ({result['tps']:.0f} ticks/s)")
+    return result
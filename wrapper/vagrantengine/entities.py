@@ -0,0 +1,142 @@
+try:
+    import numpy as np
+except ImportError: # Optional, only needed for the entity store
+    np = None
+
+DEFAULT_CAPACITY = 1024
+
+class EntityStore:
+    """Structure-of-arrays store for mover positions and velocities.
+    x/y/w/h/dx/dy live in contiguous NumPy arrays so a single vectorized step
+    integrates every mover. Attached sprites stay thin views: their rect is
+    written back only when they actually move, so LayeredDirty keeps working.
+    Attached sprites aren't update()d, step rolls their last position forward too."""
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if np is None:
+            raise ImportError("EntityStore requires numpy, install it or run without an entity store")
+
+        self.count = 0
+        self.sprites = [] # type: list
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        def grow(old):
+            new = np.zeros(capacity, dtype=np.int32)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.x = grow(getattr(self, "x", None))
+        self.y = grow(getattr(self, "y", None))
+        self.w = grow(getattr(self, "w", None))
+        self.h = grow(getattr(self, "h", None))
+        self.dx = grow(getattr(self, "dx", None))
+        self.dy = grow(getattr(self, "dy", None))
+        # Whether the last step moved the slot
+        self.moved = grow(getattr(self, "moved", None))
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, sprite):
+        return getattr(sprite, "_store", None) is self
+
+    def add(self, sprite) -> int:
+        """Attach a MoveableSprite, copying its rect & movement vector in."""
+        if self.count >= self.capacity:
+            self._allocate(self.capacity * 2)
+
+        vector = sprite.movement_vector
+        slot = self.count
+        self.x[slot], self.y[slot], self.w[slot], self.h[slot] = sprite.rect
+        self.dx[slot], self.dy[slot] = vector
+        self.moved[slot] = sprite.is_moving
+        self.sprites.append(sprite)
+        self.count += 1
+
+        sprite._store = self
+        sprite._slot = slot
+        return slot
+
+    def remove(self, sprite):
+        """Detach a sprite, compacting the arrays by swapping the last slot in."""
+        if sprite not in self:
+            return
+        slot = sprite._slot
+        vector = self.get_vector(slot)
+        last = self.count - 1
+
+        if slot != last:
+            for a in (self.x, self.y, self.w, self.h, self.dx, self.dy, self.moved):
+                a[slot] = a[last]
+            moved = self.sprites[last]
+            self.sprites[slot] = moved
+            moved._slot = slot
+        self.sprites.pop()
+        self.count -= 1
+
+        sprite._store = None
+        sprite._slot = -1
+        sprite.movement_vector = vector
+
+    def clear(self):
+        for s in list(self.sprites):
+            self.remove(s)
+
+    def get_vector(self, slot: int) -> tuple:
+        return (int(self.dx[slot]), int(self.dy[slot]))
+
+    def set_vector(self, slot: int, vector: tuple):
+        self.dx[slot], self.dy[slot] = vector
+
+    def pull(self, sprites):
+        """Copy rect positions back into the arrays,
+        for sprites moved outside the store (collision pushes, clamping)."""
+        for s in sprites:
+            if s in self:
+                self.x[s._slot] = s.rect.x
+                self.y[s._slot] = s.rect.y
+
+    def step(self) -> list:
+        """Integrate every mover in one vectorized pass, standing in for the
+        attached sprites' own update: last position & bbox roll forward here.
+        Returns the sprites that moved."""
+        n = self.count
+        if n == 0:
+            return []
+
+        x, y = self.x[:n], self.y[:n]
+        dx, dy = self.dx[:n], self.dy[:n]
+        moving = (dx != 0) | (dy != 0)
+        # Moved last step but not this one, only their last position needs catching up
+        stopped = np.flatnonzero((self.moved[:n] != 0) & ~moving)
+        self.moved[:n] = moving
+        sprites = self.sprites
+        for i in stopped.tolist():
+            s = sprites[i]
+            s.last_rect.update(s.rect)
+            s.last_bbox = s.bbox
+
+        moving = np.flatnonzero(moving)
+        if moving.size == 0:
+            return []
+        x += dx
+        y += dy
+
+        # Only movers touch Python objects: swap in last_rect (now the previous
+        # position) and move it, so nothing is allocated but the bbox tuple
+        moved = []
+        for i, mx, my, w, h in zip(moving.tolist(), x[moving].tolist(), y[moving].tolist(),
+            self.w[moving].tolist(), self.h[moving].tolist()):
+            s = sprites[i]
+            rect = s.last_rect
+            s.last_rect = s.rect
+            rect.topleft = (mx, my)
+            s.rect = rect
+            s.last_bbox = s.bbox
+            s.bbox = (mx, my, mx + w, my + h)
+            s.dirty = 1
+            moved.append(s)
+
+        return moved
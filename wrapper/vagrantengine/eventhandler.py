@@ -6,9 +6,11 @@ import pygame.event
 from pygame.event import Event
 
 from .game import Stage
+from .inputs import InputRecorder
 
 _GAME = None # type: Stage
 _BINDINGS = None # type: dict[int, str]
+_RECORDER = None # type: InputRecorder
 
 def register_game(game: Stage):
     global _GAME
@@ -21,19 +23,45 @@ def register_key_bindings(bindings):
     global _BINDINGS
     _BINDINGS = bindings
 
+def get_key_bindings() -> dict[int, str]:
+    return _BINDINGS
+
+def start_recording(path: str, **metadata) -> InputRecorder:
+    """Record every dispatched action from here on, saved to path on stop or quit.
+    Covers the current stage & map only, see inputs.InputRecorder."""
+    global _RECORDER
+    _RECORDER = InputRecorder(_GAME, path, **metadata)
+    return _RECORDER
+
+def stop_recording() -> str:
+    """Save and stop the current recording, returns its path."""
+    global _RECORDER
+    if _RECORDER is None:
+        return None
+    path = _RECORDER.save()
+    _RECORDER = None
+    return path
+
+def dispatch(action: str, event_type: int):
+    """Send a resolved action to the game (and the recording, if any)."""
+    if _RECORDER is not None:
+        _RECORDER.record(_GAME, action, event_type)
+    _GAME.actions[action](event_type)
+
 def handle_event(event: Event):
     # event_type = event.type
     # logging.info(f"Event: {event.type}")
     if event.type == pygame.QUIT:
+        stop_recording()
         pygame.quit()
         sys.exit(0)
     elif event.type == pygame.KEYDOWN:
         logging.info(f"Key: {event.key}")
         action = _BINDINGS.get(event.key)
-        if action is not None: _GAME.actions[action](pygame.KEYDOWN)
+        if action is not None: dispatch(action, pygame.KEYDOWN)
     elif event.type == pygame.KEYUP:
         action = _BINDINGS.get(event.key)
-        if action is not None: _GAME.actions[action](pygame.KEYUP)
+        if action is not None: dispatch(action, pygame.KEYUP)
 
 def handle_events():
     for event in pygame.event.get():
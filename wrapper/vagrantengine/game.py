@@ -9,10 +9,15 @@ import pygame
 import pygame.image
 import pygame.transform
 from pygame.sprite import GroupSingle, Group, LayeredDirty
-from pyqtree import Index
 
 # from constants import ROOT_PATH
-from .sprites import ActorSprite, GameSprite, MoveableSprite
+from .animators import AnimationSystem
+from .sprites import ActorSprite, AnimatedSprite, GameSprite, MoveableSprite
+from .collision import resolve_batch
+from .entities import EntityStore
+from .pooling import SpritePools
+from .profiler import PROFILER
+from .spatial import INDEX_BACKENDS, SpatialIndex, StaticIndex
 
 # SCENES = os.path.join(ROOT_PATH, "scenes")
 # MAPS = os.path.join(ROOT_PATH, "maps")
@@ -20,22 +25,44 @@ from .sprites import ActorSprite, GameSprite, MoveableSprite
 # Type Alias for game object collection
 # ActorSet = set[Actor]
 
+# Everything a map load builds, swapped as a whole by Stage.adopt
+WORLD_STATE = (
+    "sprite_layers", "actors", "tilemap", "props", "dynamic_props",
+    "player", "boundary", "collision_index", "static_index", "entity_store",
+    "animations"
+)
+
 # Stage class
 class Stage(ABC):
     """Stage class. Full game can involved multiple stages in a stack.
     Stage should wrap common elements for any stage.
     Should extend Stage, add registered components for different game types"""
-    def __init__(self):
+    def __init__(self, index_backend: str = "hash", entity_store: EntityStore = None, **index_options):
         # Concrete Groups
         self.sprite_layers = LayeredDirty() # TODO: Extend class to account for MySprite type?
         self.actors = Group()
-        self.tilemap = GroupSingle()
+        self.tilemap = Group() # One chunked sprite per tile layer
         self.props = Group()
+        # Props that can move, the rest are static and never updated
+        self.dynamic_props = Group()
         # self.player = GroupSingle()
         self.player = None # type: ActorSprite
         # TODO: Make boundary a rect?
         self.boundary = None # type: tuple
-        self.collision_index = None # type: Index
+        self.collision_index = None # type: SpatialIndex
+        # Baked once per map, holds everything that never moves
+        self.static_index = None # type: StaticIndex
+        # Collision index backend, built per map via reset_collision_index
+        self.index_backend = INDEX_BACKENDS[index_backend]
+        self.index_options = index_options
+        # Optional vectorized position/velocity store for movers
+        self.entity_store = entity_store
+        # Animation tick & schedule, every animated sprite steps in one batch
+        self.animations = AnimationSystem()
+        # Updates run so far, input recordings & replays are keyed on it
+        self.ticks = 0
+        # Despawned sprites kept for reuse, per type. Outlive map loads
+        self.pools = SpritePools()
 
         # Command Pattern?
         self.actions = {
@@ -55,6 +82,104 @@ class Stage(ABC):
         else:
             return (self.boundary[0] / 2, self.boundary[1] / 2)
 
+    def blank(self) -> "Stage":
+        """Empty stage with the same index & entity store setup,
+        to build a map into off to the side (see MapLoader.load_map_async)."""
+        stage = Stage.__new__(type(self))
+        entity_store = None
+        if self.entity_store is not None:
+            entity_store = type(self.entity_store)(self.entity_store.capacity)
+        Stage.__init__(stage, entity_store=entity_store, **self.index_options)
+        stage.index_backend = self.index_backend
+        return stage
+
+    def adopt(self, other: "Stage"):
+        """Take over another stage's world in one go, only references move.
+        The old world's movers are despawned first, back to this stage's pools;
+        its static sprites & tilemap are dropped as-is. ticks & pools are the
+        stage's own, not the world's, and carry on across the swap."""
+        for s in self.actors.sprites() + self.dynamic_props.sprites():
+            self.despawn(s)
+        for name in WORLD_STATE:
+            setattr(self, name, getattr(other, name))
+
+    @property
+    def render_focus_point(self) -> tuple:
+        """Focus point as drawn, follows the player's interpolated position."""
+        if self.player is not None and self.player.render_rect is not None:
+            return (self.player.render_rect.x, self.player.render_rect.y)
+        return self.focus_point
+
+    def interpolate(self, alpha: float):
+        """Place every mover's render_rect alpha (0..1) of the way from its
+        previous sim position (last_rect) to its current one (rect).
+        Only drawing uses it, rect & last_rect stay authoritative."""
+        for s in chain(self.actors, self.dynamic_props):
+            rect, last = s.rect, s.last_rect
+            x = round(last.x + (rect.x - last.x) * alpha)
+            y = round(last.y + (rect.y - last.y) * alpha)
+            render = s.render_rect
+            if render is None:
+                s.render_rect = pygame.Rect(x, y, rect.w, rect.h)
+                s.dirty = 1
+            elif render.x != x or render.y != y or render.size != rect.size:
+                # In place, sprites keep one render rect
+                render.update(x, y, rect.w, rect.h)
+                s.dirty = 1
+
+    def reset_collision_index(self, bbox: tuple) -> SpatialIndex:
+        """Build a fresh, empty collision index covering bbox."""
+        self.collision_index = self.index_backend(bbox=bbox, **self.index_options)
+        return self.collision_index
+
+    def bake_static_index(self, sprites: list[GameSprite]) -> StaticIndex:
+        """Build the immutable static collision structure.
+        Should be called once, after all map objects are loaded."""
+        self.static_index = StaticIndex((s, s.bbox) for s in sprites)
+        logging.info(f"Static Index baked with {len(self.static_index)} sprites")
+        return self.static_index
+
+    def add_mover(self, sprite: MoveableSprite):
+        """Register a moving sprite with the dynamic index (and entity store, if used)."""
+        self.collision_index.insert(sprite, sprite.bbox)
+        if self.entity_store is not None:
+            self.entity_store.add(sprite)
+
+    def add_animated(self, sprite: AnimatedSprite):
+        """Hook an animated sprite's animator up to the stage's animation tick."""
+        self.animations.add(sprite.animator)
+
+    def spawn(self, sprite: MoveableSprite, layer: int):
+        """Put a (new or pooled) mover into the world: groups, index & animation tick.
+        Static sprites belong in the baked StaticIndex, they can only come with the map."""
+        if not isinstance(sprite, MoveableSprite):
+            raise TypeError(f"Only movers can be spawned at runtime, not {sprite.__class__.__name__}")
+        self.sprite_layers.add(sprite, layer=layer)
+        if isinstance(sprite, ActorSprite):
+            self.actors.add(sprite)
+        else:
+            self.props.add(sprite)
+            self.dynamic_props.add(sprite)
+        self.add_mover(sprite)
+        if isinstance(sprite, AnimatedSprite):
+            self.add_animated(sprite)
+
+    def despawn(self, sprite: MoveableSprite) -> bool:
+        """Take a mover out of the world, back to its type's pool if there is one.
+        Out of every group, index & schedule, so it costs nothing per frame.
+        Returns whether it was pooled."""
+        if not isinstance(sprite, MoveableSprite):
+            raise TypeError(f"Only movers can be despawned, {sprite.__class__.__name__} is baked into the static index")
+        self.collision_index.remove(sprite, sprite.bbox)
+        if self.entity_store is not None:
+            self.entity_store.remove(sprite)
+        if isinstance(sprite, AnimatedSprite):
+            self.animations.remove(sprite.animator)
+        sprite.kill()
+        if self.player is sprite:
+            self.player = None
+        return self.pools.release(sprite)
+
     def player_move(self, x, y, ev: pygame.KEYDOWN | pygame.KEYUP, action: str):
         """Apply Movement Vector to player character."""
         if self.player is not None:
@@ -74,47 +199,67 @@ class Stage(ABC):
         """Called to trigger update of game state.
         Should be called once per frame, or more if playing catch-up.
         Extend this in an inherited class, if necessary"""
-                
-        self.tilemap.update()
-        self.actors.update()
-        self.props.update()
-        # TODO: Does LayeredDirty update layer by layer?
+        self.ticks += 1
+
+        # Tilemap & static props are baked, only movers get updated
+        with PROFILER.section("update.sprites"):
+            if self.entity_store is None:
+                self.actors.update()
+                self.dynamic_props.update()
+            else:
+                # Every mover is in the store, one vectorized step stands in for their update()
+                moved_sprites = self.entity_store.step()
+            # Only sprites whose animation slice changes this tick are touched
+            self.animations.step()
+            # TODO: Does LayeredDirty update layer by layer?
 
         # Recalculate Index
-        moved_actors = (s for s in self.actors.sprites() if s.is_moving)
-        moved_props = (s for s in self.props.sprites() if s.is_moving)
-        moved_sprites = chain(moved_actors, moved_props)
-        # logging.info(moved_sprites)
-        for s in moved_sprites:
-            # logging.info(f"{s.name} moving from {s.last_rect} to {s.rect}")
-            # TODO: Extend/write my own pyqtree?
-            # if s.last_rect is not None: 
-            self.collision_index.remove(s, s.last_bbox)
-            self.collision_index.insert(s, s.bbox)
-            s.resolve_collisions(self.collision_index)
-
-            # Check boundaries
-            if self.player is not None:
-                temp = self.player.bbox # Immutable value
-                changed = False
-
-                if self.player.left < 0:
-                    self.player.rect.left = 0
-                    changed = True
-                elif self.player.right > self.boundary[0]:
-                    self.player.rect.right = self.boundary[0]
-                    changed = True
-
-                if self.player.top < 0:
-                    self.player.rect.top = 0
-                    changed = True
-                elif self.player.bottom > self.boundary[1]:
-                    self.player.rect.bottom = self.boundary[1]
-                    changed = True
-
-                if changed:
-                    self.collision_index.remove(s, temp)
-                    self.collision_index.insert(s, s.bbox)
+        with PROFILER.section("update.index"):
+            dynamic_sprites = self.actors.sprites() + self.dynamic_props.sprites()
+            if self.entity_store is None:
+                moved_sprites = [s for s in dynamic_sprites if s.is_moving]
+            if not moved_sprites:
+                return
+
+            for s in moved_sprites:
+                # logging.info(f"{s.name} moving from {s.last_rect} to {s.rect}")
+                self.collision_index.move(s, s.last_bbox, s.bbox)
+
+        with PROFILER.section("update.collision"):
+            self.resolve_collisions(dynamic_sprites)
+
+    def resolve_collisions(self, dynamic_sprites: list[MoveableSprite]):
+        """Single batched collision phase for every mover, then keep the player in bounds."""
+        pushed = resolve_batch(dynamic_sprites, self.static_index)
+        for s, before in pushed.items():
+            self.collision_index.move(s, before, s.bbox)
+        if self.entity_store is not None:
+            self.entity_store.pull(pushed)
+
+        # Check boundaries
+        if self.player is not None and self.player.is_moving:
+            temp = self.player.bbox # Immutable value
+            changed = False
+
+            if self.player.left < 0:
+                self.player.rect.left = 0
+                changed = True
+            elif self.player.right > self.boundary[0]:
+                self.player.rect.right = self.boundary[0]
+                changed = True
+
+            if self.player.top < 0:
+                self.player.rect.top = 0
+                changed = True
+            elif self.player.bottom > self.boundary[1]:
+                self.player.rect.bottom = self.boundary[1]
+                changed = True
+
+            if changed:
+                self.player.refresh_bbox()
+                self.collision_index.move(self.player, temp, self.player.bbox)
+                if self.entity_store is not None:
+                    self.entity_store.pull((self.player,))
 
 # def construct_actor(images_path: str, **kwargs) -> Actor:
 #     """Instantiate an Actor object based on dictionary/json values"""
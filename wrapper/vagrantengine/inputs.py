@@ -0,0 +1,123 @@
+"""Recording & replay of the resolved action stream.
+
+Only what reached Stage.actions is kept: (tick, action, KEYDOWN/KEYUP),
+where tick is Stage.ticks when the action was dispatched. Replaying the
+stream onto the same map, one tick at a time, reproduces the session.
+
+A recording covers one stage on one map. Map swaps (Stage.adopt) and
+StageStack pushes/pops happen at ticks a replay can't reproduce, so the
+recorder raises if actions reach it after either; stop recording first.
+
+File layout, little-endian:
+    header      magic, version, record count, last tick, action count, metadata length
+    metadata    utf-8 json (map file, tick rate...)
+    actions     (u16 length, utf-8 name) each
+    records     u32 tick, u16 action index, u8 pressed (1 KEYDOWN, 0 KEYUP)
+"""
+import json
+import logging
+import struct
+
+import pygame
+
+from .game import Stage
+
+MAGIC = b"VGIR"
+VERSION = 1
+RECORDING_EXTENSION = ".vgir"
+
+HEADER = struct.Struct("<4sHIIHI")
+NAME_LENGTH = struct.Struct("<H")
+RECORD = struct.Struct("<IHB")
+
+class InputRecorder:
+    """Collects dispatched actions against the stage's tick."""
+    def __init__(self, game: Stage, path: str = None, **metadata):
+        self._game = game
+        self.path = path
+        self.metadata = metadata
+        self.actions = [] # type: list[str]
+        self._action_index = dict() # type: dict[str, int]
+        self.records = [] # type: list[tuple[int, int, bool]]
+        self.start_tick = game.ticks
+        # Swapped out as a whole when another map is adopted
+        self._world = game.sprite_layers
+
+    def record(self, game: Stage, action: str, event_type: int):
+        """Record an action dispatched to game, the stage being recorded."""
+        if game is not self._game:
+            raise RuntimeError(f"Recording {self._game}, but actions now go to {game}: stop recording before changing stages")
+        if game.sprite_layers is not self._world:
+            raise RuntimeError("The recorded stage adopted another map: stop recording before swapping maps")
+        i = self._action_index.get(action)
+        if i is None:
+            i = len(self.actions)
+            self.actions.append(action)
+            self._action_index[action] = i
+        self.records.append((self._game.ticks - self.start_tick, i, event_type == pygame.KEYDOWN))
+
+    def save(self, path: str = None) -> str:
+        path = path or self.path
+        last_tick = self._game.ticks - self.start_tick
+        metadata = json.dumps(self.metadata).encode("utf-8")
+
+        data = bytearray(HEADER.pack(MAGIC, VERSION, len(self.records), last_tick, len(self.actions), len(metadata)))
+        data += metadata
+        for action in self.actions:
+            encoded = action.encode("utf-8")
+            data += NAME_LENGTH.pack(len(encoded)) + encoded
+        for tick, i, pressed in self.records:
+            data += RECORD.pack(tick, i, pressed)
+
+        with open(path, "wb") as f:
+            f.write(data)
+        logging.info(f"Recorded {len(self.records)} actions over {last_tick} ticks to {path}")
+        return path
+
+class InputReplay:
+    """A recorded action stream, fed back into a stage tick by tick.
+    Use update() in place of Stage.update."""
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, count, self.ticks, action_count, metadata_length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an input recording")
+        if version != VERSION:
+            raise ValueError(f"{path} is recording version {version}, expected {VERSION}")
+        at = HEADER.size
+
+        self.metadata = json.loads(data[at:at + metadata_length].decode("utf-8"))
+        at += metadata_length
+
+        self.actions = [] # type: list[str]
+        for _ in range(action_count):
+            length, = NAME_LENGTH.unpack_from(data, at)
+            at += NAME_LENGTH.size
+            self.actions.append(data[at:at + length].decode("utf-8"))
+            at += length
+
+        # Grouped by tick, so each update only looks up its own
+        self.by_tick = dict() # type: dict[int, list[tuple[str, int]]]
+        for tick, i, pressed in RECORD.iter_unpack(data[at:at + count * RECORD.size]):
+            self.by_tick.setdefault(tick, []).append((self.actions[i], pygame.KEYDOWN if pressed else pygame.KEYUP))
+        self.count = count
+
+        self._game = None # type: Stage
+        self._start_tick = 0
+
+    def attach(self, game: Stage):
+        """Replay into game, counting ticks from where it is now."""
+        self._game = game
+        self._start_tick = game.ticks
+
+    @property
+    def done(self) -> bool:
+        return self._game is not None and self._game.ticks - self._start_tick >= self.ticks
+
+    def update(self):
+        """Dispatch this tick's recorded actions, then update the stage."""
+        for action, event_type in self.by_tick.get(self._game.ticks - self._start_tick, ()):
+            self._game.actions[action](event_type)
+        self._game.update()
@@ -2,30 +2,109 @@ import logging
 import os
 import pathlib
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Generator
 
 import pygame
 from pygame import sprite
 import pygame.image
+import pygame.mask
 from pygame.sprite import Sprite
-from pyqtree import Index
 
-from wrapper.vagrantengine.animators import SpriteAnimator
+from .animators import build_animations
 
+from .assets import ASSET_CACHE, AssetCache, alpha_surface, convert_alpha
+from .bundle import BUNDLE_EXTENSION, LAYER_TILES, MapBundle
 from .game import Stage
-from .sprites import ActorSprite, GameSprite, TilemapSprite
-from .tiled import TiledObject, TiledType
+from .sprites import ActorSprite, GameSprite, MoveableSprite
+from .tilemap import ChunkedTilemapSprite
+from .prototypes import PrototypeRegistry
+from .tiled import FLIP_FLAGS, GID_MASK, TiledType, decode_layer_data, flip_tile
+
+# Background map loads, one at a time; created on first use
+_LOAD_EXECUTOR = None # type: ThreadPoolExecutor
+
+# Object types placed on the map as sprites, the rest are skipped
+# TODO: Pull in Mapping from Game, not Engine
+ENVIRONMENT_TYPES = {"Wall", "Solid", "Spawn Point"}
+
+def _executor() -> ThreadPoolExecutor:
+    global _LOAD_EXECUTOR
+    if _LOAD_EXECUTOR is None:
+        _LOAD_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="map-loader")
+    return _LOAD_EXECUTOR
+
+class PendingMap:
+    """Handle on a map loading in the background.
+    Poll ready from the game loop, then apply() to swap it into the stage."""
+    def __init__(self, map_file: str, stage: Stage, loader: "MapLoader", worker: "MapLoader", future: Future):
+        self.map_file = map_file
+        self.stage = stage
+        self.future = future
+        self.applied = False
+        self._loader = loader
+        self._worker = worker
+
+    @property
+    def ready(self) -> bool:
+        return self.future.done()
+
+    def apply(self) -> Stage:
+        """Swap the loaded map into the stage, only references move.
+        Blocks if the load isn't done yet; re-raises anything the load raised."""
+        staging = self.future.result()
+        self.stage.adopt(staging)
+        # The loader now describes the map on stage
+        self._loader.global_tileset = self._worker.global_tileset
+        self._loader.global_masks = self._worker.global_masks
+        self._loader.object_types = self._worker.object_types
+        self._loader.prototypes = self._worker.prototypes
+        self.applied = True
+        logging.info(f"Map {self.map_file} swapped in")
+        return self.stage
 
 class MapLoader:
-    def __init__(self, assets_path: str):
+    def __init__(self, assets_path: str, cache: AssetCache = None, atlas: bool = True):
         self.assets_path = assets_path
         self.maps_path = os.path.join(assets_path, "maps")
         self.images_path = os.path.join(assets_path, "images")
         self.tilesets_path = os.path.join(assets_path, "tilesets")
         self.actors_path = os.path.join(assets_path, "actors")
+        # Decoded images, sliced tiles, parsed json; shared across loaders
+        self.assets = cache if cache is not None else ASSET_CACHE
+        # Atlas mode: tiles & frames are subsurfaces of the one decoded sheet
+        self.atlas = atlas
         # self.tilesets = tilesets
+        # Rebuilt per map from the cached tilesets, so it never outgrows the map
         self.global_tileset = dict() # type: dict[int, pygame.Surface]
+        self.global_masks = dict() # type: dict[int, pygame.mask.Mask]
         self.object_types = dict() # type: dict[str, TiledType]
+        self.prototypes = None # type: PrototypeRegistry
+
+    def load_json(self, path: str):
+        """Parsed json file, through the asset cache. Treat as read-only."""
+        def load():
+            with open(path) as f:
+                return json.load(f)
+        # File size stands in for the parsed size
+        return self.assets.get(("json", path), load, os.path.getsize(path))
+
+    def slice_tileset(self, tileset_file: str) -> tuple[list[pygame.Surface], list[pygame.mask.Mask]]:
+        """Tiles & masks of a tileset in local id order, sliced once and cached."""
+        def load():
+            tileset = self.load_json(tileset_file)
+
+            # Tileset Image Load
+            tileset_image_path = os.path.join(self.images_path, pathlib.PurePath(tileset["image"]).name)
+            logging.info(f"Tileset Image Path: {tileset_image_path}")
+            tileset_image = convert_alpha(pygame.image.load(tileset_image_path))
+
+            # Iterate over Tileset Image, load into memory
+            # columns = tileset["imagewidth"] // tileset["tilewidth"]
+            # rows = tileset["imageheight"] // tileset["tileheight"]
+            return slice_tiles(tileset_image, tileset["tilewidth"], tileset["tileheight"], self.atlas)
+
+        return self.assets.get(("tileset", tileset_file, self.atlas), load)
 
     def load_tileset(self, ts: dict):
         """Load tiles as pygame Surfaces into a data structure for easy lookup.
@@ -33,186 +112,170 @@ class MapLoader:
         tileset_path = ts["source"]
         tileset_file = os.path.join(self.tilesets_path, pathlib.PurePath(tileset_path).name)
         logging.info(f"Tileset File Path: {tileset_file}")
-        with open(tileset_file) as f:
-            tileset = json.load(f)
-
-        # Tileset Image Load
-        tileset_image_path = os.path.join(self.images_path, pathlib.PurePath(tileset["image"]).name)
-        logging.info(f"Tileset Image Path: {tileset_image_path}")
-        tileset_image = pygame.image.load(tileset_image_path).convert_alpha()
-        
-        # Iterate over Tileset Image, load into memory
-        # columns = tileset["imagewidth"] // tileset["tilewidth"]
-        # rows = tileset["imageheight"] // tileset["tileheight"]
-
-        tile_gid = ts["firstgid"]
-        for y in range(0, tileset["imageheight"], tileset["tileheight"]):
-            for x in range(0, tileset["imagewidth"], tileset["tilewidth"]):
-                tile = pygame.Surface((tileset["tilewidth"], tileset["tileheight"])).convert_alpha()
-                tile.fill((0, 0, 0, 0)) # Default Transparency
-                tile.blit(
-                    tileset_image,
-                    (0, 0),
-                    pygame.Rect
-                    (
-                        x, y, tileset["tilewidth"], tileset["tileheight"]
-                    )
-                )
-                self.global_tileset[tile_gid] = tile
-                tile_gid += 1
+        tiles, masks = self.slice_tileset(tileset_file)
+
+        first_gid = ts["firstgid"]
+        for i, (tile, mask) in enumerate(zip(tiles, masks)):
+            self.global_tileset[first_gid + i] = tile
+            self.global_masks[first_gid + i] = mask
 
     def load_tiled_types(self):
         types_file = os.path.join(self.assets_path, "objecttypes.json")
-        with open(types_file) as f:
-            object_types = json.load(f)
-
-        for ot in object_types:
-            name = ot.get("name")
-            self.object_types[name] = TiledType(name, ot["properties"])
-
-    def load_from_tilelayer(self, tilelayer: dict, tilewidth: int, tileheight: int) -> pygame.Surface:
-        """Build the full map image/Surface from layer information"""
-        map_columns = tilelayer["width"]
-        map_rows = tilelayer["height"]
-
-        # Pixel Conversion
-        map_width = map_columns * tilewidth
-        map_height = map_rows * tileheight
-
-        # Suface Construct
-        map_surface = pygame.Surface((map_width, map_height)).convert_alpha()
-
-        # Data Iteration
-        map_data = tilelayer["data"]
-        
-        column_index = 0 # Set up column/x counter
-        row_index = 0 # Set up row/y counter
-
-        for d in map_data:
-            # logging.info(f"Map Datum: {d}")
-            # try:
-            d_tile = self.global_tileset[d]
-
-            map_surface.blit(
-                d_tile,
-                (column_index * tilewidth, row_index * tileheight)
-            )
-            # Increment and move on
-            column_index += 1
-            if column_index >= map_columns:
-                column_index = 0
-                row_index += 1
-
-        return map_surface
-
-    def load_from_objectlayer(self, objectlayer: dict):
-        """Generate List of Sprite Objects to return and add to game/stage."""
-        object_list = objectlayer['objects'] # type: list[dict]
-        # logging.info(f"Object Layer Objects: {object_list}")
-        for o in object_list:
-            # Load Object Type
-            # object_type = o["type"]
-            # game_object = GameSprite(name=o["name"], type=o["type"], **o)
-            tiled_object = TiledObject(
-                id = o.get("id"),
-                name = o.get("name"),
-                tiledtype = self.object_types[o.get("type")],
-                x = o.get("x"),
-                y = o.get("y"),
-                width = o.get("width"),
-                height = o.get("height"),
-                gid = o.get("gid")
-            )
-            # object_type = next(t for t in object_types if t["name"] == o["type"])
-            # For each prop in type, set attribute on object
-            # for prop in object_type["properties"]:
-            #     setattr(game_object, prop["name"], prop["value"])
-
-            yield tiled_object
-
-    def tiled_objects_processing(self, tiled_objects: list[TiledObject]):
-        """Process objects on the layer into appropriate sprite objects"""
-        # TODO: Pull in Mapping from Game, not Engine
-        environment_types = ["Wall", "Solid", "Spawn Point"]
-        
-        for o in tiled_objects:
-            object_sprite = None # type: GameSprite
-            image = None # type: pygame.Surface
-
-            if o.type.name in environment_types:
-                if o.gid is not None:
-                    logging.info(f"Tiled Object Global Id: {o.gid} for {o.name}")
-                    image = self.global_tileset[o.gid]
-                    # Accounting for weird Tiled coordniate bug
-                    # TILED OBJECTS START COUNTING COORDINATES FROM BOTTOM-RIGHT!
-                    object_sprite = GameSprite(o.rect.x, (o.rect.y - o.rect.h), o.rect.width, o.rect.height, image, name=o.name, type=o.type)
-                else:
-                    # Solid(collidable) normal Game Object
-                    # object_sprite = GameSprite(o.rect.x, o.rect.y, o.rect.width, o.rect.height, image, name=o.name, type=o.type)
-                    object_sprite = GameSprite(o.rect.x, o.rect.y, o.rect.width, o.rect.height, image, name=o.name, type=o.type)
-
-                for prop in object_sprite.type.additional_properties:
-                    setattr(object_sprite, prop, object_sprite.type.additional_properties[prop])
-
-                yield object_sprite
-
-    def load_actor_to_stage(self, actor_type: str, x, y, stage: Stage, layer: int):
+
+        def load():
+            types = dict() # type: dict[str, TiledType]
+            for ot in self.load_json(types_file):
+                name = ot.get("name")
+                types[name] = TiledType(name, ot["properties"])
+            return types
+
+        self.object_types = self.assets.get(("objecttypes", types_file), load)
+        # Sprite class per type, generated once alongside the types
+        self.prototypes = self.assets.get(("prototypes", types_file), lambda: PrototypeRegistry(self.object_types.values()), 0)
+
+    def load_spritesheet(self, file: str, slice_specs, slices: list, zoom=None) -> tuple[list[pygame.Surface], list[pygame.mask.Mask]]:
+        """slice_spritesheet through the asset cache, keyed by file, slice spec & zoom."""
+        key = ("spritesheet", os.path.join(self.images_path, file), tuple(sorted(slice_specs.items())), tuple(slices), zoom, self.atlas)
+        return self.assets.get(key, lambda: slice_spritesheet(self.images_path, file, slice_specs, slices, zoom, self.atlas))
+
+    def load_from_tilelayer(self, tilelayer: dict, tilewidth: int, tileheight: int) -> ChunkedTilemapSprite:
+        """Build a chunked tilemap sprite from layer information.
+        Layer data is decoded in bulk (plain, base64, zlib/gzip/zstd),
+        chunks are baked lazily as they come into view, not here."""
+        return ChunkedTilemapSprite(
+            decode_layer_data(tilelayer),
+            tilelayer["width"],
+            tilelayer["height"],
+            tilewidth,
+            tileheight,
+            self.global_tileset,
+            name=tilelayer.get("name")
+        )
+
+    def load_from_objectlayer(self, objectlayer: dict) -> list[GameSprite]:
+        """Sprites for the objects on the layer, built straight from the layer dicts."""
+        sprites = []
+        for o in objectlayer['objects']: # type: dict
+            game_object = self.build_object(o.get("type"), o.get("name"), o.get("x"), o.get("y"), o.get("width"), o.get("height"), o.get("gid"))
+            if game_object is not None:
+                sprites.append(game_object)
+        return sprites
+
+    def build_object(self, type_name: str, name: str, x, y, width, height, gid: int = None) -> GameSprite:
+        """Sprite for one map object, through its type's prototype class.
+        None for types the engine doesn't place."""
+        if type_name not in ENVIRONMENT_TYPES:
+            return None
+        # Same whole-pixel rect as pygame.Rect(x, y, width, height)
+        x, y, width, height = int(x), int(y), int(width), int(height)
+        factory = self.prototypes[type_name]
+        if gid is None:
+            # Solid(collidable) normal Game Object
+            return factory(x, y, width, height, name=name)
+
+        # Tile objects can be flipped too, keep the flags apart from the gid
+        flip = gid & FLIP_FLAGS
+        gid &= GID_MASK
+        image = self.global_tileset[gid]
+        mask = self.global_masks[gid]
+        if flip:
+            image = flip_tile(image, flip)
+            mask = pygame.mask.from_surface(image)
+        # Accounting for weird Tiled coordniate bug
+        # TILED OBJECTS START COUNTING COORDINATES FROM BOTTOM-RIGHT!
+        return factory(x, y - height, width, height, image, mask, name=name)
+
+    def build_actor(self, actor_type: str, x=0, y=0) -> ActorSprite:
         """Use type name for Actor custom json load"""
         actor_file = os.path.join(self.actors_path, f"{actor_type}.json")
-        with open(actor_file) as af:
-            actor = json.load(af)
+        actor = self.load_json(actor_file)
 
         # Slice Spritesheet
         spritesheet = actor.get("spritesheet")
         if spritesheet is not None:
-            images = slice_spritesheet(self.images_path, **spritesheet)
-            initial_image = images[actor.get("initial_slice", 0)]
-
-        animations = actor.get("animations")
+            images, masks = self.load_spritesheet(**spritesheet)
+            initial_slice = actor.get("initial_slice", 0)
+            initial_image = images[initial_slice]
+            # The sheet's mask for it, so the sprite doesn't build its own
+            initial_mask = masks[initial_slice]
+
+        # Animations are immutable, built once per actor type and shared
+        animations = self.assets.get(("animations", actor_file), lambda: build_animations(actor.get("animations", {})), 0)
         # if animations is not None:
         #     animator = SpriteAnimator(animations)
 
         zoom = spritesheet.get("zoom", 1)
-        actor_sprite = ActorSprite(
+        actor_sprite = self.prototypes.factory(actor_type, ActorSprite)(
             images=images,
+            masks=masks,
             animations=animations,
             x=x,
             y=y,
             width=spritesheet["slice_specs"]["w"] * zoom,
             height=spritesheet["slice_specs"]["h"] * zoom,
             image=initial_image,
-            name=actor["name"],
-            type=self.object_types[actor_type]
+            mask=initial_mask,
+            name=actor["name"]
         )
-        for prop in actor_sprite.type.additional_properties:
-            setattr(actor_sprite, prop, actor_sprite.type.additional_properties[prop])
-
         logging.info(f"Loading Actor {actor_sprite.name}")
-        stage.actors.add(actor_sprite)
-        stage.sprite_layers.add(actor_sprite, layer=layer)
-        stage.collision_index.insert(actor_sprite, actor_sprite.bbox)
-
-        if actor_type == "Player":
-            stage.player = actor_sprite
-        logging.info(f"Player: {stage.player}")
-
-    def load_map_to_stage(self, map_file: str, stage: Stage):
-        """Build a map image/Surface based on Tiled JSON Map format.
-        Map image should be a single surface.
-        Objects should be parsed and loaded into layer 2."""
-
-        # Clear the scene (kill & gc the sprites for memory)
+        return actor_sprite
+
+    def load_actor_to_stage(self, actor_type: str, x, y, stage: Stage, layer: int) -> ActorSprite:
+        """Spawn an actor, reusing one from the stage's pool for its type when it has one.
+        Never touches stage.player, only the map's own spawn point sets that."""
+        pool = stage.pools.pool(actor_type, lambda: self.build_actor(actor_type))
+        actor_sprite = pool.acquire(x, y)
+        stage.spawn(actor_sprite, layer)
+        return actor_sprite
+
+    def load_to_stage(self, map_file: str, stage: Stage):
+        """Load a Tiled JSON map or a baked bundle, by extension."""
+        if map_file.endswith(BUNDLE_EXTENSION):
+            self.load_bundle_to_stage(map_file, stage)
+        else:
+            self.load_map_to_stage(map_file, stage)
+
+    def load_map_async(self, map_file: str, stage: Stage) -> PendingMap:
+        """Load a map (json or bundle) on a worker thread, into a blank copy of stage.
+        Parsing, decoding, slicing and sprite creation all happen off the game loop;
+        the returned PendingMap swaps the result in with one apply() call."""
+        # Own loader so the worker never touches this one's per-map state, assets are shared
+        worker = MapLoader(self.assets_path, cache=self.assets, atlas=self.atlas)
+        staging = stage.blank()
+
+        def load() -> Stage:
+            worker.load_to_stage(map_file, staging)
+            return staging
+
+        logging.info(f"Loading map {map_file} in the background")
+        return PendingMap(map_file, stage, self, worker, _executor().submit(load))
+
+    def clear_stage(self, stage: Stage):
+        """Clear the scene (kill & gc the sprites for memory)"""
+        # Movers go back to their pools, a reload reuses them
+        for s in stage.actors.sprites() + stage.dynamic_props.sprites():
+            stage.despawn(s)
         sprites = stage.sprite_layers.sprites() # type: list[Sprite]
         # Remove each sprite from all group membership
         for s in sprites:
             s.kill() # Remove from all groups
         sprites.clear() # TODO: Need to test if this is clearing memory correctly
+        if stage.entity_store is not None:
+            stage.entity_store.clear()
+        stage.animations.clear()
+
+    def load_map_to_stage(self, map_file: str, stage: Stage):
+        """Build a map image/Surface based on Tiled JSON Map format.
+        Map image should be a single surface.
+        Objects should be parsed and loaded into layer 2."""
+        self.clear_stage(stage)
 
         map_file = os.path.join(self.maps_path, map_file)
-        with open(map_file) as f:
-            tilemap = json.load(f)
+        tilemap = self.load_json(map_file)
 
-        # Load in Tilesets for the Map
+        # Load in Tilesets for the Map, gids are per map
+        self.global_tileset = dict()
+        self.global_masks = dict()
         # logging.info(f"First Tileset Source: {tilemap['tilesets'][0]['source']}")
         for tileset in tilemap['tilesets']:
             self.load_tileset(tileset)
@@ -227,29 +290,89 @@ class MapLoader:
         tile_height = tilemap['tileheight'] # In Px
 
         # Iterate through the layers and build them out as appropriate
-        map_layers = tilemap['layers'] # type: list
-        for i, layer in enumerate(map_layers):
+        layers = [] # type: list
+        for layer in tilemap['layers']:
             if layer['type'] == "tilelayer":
-                # Construct Surface
-                map_surface = self.load_from_tilelayer(layer, tile_width, tile_height)
-                # Construct Tilemap Sprite
-                tilemap = TilemapSprite(map_surface)
-                stage.tilemap.sprite = tilemap
+                # Construct Tilemap Sprite, chunks bake on demand
+                layers.append(self.load_from_tilelayer(layer, tile_width, tile_height))
+            elif layer['type'] == 'objectgroup':
+                layers.append(self.load_from_objectlayer(layer))
+
+        self.build_stage(stage, layers)
+
+    def load_bundle_to_stage(self, bundle_file: str, stage: Stage):
+        """Build the stage from a baked map bundle (see bundle.bake_map).
+        The bundle is memory-mapped, nothing is parsed from JSON."""
+        self.clear_stage(stage)
+
+        bundle_path = os.path.join(self.maps_path, bundle_file)
+        # Counted at its mapped size; once evicted (and its tile layers cleared) the mapping closes
+        bundle = self.assets.get(("bundle", bundle_path), lambda: MapBundle(bundle_path), os.path.getsize(bundle_path))
+
+        self.global_tileset = dict()
+        self.global_masks = dict()
+        for i, (first_gid, tile_width, tile_height, _, _, _) in enumerate(bundle.tilesets):
+            tiles, masks = self.assets.get(
+                ("bundle_tileset", bundle_path, i),
+                lambda: slice_tiles(bundle.tileset_image(i), tile_width, tile_height)
+            )
+            for j, (tile, mask) in enumerate(zip(tiles, masks)):
+                self.global_tileset[first_gid + j] = tile
+                self.global_masks[first_gid + j] = mask
+
+        self.object_types = {t.name: t for t in bundle.object_types}
+        self.prototypes = self.assets.get(("bundle_prototypes", bundle_path), lambda: PrototypeRegistry(bundle.object_types), 0)
+
+        layers = [] # type: list
+        for layer in bundle.layers:
+            if layer[0] == LAYER_TILES:
+                _, name, width, height, _ = layer
+                layers.append(ChunkedTilemapSprite(
+                    bundle.gids(layer),
+                    width,
+                    height,
+                    bundle.tile_width,
+                    bundle.tile_height,
+                    self.global_tileset,
+                    name=name
+                ))
+            else:
+                sprites = (self.build_object(*record) for record in bundle.objects(layer))
+                layers.append([s for s in sprites if s is not None])
+
+        self.build_stage(stage, layers)
+
+    def build_stage(self, stage: Stage, layers: list):
+        """Put loaded layers onto the (cleared) stage, in layer order.
+        Tile layers are ChunkedTilemapSprites, object layers lists of (static) sprites.
+        Shared by every map format."""
+        # Static sprites are collected and baked into one index at the end
+        static_sprites = [] # type: list[GameSprite]
+
+        for i, layer in enumerate(layers):
+            if isinstance(layer, ChunkedTilemapSprite):
+                tilemap = layer
+                stage.tilemap.add(tilemap)
                 stage.sprite_layers.add(tilemap, layer = i) # Adding to layers in order
                 # TODO: Move the boundary/index loading outside of map load?
-                stage.boundary = (tilemap.rect.w, tilemap.rect.h)
-                stage.collision_index = Index(bbox=(0, 0, tilemap.rect.w, tilemap.rect.h))
-            elif layer['type'] == 'objectgroup':
-                tiled_objects = list(self.load_from_objectlayer(layer))
-                logging.info(f"Tiled Objects: {len(tiled_objects)}")
-                game_objects = self.tiled_objects_processing(tiled_objects)
+                stage.boundary = tilemap.map_rect.size
+                stage.reset_collision_index((0, 0, tilemap.map_rect.w, tilemap.map_rect.h))
+            else:
+                game_objects = layer
+                logging.info(f"Game Objects: {len(game_objects)}")
 
                 # Post object load processing
                 for go in game_objects:
-                    logging.info(f"Loading Game Object {go.type.name}")
                     stage.props.add(go)
                     stage.sprite_layers.add(go, layer=i)
-                    stage.collision_index.insert(go, go.bbox)
+                    if isinstance(go, MoveableSprite):
+                        stage.dynamic_props.add(go)
+                        stage.add_mover(go)
+                    else:
+                        static_sprites.append(go)
+
+        # Bake static collision geometry, the dynamic index only holds movers
+        stage.bake_static_index(static_sprites)
 
         # Tilemap and Objects are in, Finalize the Stage
         # TODO: On_Enter or On_Ready hooks
@@ -257,35 +380,67 @@ class MapLoader:
         spawn_point = next(o for o in stage.props.sprites() if o.type.name == "Spawn Point")
         spawn_coordinates = (spawn_point.x, spawn_point.y)
         logging.info(f"Player Spawn Coodinates: {spawn_coordinates}")
-        self.load_actor_to_stage("Player", spawn_point.x, spawn_point.y, stage, i+1)
+        stage.player = self.load_actor_to_stage("Player", spawn_point.x, spawn_point.y, stage, i+1)
+        logging.info(f"Player: {stage.player}")
 
-def slice_spritesheet(images_path: str, file: str, slice_specs, slices: list, zoom=None) -> list[pygame.Surface]:
-    """file, frame_size, frames"""
+def slice_tiles(image: pygame.Surface, tile_width: int, tile_height: int, atlas: bool = True) -> tuple[list[pygame.Surface], list[pygame.mask.Mask]]:
+    """Cut a tileset image into tiles (local id order) and their masks.
+    In atlas mode tiles are zero-copy subsurfaces of the image."""
+    tiles = [] # type: list[pygame.Surface]
+    masks = [] # type: list[pygame.mask.Mask]
+    for y in range(0, image.get_height(), tile_height):
+        for x in range(0, image.get_width(), tile_width):
+            area = pygame.Rect(x, y, tile_width, tile_height)
+            if atlas:
+                # Zero-copy view into the tileset image
+                tile = image.subsurface(area.clip(image.get_rect()))
+            else:
+                tile = alpha_surface((tile_width, tile_height))
+                tile.fill((0, 0, 0, 0)) # Default Transparency
+                tile.blit(image, (0, 0), area)
+            tiles.append(tile)
+            masks.append(pygame.mask.from_surface(tile))
+    return tiles, masks
+
+def slice_spritesheet(images_path: str, file: str, slice_specs, slices: list, zoom=None, atlas: bool = False) -> tuple[list[pygame.Surface], list[pygame.mask.Mask]]:
+    """file, frame_size, frames.
+    Returns the slices and a collision mask per slice, built once here.
+    In atlas mode slices are subsurfaces of the sheet, no pixels are copied.
+    Zoomed sheets are always sliced frame by frame: zooming the whole sheet
+    would filter in pixels from neighbouring frames."""
     images = [] # type: list[pygame.Surface]
+    masks = [] # type: list[pygame.mask.Mask]
 
-    image = pygame.image.load(os.path.join(images_path, file)).convert_alpha()
+    image = convert_alpha(pygame.image.load(os.path.join(images_path, file)))
     # pygame.image.save(image, os.path.join(SPRITESHEETS, "temp.png"))
 
     # Scale frame size to tile size (by width)
     # delta = size / slice_specs["w"]
     # scaled_height = round(slice_specs["h"] * delta)
 
+    # Zoomed frames are new surfaces either way
+    atlas = atlas and zoom is None
+
     for y in range(slices[1]):
         for x in range(slices[0]):
-            s = pygame.Surface((slice_specs["w"], slice_specs["h"])).convert_alpha()
-            s.fill((0, 0, 0, 0)) # IMPORTANT: need to set default background to transparent
-            s.blit(
-                image, # source
-                (0, 0), # dest
-                pygame.Rect # area
-                (
-                    slice_specs["spacing"] + (2 * x * slice_specs["spacing"]) + (x * slice_specs["w"]),
-                    slice_specs["spacing"] + (2 * y * slice_specs["spacing"]) + (y * slice_specs["h"]),
-                    slice_specs["w"], slice_specs["h"]
-                )
+            area = pygame.Rect(
+                slice_specs["spacing"] + (2 * x * slice_specs["spacing"]) + (x * slice_specs["w"]),
+                slice_specs["spacing"] + (2 * y * slice_specs["spacing"]) + (y * slice_specs["h"]),
+                slice_specs["w"], slice_specs["h"]
             )
-            # pygame.image.save(frame, os.path.join(SPRITESHEETS, f"non_scaled_{x}_{y}.png"))
-            if zoom is not None:
-                s = pygame.transform.rotozoom(s, 0, zoom)
+            if atlas:
+                s = image.subsurface(area.clip(image.get_rect()))
+            else:
+                s = alpha_surface((slice_specs["w"], slice_specs["h"]))
+                s.fill((0, 0, 0, 0)) # IMPORTANT: need to set default background to transparent
+                s.blit(
+                    image, # source
+                    (0, 0), # dest
+                    area
+                )
+                # pygame.image.save(frame, os.path.join(SPRITESHEETS, f"non_scaled_{x}_{y}.png"))
+                if zoom is not None:
+                    s = pygame.transform.rotozoom(s, 0, zoom)
             images.append(s)
-    return images
\ No newline at end of file
+            masks.append(pygame.mask.from_surface(s))
+    return images, masks
@@ -0,0 +1,101 @@
+import logging
+from typing import Callable, Hashable
+
+from .sprites import GameSprite
+
+class SpritePool:
+    """Free list of released sprites of one kind, handed back out by acquire.
+    Reused sprites keep their images, masks & animator, acquire only resets
+    them (GameSprite.reset, then the pool's reset hook) to the new spawn."""
+    def __init__(self, factory: Callable[[], GameSprite], reset: Callable[..., None] = None, capacity: int = None):
+        self.factory = factory
+        self.reset = reset
+        # Most free sprites kept, released ones past it are dropped to the GC
+        self.capacity = capacity
+        self._free = [] # type: list[GameSprite]
+        # Same sprites as _free, so a double release is caught without a scan
+        self._free_set = set() # type: set[GameSprite]
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self):
+        return len(self._free)
+
+    def prefill(self, count: int):
+        """Build sprites ahead of time, so spawning never has to."""
+        for _ in range(count - len(self._free)):
+            sprite = self.factory()
+            self._free.append(sprite)
+            self._free_set.add(sprite)
+            self.created += 1
+
+    def acquire(self, x, y, **state) -> GameSprite:
+        """Free sprite (or a new one) placed at x, y.
+        state goes to the reset hook, e.g. a projectile's heading."""
+        if self._free:
+            sprite = self._free.pop()
+            self._free_set.discard(sprite)
+            self.reused += 1
+        else:
+            sprite = self.factory()
+            self.created += 1
+        sprite.reset(x, y)
+        if self.reset is not None:
+            self.reset(sprite, **state)
+        return sprite
+
+    def release(self, sprite: GameSprite):
+        """Take back a sprite that's already out of the world (see Stage.despawn).
+        Releasing one that's already free does nothing, it's only handed out once."""
+        if sprite in self._free_set:
+            logging.warning(f"SpritePool: {sprite} released twice")
+            return
+        if self.capacity is None or len(self._free) < self.capacity:
+            self._free.append(sprite)
+            self._free_set.add(sprite)
+
+    def clear(self):
+        self._free.clear()
+        self._free_set.clear()
+
+class SpritePools:
+    """Sprite pools keyed by object/actor type name."""
+    def __init__(self):
+        self._pools = dict() # type: dict[Hashable, SpritePool]
+
+    def __contains__(self, key: Hashable):
+        return key in self._pools
+
+    def __getitem__(self, key: Hashable) -> SpritePool:
+        return self._pools[key]
+
+    def pool(self, key: Hashable, factory: Callable[[], GameSprite], reset: Callable[..., None] = None, capacity: int = None) -> SpritePool:
+        """The pool for key, created with factory (and reset hook) the first time."""
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = SpritePool(factory, reset, capacity)
+            self._pools[key] = pool
+            logging.info(f"Sprite pool for {key}")
+        return pool
+
+    def release(self, sprite: GameSprite) -> bool:
+        """Back to its type's pool, False when that type isn't pooled."""
+        pool = self._pools.get(pool_key(sprite))
+        if pool is None:
+            return False
+        pool.release(sprite)
+        return True
+
+    def clear(self):
+        for pool in self._pools.values():
+            pool.clear()
+
+    def stats(self) -> dict[Hashable, dict[str, int]]:
+        return {
+            key: {"free": len(pool), "created": pool.created, "reused": pool.reused}
+            for key, pool in self._pools.items()
+        }
+
+def pool_key(sprite: GameSprite) -> Hashable:
+    """Sprites pool by Tiled type name, untyped ones by class."""
+    return sprite.type.name if sprite.type is not None else type(sprite).__name__
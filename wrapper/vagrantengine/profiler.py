@@ -0,0 +1,123 @@
+import json
+import logging
+from array import array
+from time import perf_counter
+
+DEFAULT_CAPACITY = 8192 # Timings kept, oldest are overwritten
+PERCENTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+class _NullSection:
+    """Section used while profiling is off, does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SECTION = _NullSection()
+
+class _Section:
+    __slots__ = ("_profiler", "_phase", "_start")
+
+    def __init__(self, profiler: "Profiler", phase: str):
+        self._profiler = profiler
+        self._phase = phase
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.record(self._phase, self._start, perf_counter() - self._start)
+        return False
+
+class Profiler:
+    """Phase timings in a fixed-size ring buffer.
+    Wrap code in `with PROFILER.section("update.collision"):`; while disabled
+    that's a shared no-op, so hooks can stay in the hot paths.
+    Phases are dotted, the first part groups them (events, update, render)."""
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, enabled: bool = False):
+        self.capacity = capacity
+        self.enabled = enabled
+
+        self._phase_ids = dict() # type: dict[str, int]
+        self._phase_names = [] # type: list[str]
+        # Parallel ring buffers, one slot per recorded section
+        self._ids = array("H", [0]) * capacity
+        self._starts = array("d", [0.0]) * capacity
+        self._durations = array("d", [0.0]) * capacity
+        self._count = 0 # Total recorded, next slot is count % capacity
+        self._origin = perf_counter()
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def section(self, phase: str):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, phase)
+
+    def record(self, phase: str, start: float, duration: float):
+        """Record a timing in seconds (start as perf_counter)."""
+        phase_id = self._phase_ids.get(phase)
+        if phase_id is None:
+            phase_id = len(self._phase_names)
+            self._phase_ids[phase] = phase_id
+            self._phase_names.append(phase)
+        i = self._count % self.capacity
+        self._ids[i] = phase_id
+        self._starts[i] = start
+        self._durations[i] = duration
+        self._count += 1
+
+    def clear(self):
+        self._count = 0
+        self._origin = perf_counter()
+
+    def events(self):
+        """(phase, start, duration) in seconds, oldest first."""
+        size = len(self)
+        first = self._count - size
+        for n in range(first, self._count):
+            i = n % self.capacity
+            yield self._phase_names[self._ids[i]], self._starts[i], self._durations[i]
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Count, percentiles and max per phase over the buffer, in ms."""
+        samples = dict() # type: dict[str, list[float]]
+        for phase, _, duration in self.events():
+            samples.setdefault(phase, []).append(duration * 1000)
+
+        stats = dict()
+        for phase, values in samples.items():
+            values.sort()
+            last = len(values) - 1
+            stats[phase] = {"count": len(values), "max": values[-1]}
+            for name, p in PERCENTILES.items():
+                stats[phase][name] = values[min(int(len(values) * p), last)]
+        return stats
+
+    def export_chrome_trace(self, path: str) -> int:
+        """Dump the buffer as Chrome trace JSON (chrome://tracing, Perfetto).
+        Returns the number of events written."""
+        trace_events = [
+            {
+                "name": phase,
+                "cat": phase.split(".")[0],
+                "ph": "X", # Complete event, nests by time on one thread
+                "ts": (start - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": 1,
+                "tid": 1
+            }
+            for phase, start, duration in self.events()
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+        logging.info(f"Profiler: wrote {len(trace_events)} events to {path}")
+        return len(trace_events)
+
+# Engine-wide profiler, off until enabled
+PROFILER = Profiler()
@@ -0,0 +1,47 @@
+import logging
+from functools import partial
+from typing import Callable, Iterable
+
+from .sprites import GameSprite
+from .tiled import TiledType
+
+def prototype_class(tiled_type: TiledType, base: type = GameSprite) -> type:
+    """Subclass of base for one Tiled type, its custom properties as class attributes.
+    Every sprite of the type reads them from the class, nothing is copied per instance."""
+    attributes = {"__slots__": (), "__doc__": f"{base.__name__} for Tiled type {tiled_type.name}"}
+    for name, value in tiled_type.additional_properties.items():
+        if not name.isidentifier() or hasattr(base, name):
+            # Would shadow the sprite's own attribute, only readable from sprite.type
+            logging.warning(f"Tiled type {tiled_type.name}: property {name} not set on the class")
+            continue
+        attributes[name] = value
+    class_name = "".join(part[:1].upper() + part[1:] for part in tiled_type.name.split() if part.isidentifier())
+    return type(f"{class_name}{base.__name__}", (base,), attributes)
+
+class PrototypeRegistry:
+    """Sprite classes per Tiled type, generated once when the types load.
+    Every type gets a GameSprite subclass up front, other bases (e.g. ActorSprite)
+    the first time they're asked for. Look up factories by type name."""
+    def __init__(self, tiled_types: Iterable[TiledType], base: type = GameSprite):
+        self.types = {t.name: t for t in tiled_types} # type: dict[str, TiledType]
+        self._classes = dict() # type: dict[tuple[str, type], type]
+        for name in self.types:
+            self.sprite_class(name, base)
+
+    def __contains__(self, name: str):
+        return name in self.types
+
+    def __getitem__(self, name: str) -> Callable[..., GameSprite]:
+        return self.factory(name)
+
+    def sprite_class(self, name: str, base: type = GameSprite) -> type:
+        key = (name, base)
+        cls = self._classes.get(key)
+        if cls is None:
+            cls = prototype_class(self.types[name], base)
+            self._classes[key] = cls
+        return cls
+
+    def factory(self, name: str, base: type = GameSprite) -> Callable[..., GameSprite]:
+        """Builds sprites of the type: base's constructor, type filled in."""
+        return partial(self.sprite_class(name, base), type=self.types[name])
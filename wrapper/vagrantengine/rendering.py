@@ -1,13 +1,17 @@
 import logging
+import time
 
 from collections import OrderedDict
+from typing import Callable
 
 import pygame
 import pygame.display
 import pygame.draw
 import pygame.font
 
+from .camera import Camera, draw_rect, merge_rects
 from .game import Stage
+from .profiler import PROFILER
 
 COLOR_BLACK = (0, 0, 0)
 COLOR_RED = (255, 0, 0)
@@ -16,13 +20,41 @@ COLOR_WHITE = (255, 255, 255)
 COLOR_BLUE = (0, 0, 255)
 COLOR_TRANSPARENT = (0, 0, 0, 0)
 
+# Fraction of the display that can be dirty before a full flip is cheaper
+DIRTY_AREA_THRESHOLD = 0.5
+# Debug overlay stats panel refreshes per second
+PANEL_REFRESH_RATE = 4
+TEXT_CACHE_SIZE = 256 # Rendered debug text lines kept
+# Furthest (px) a mover is drawn from its sim rect, at most one tick's move
+INTERPOLATION_MARGIN = 32
+
 # Persisting a lot of data for Renderer, classing out
 class Renderer:
-    def __init__(self, game: Stage,
+    def __init__(self, game: Stage, dirty_rects: bool = False,
+        dirty_threshold: float = DIRTY_AREA_THRESHOLD,
         **kwargs: pygame.Surface):
         self._game = game
+        # Dirty-rect mode pushes only changed areas with display.update
+        self.dirty_rects = dirty_rects
+        self.dirty_threshold = dirty_threshold
+        self._full_redraw = True
+        self._last_viewport = None # type: pygame.Rect
+        self._overlay_rects = [] # type: list[pygame.Rect]
+        # Drawn instead of black around & under the view, e.g. a suspended stage's last frame
+        self.backdrop = None # type: pygame.Surface
+
+        self._fit_view()
+
+        self._surfaces = kwargs # Non-display and wrapper surfaces
+        self._pipeline = OrderedDict()
+        # Profiler section per step, named once here instead of every frame
+        self._sections = dict() # type: dict[Callable, str]
+
+        # We always render the game first (?)
+        self.add_pipeline_step(self.camera.buffer, self.draw_game)
 
-        self._game_area = pygame.Surface(game.boundary).convert_alpha()
+    def _fit_view(self):
+        """Size the view (and its camera) to the display, or the stage if it's smaller."""
         self._destination_x = 0
         self._destination_y = 0
         self._viewport = pygame.display.get_surface().get_rect() # init to 0,0
@@ -38,38 +70,36 @@ class Renderer:
             # Shrink viewport height
             self._viewport.h = self._game.boundary[1]
 
-        self._surfaces = kwargs # Non-display and wrapper surfaces
-        self._pipeline = OrderedDict()
+        # Camera composes the viewport, no full-map surface needed
+        self.camera = Camera(self._game, self._viewport.size)
 
-        # We always render the game first (?)
-        self.add_pipeline_step(self._game_area, self.draw_game)
+    def reset_view(self):
+        """Refit the view after the stage changed map, and redraw everything."""
+        old_buffer = self.camera.buffer
+        self._fit_view()
+        # Re-key the game step on the new buffer, keeping pipeline order
+        self._pipeline = OrderedDict(
+            (self.camera.buffer if surface is old_buffer else surface, steps)
+            for surface, steps in self._pipeline.items()
+        )
+        self.redraw()
+
+    def redraw(self):
+        """Draw the whole display next frame, not just what changed."""
+        self._last_viewport = None
 
     @property
-    def viewport(self) -> pygame.Rect:
-        """Calculate and return the Renderer's current viewport
-        based on viewport size and current stage's focus point & boundary"""
-        # TODO: Give Focus Point a dirty flag and only re-calc on dirty        
-
-        # logging.info(f"Focus: {self._game.focus_point}")
-        _viewport = pygame.Rect(
-            self._game.focus_point[0] - (self._viewport.w / 2), # left
-            self._game.focus_point[1] - (self._viewport.h / 2), # top
-            self._viewport.w, self._viewport.h # width, height
-        )
+    def destination(self) -> tuple[int, int]:
+        """Where the view's top-left sits on the display."""
+        return (int(self._destination_x), int(self._destination_y))
 
-        # Too far left or right?
-        if _viewport.left < 0: _viewport.left = 0
-        if _viewport.right > self._game.boundary[0]:
-            _viewport.right = self._game.boundary[0]
-        # Too far up or down?
-        if _viewport.top < 0: _viewport.top = 0
-        if _viewport.bottom > self._game.boundary[1]:
-            _viewport.bottom = self._game.boundary[1]
-        
-        self._viewport = _viewport
-        return _viewport
+    @property
+    def viewport(self) -> pygame.Rect:
+        """The camera's current viewport, in game space."""
+        return self.camera.viewport
 
     def add_pipeline_step(self, surface: pygame.Surface, step):
+        self._sections[step] = f"render.{getattr(step, '__name__', 'step')}"
         current_steps = self._pipeline.get(surface, None)
         if current_steps is None:
             self._pipeline[surface] = step
@@ -81,146 +111,231 @@ class Renderer:
             self._pipeline[surface] = new_steps
 
     def draw_game(self) -> list[pygame.Rect]:
-        """"""
-        changes = self._game.sprite_layers.draw(self._game_area)
-        # Blit and flip viewport -> display
-        pygame.display.get_surface().blit(self._game_area,
-            (self._destination_x, self._destination_y),
-            self.viewport
-        )
+        """Let the camera catch up, then copy its buffer to the display.
+        Returns the display-space rects that changed."""
+        changes = self.camera.draw(self._game.sprite_layers)
+        display = pygame.display.get_surface()
 
-        return changes
+        # View space -> display space
+        destination = (int(self._destination_x), int(self._destination_y))
+        screen_area = self.camera.buffer.get_rect(topleft=destination)
+        display_changes = [r.move(destination) for r in changes]
+
+        if self._full_redraw:
+            display.blit(self.camera.buffer, destination)
+        else:
+            # Only restore what changed, plus whatever overlays covered last frame
+            display_area = display.get_rect()
+            for r in display_changes + self._overlay_rects:
+                # fill() doesn't trim the off-display part of a rect starting above/left of it
+                self._clear(display, r.clip(display_area))
+                area = r.clip(screen_area)
+                display.blit(self.camera.buffer, area.topleft, area.move(-destination[0], -destination[1]))
+
+        return display_changes
 
     def render(self):
-        """Run through the entire rendering pipeline, in order"""
-        pygame.display.get_surface().fill(COLOR_BLACK)
+        """Run through the entire rendering pipeline, in order.
+        Steps return the display-space rects they changed. In dirty-rect mode
+        only those are pushed, unless the camera scrolled or too much changed."""
+        display = pygame.display.get_surface()
+
+        viewport = self.viewport
+        self._full_redraw = (not self.dirty_rects) or viewport != self._last_viewport
+        self._last_viewport = pygame.Rect(viewport)
+
+        if self._full_redraw:
+            self._clear(display)
 
         updates = []
+        overlay_updates = []
         for _, steps in self._pipeline.items():
-            if isinstance(steps, list):
-                for step in steps:
-                    updates.extend(step())
-            else: # Single
-                updates.extend(steps())
+            for step in (steps if isinstance(steps, list) else [steps]):
+                with PROFILER.section(self._sections[step]):
+                    changes = step()
+                updates.extend(changes)
+                if step != self.draw_game:
+                    overlay_updates.extend(changes)
         # logging.info(f"Updates: {updates}")
-        # Fixing that the surface is too small for now
-        
-        pygame.display.flip()
-        # if(len(updates) > 0):
-        # pygame.display.update(self.viewport)
+
+        # Overlays get cleared under next frame
+        previous_overlays = self._overlay_rects
+        self._overlay_rects = overlay_updates
+
+        with PROFILER.section("render.present"):
+            self._present(display, updates + previous_overlays)
+
+    def _clear(self, display: pygame.Surface, rect: pygame.Rect = None):
+        """Clear (an area of) the display to the backdrop, or black without one."""
+        if self.backdrop is None:
+            display.fill(COLOR_BLACK, rect)
+        elif rect is None:
+            display.blit(self.backdrop, (0, 0))
+        else:
+            display.blit(self.backdrop, rect.topleft, rect)
+
+    def _present(self, display: pygame.Surface, updates: list[pygame.Rect]):
+        if self._full_redraw:
+            pygame.display.flip()
+            return
+
+        dirty = merge_rects(updates)
+        dirty_area = sum(r.w * r.h for r in dirty)
+        if dirty_area > self.dirty_threshold * display.get_width() * display.get_height():
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+
+class TextCache:
+    """Rendered text surfaces keyed by string, LRU bounded.
+    A string that misses is composed from cached per-character glyphs,
+    so changing numbers never go back through Font.render."""
+    def __init__(self, font: pygame.font.Font, color: tuple = COLOR_WHITE, capacity: int = TEXT_CACHE_SIZE):
+        self.font = font
+        self.color = color
+        self.capacity = capacity
+        self._texts = OrderedDict() # type: OrderedDict[str, pygame.Surface]
+        self._glyphs = dict() # type: dict[str, pygame.Surface]
+
+    def glyph(self, char: str) -> pygame.Surface:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self.font.render(char, True, self.color)
+            self._glyphs[char] = glyph
+        return glyph
+
+    def get(self, string: str) -> pygame.Surface:
+        text = self._texts.get(string)
+        if text is not None:
+            self._texts.move_to_end(string)
+            return text
+
+        glyphs = [self.glyph(c) for c in string]
+        text = pygame.Surface(
+            (sum(g.get_width() for g in glyphs), self.font.get_linesize()), pygame.SRCALPHA
+        )
+        x = 0
+        for g in glyphs:
+            text.blit(g, (x, 0))
+            x += g.get_width()
+
+        self._texts[string] = text
+        if len(self._texts) > self.capacity:
+            self._texts.popitem(last=False)
+        return text
 
 class DebugRenderer:
-    def __init__(self, game: Stage, surface: pygame.Surface):
+    """Debug overlay, drawn straight onto the display in screen space.
+    The stats panel is only rebuilt refresh_rate times a second (text through
+    a TextCache) and blitted as-is in between; hitboxes are only drawn for
+    sprites the indexes report inside the visible viewport."""
+    def __init__(self, game: Stage, renderer: Renderer, refresh_rate: float = PANEL_REFRESH_RATE):
         self._game = game
-        self._surface = surface
-        
-        self._game_area = pygame.Surface(game.boundary).convert_alpha()
-        self._game_area.fill(COLOR_TRANSPARENT)
-        self._destination_x = 0
-        self._destination_y = 0
-        self._viewport = self._surface.get_rect() # init to 0,0
-        
-        if self._viewport.w > self._game.boundary[0]: # Viewport wider than scene
-            # Set destination left
-            self._destination_x = self._viewport.centerx - (self._game.boundary[0] / 2)
-            # Shrink viewport width
-            self._viewport.w = self._game.boundary[0]
-        if self._viewport.h > self._game.boundary[1]: # Viewport taller than scene
-            # Set destination top
-            self._destination_y = self._viewport.centery - (self._game.boundary[1] / 2)
-            # Shrink viewport height
-            self._viewport.h = self._game.boundary[1]
+        self._renderer = renderer
+        self.refresh_rate = refresh_rate
 
         self.debug_font = pygame.font.Font(None, 24)
+        self.text = TextCache(self.debug_font)
+        self._panel = None # type: pygame.Surface
+        self._refreshed_at = None # type: float
 
     @property
     def viewport(self) -> pygame.Rect:
-        """Calculate and return the Renderer's current viewport
-        based on viewport size and current stage's focus point & boundary"""
-        # TODO: Give Focus Point a dirty flag and only re-calc on dirty        
-
-        # logging.info(f"Focus: {self._game.focus_point}")
-        _viewport = pygame.Rect(
-            self._game.focus_point[0] - (self._viewport.w / 2), # left
-            self._game.focus_point[1] - (self._viewport.h / 2), # top
-            self._viewport.w, self._viewport.h # width, height
+        return self._renderer.viewport
+
+    def refresh_panel(self):
+        """Rebuild the stats panel surface."""
+        lines = ["{0}: {1}".format(k, v) for k, v in self.debug_stats().items()] + self.profile_lines()
+        texts = [self.text.get(line) for line in lines]
+        panel = pygame.Surface(
+            (max((t.get_width() for t in texts), default=0), sum(t.get_height() for t in texts)), pygame.SRCALPHA
         )
+        y = 0
+        for t in texts:
+            panel.blit(t, (0, y))
+            y += t.get_height()
+        self._panel = panel
 
-        # Too far left or right?
-        if _viewport.left < 0: _viewport.left = 0
-        if _viewport.right > self._game.boundary[0]:
-            _viewport.right = self._game.boundary[0]
-        # Too far up or down?
-        if _viewport.top < 0: _viewport.top = 0
-        if _viewport.bottom > self._game.boundary[1]:
-            _viewport.bottom = self._game.boundary[1]
-        
-        self._viewport = _viewport
-        return _viewport
+    def debug_stats(self) -> dict:
+        if self._game.player is None:
+            return {}
+        table = next(iter(self._game.props), None)
+        return {
+            "Animation Tick": self._game.animations.tick,
+            "Animation Phase": self._game.player.animator.phase,
+            "Current Animation": self._game.player.animator.current_animation,
+            "Current Slice": self._game.player.animator.current_slice,
+            "Stack Count": len(self._game.player.animator.stack),
+            "Is Current ?": (self._game.player.animator.current is not None),
+            "Player Position": self._game.player.bbox,
+            "Table Position": table.bbox if table is not None else None,
+            "Sprites Moving": sum(1 for s in self._game.actors if s.is_moving)
+        }
 
-    def draw_debug(self):
-        """Draw debug stats over game for dev/test"""
-        changes = []
-        self._game_area.fill(COLOR_TRANSPARENT)
-        self._surface.fill(COLOR_TRANSPARENT)
-        
-        if self._game.player is not None:
-            debug_dict = {
-                "Animation Frame": self._game.player.animator.frame_count,
-                "Frame Threshold": self._game.player.animator.threshold,
-                "Current Animation": self._game.player.animator.current_animation,
-                "Current Index": self._game.player.animator.current_index,
-                "Current Slice": self._game.player.animator.current_slice,
-                "Stack Count": len(self._game.player.animator.stack),
-                "Is Current ?": (self._game.player.animator.current is not None),
-                "Player Position": self._game.player.bbox,
-                "Table Position": self._game.props.sprites()[0].bbox,
-                "Sprites Moving": len(list(s for s in self._game.actors.sprites() if s.is_moving))
-            }
-            current_height = 10
-            for k, v in debug_dict.items():
-                to_render = "{0}: {1}".format(k, v)
-                font_width, font_height = self.debug_font.size(to_render)
-                draw_text(self._surface, to_render, 10, current_height, self.debug_font)
-
-                changes.append(pygame.Rect(10, current_height, font_width, font_height))
-                current_height += font_height
-
-        props = self._game.props.sprites()
-        for p in props:
-            pygame.draw.rect(
-                self._game_area,
-                COLOR_RED,
-                p.rect,
-                1
-            )
+    def profile_lines(self) -> list[str]:
+        """Rolling p50/p95/p99 per profiled phase, while the profiler is on."""
+        if not PROFILER.enabled:
+            return []
+        return [
+            f"{phase}: {s['p50']:.2f} / {s['p95']:.2f} / {s['p99']:.2f} ms"
+            for phase, s in sorted(PROFILER.stats().items())
+        ]
 
-        actors = self._game.actors.sprites()
-        for a in actors:
-            pygame.draw.rect(
-                self._game_area,
-                COLOR_GREEN,
-                a.rect,
-                1
+    def visible_sprites(self, viewport: pygame.Rect) -> list:
+        """Sprites drawn in the viewport, straight from the collision indexes.
+        Movers are indexed at their sim rect, so they're looked up a margin
+        wider and kept by where they're drawn (their interpolated render_rect)."""
+        bbox = (viewport.left, viewport.top, viewport.right, viewport.bottom)
+        sprites = []
+        if self._game.static_index is not None:
+            sprites.extend(self._game.static_index.intersect(bbox))
+        if self._game.collision_index is not None:
+            wide = viewport.inflate(2 * INTERPOLATION_MARGIN, 2 * INTERPOLATION_MARGIN)
+            sprites.extend(
+                s for s in self._game.collision_index.intersect((wide.left, wide.top, wide.right, wide.bottom))
+                if draw_rect(s).colliderect(viewport)
             )
+        return sprites
 
-        pygame.draw.rect(
-            self._game_area,
-            COLOR_BLUE,
-            self.viewport,
-            1
-        )
+    def draw_debug(self) -> list[pygame.Rect]:
+        """Draw debug stats & hitboxes over the game for dev/test.
+        Returns the display rects drawn on."""
+        display = pygame.display.get_surface()
+        now = time.perf_counter()
+        if self._refreshed_at is None or now - self._refreshed_at >= 1 / self.refresh_rate:
+            self.refresh_panel()
+            self._refreshed_at = now
 
-        self._surface.blit(
-            self._game_area,
-            (self._destination_x, self._destination_y),
-            self.viewport
-        )
+        changes = []
+        viewport = self.viewport
+        origin = self._renderer.destination
+        # World space -> screen space
+        offset = (origin[0] - viewport.x, origin[1] - viewport.y)
+        actors = self._game.actors
+        display_area = display.get_rect()
+        for s in self.visible_sprites(viewport):
+            # Where the sprite is drawn this frame, interpolated or not
+            rect = draw_rect(s).move(offset)
+            pygame.draw.rect(display, COLOR_GREEN if s in actors else COLOR_RED, rect, 1)
+            changes.extend(outline(rect, display_area))
 
-        pygame.display.get_surface().blit(self._surface, (0, 0))
-        
+        view = pygame.Rect(origin, viewport.size)
+        pygame.draw.rect(display, COLOR_BLUE, view, 1)
+        changes.extend(outline(view, display_area))
+
+        changes.append(display.blit(self._panel, (10, 10)))
         return changes
 
-def draw_text(surface: pygame.Surface, string: str, x: int, y: int, font: pygame.font.Font):
-    text_surface = font.render(string, True, COLOR_WHITE)
-    surface.blit(text_surface, (x, y))
\ No newline at end of file
+def outline(rect: pygame.Rect, area: pygame.Rect) -> list[pygame.Rect]:
+    """The four 1px edges of a rect, all a 1px outline actually touches.
+    Clipped to area (the display), edges left empty are dropped.
+    A rect without area draws no outline at all."""
+    if not (rect.w and rect.h):
+        return []
+    edges = (
+        pygame.Rect(rect.left, rect.top, rect.w, 1),
+        pygame.Rect(rect.left, rect.bottom - 1, rect.w, 1),
+        pygame.Rect(rect.left, rect.top, 1, rect.h),
+        pygame.Rect(rect.right - 1, rect.top, 1, rect.h)
+    )
+    return [e for e in (edge.clip(area) for edge in edges) if e.w and e.h]
@@ -0,0 +1,165 @@
+import logging
+import time
+from collections import deque
+from typing import Callable
+
+import pygame.time
+
+from .profiler import PROFILER
+
+DEFAULT_TICK_RATE = 60 # Stage.update calls per second
+DEFAULT_RENDER_RATE = 60 # Frames per second, 0 for uncapped
+# Most sim steps run in one frame before the backlog is dropped
+DEFAULT_MAX_CATCH_UP = 5
+# Most renders skipped in a row when updates run over budget
+DEFAULT_MAX_FRAME_SKIP = 3
+STATS_WINDOW = 120 # Frames of history kept for stats
+
+PHASES = ("events", "update", "render")
+
+class FrameStats:
+    """Rolling per-phase timings (ms) over the last window frames,
+    plus running counters for everything the scheduler had to give up."""
+    def __init__(self, window: int = STATS_WINDOW):
+        self.window = window
+        self.phases = {p: deque(maxlen=window) for p in PHASES} # type: dict[str, deque[float]]
+        self.frames = deque(maxlen=window) # type: deque[float]
+        self.ticks = deque(maxlen=window) # type: deque[int]
+        self.overruns = {p: 0 for p in PHASES} # type: dict[str, int]
+        self.skipped_renders = 0
+        self.dropped_ticks = 0
+        self.total_frames = 0
+        self.total_ticks = 0
+
+    def record(self, phase: str, ms: float, budget: float = None):
+        self.phases[phase].append(ms)
+        if budget is not None and ms > budget:
+            self.overruns[phase] += 1
+
+    def end_frame(self, frame_ms: float, ticks: int):
+        self.frames.append(frame_ms)
+        self.ticks.append(ticks)
+        self.total_frames += 1
+        self.total_ticks += ticks
+
+    @property
+    def fps(self) -> float:
+        elapsed = sum(self.frames)
+        return len(self.frames) * 1000 / elapsed if elapsed else 0.0
+
+    @property
+    def tps(self) -> float:
+        elapsed = sum(self.frames)
+        return sum(self.ticks) * 1000 / elapsed if elapsed else 0.0
+
+    def summary(self) -> dict:
+        def average(values) -> float:
+            return sum(values) / len(values) if values else 0.0
+
+        return {
+            "fps": self.fps,
+            "tps": self.tps,
+            "frame_ms": {"avg": average(self.frames), "max": max(self.frames, default=0.0)},
+            "phases": {
+                p: {"avg": average(v), "max": max(v, default=0.0)} for p, v in self.phases.items()
+            },
+            "overruns": dict(self.overruns),
+            "skipped_renders": self.skipped_renders,
+            "dropped_ticks": self.dropped_ticks,
+            "frames": self.total_frames,
+            "ticks": self.total_ticks
+        }
+
+class VirtualClock:
+    """Clock that never sleeps, every tick is exactly frame_ms of virtual time.
+    For headless runs: deterministic, and as fast as the machine allows."""
+    def __init__(self, frame_ms: float = 1000 / DEFAULT_RENDER_RATE):
+        self.frame_ms = frame_ms
+        self.elapsed = 0.0 # Virtual ms since the first tick
+
+    def tick(self, rate: int = 0) -> float:
+        self.elapsed += self.frame_ms
+        return self.frame_ms
+
+class Scheduler:
+    """Fixed-step game loop scheduling.
+    Sim ticks run at tick_rate off an accumulated time buffer, frames at render_rate.
+    Catch-up is capped at max_catch_up steps per frame, anything beyond that is
+    dropped instead of spiralling. When updates blow the frame budget, rendering
+    is skipped (at most max_frame_skip frames in a row).
+    With interpolate on, frames between sim ticks draw movers part way
+    between their last two sim positions (see Stage.interpolate), so the
+    sim can tick slower than the display without stutter.
+    The clock only needs tick(rate) -> ms since the last call, like pygame's Clock."""
+    def __init__(self, tick_rate: int = DEFAULT_TICK_RATE, render_rate: int = DEFAULT_RENDER_RATE,
+        max_catch_up: int = DEFAULT_MAX_CATCH_UP, max_frame_skip: int = DEFAULT_MAX_FRAME_SKIP,
+        budgets: dict[str, float] = None, clock=None, stats_window: int = STATS_WINDOW,
+        interpolate: bool = False):
+        self.tick_rate = tick_rate
+        self.ms_per_tick = 1000 / tick_rate
+        self.render_rate = render_rate
+        self.max_catch_up = max_catch_up
+        self.max_frame_skip = max_frame_skip
+        self.interpolate = interpolate
+        self.clock = clock if clock is not None else pygame.time.Clock()
+
+        # Per-phase budgets in ms, by default update & render share one frame
+        frame_ms = 1000 / render_rate if render_rate else self.ms_per_tick
+        self.budgets = {"events": None, "update": frame_ms, "render": frame_ms}
+        if budgets is not None:
+            self.budgets.update(budgets)
+
+        self.stats = FrameStats(stats_window)
+        self.time_buffer = 0.0 # Sim time owed, in ms
+        self._skipped_in_a_row = 0
+
+    @property
+    def alpha(self) -> float:
+        """How far (0..1) real time is between the last sim tick and the next."""
+        return min(self.time_buffer / self.ms_per_tick, 1.0)
+
+    def start(self):
+        """Reset the clock, so time spent before the loop isn't owed as ticks."""
+        self.clock.tick(self.render_rate)
+        self.time_buffer = 0.0
+
+    def frame(self, events: Callable[[], None], update: Callable[[], None], render: Callable[[], None]) -> int:
+        """Run one frame: poll events once, catch the sim up, render (unless over budget),
+        then wait for the next frame. Returns the number of sim ticks run."""
+        start = time.perf_counter()
+        with PROFILER.section("events"):
+            events()
+        self.stats.record("events", (time.perf_counter() - start) * 1000, self.budgets["events"])
+
+        start = time.perf_counter()
+        ticks = 0
+        while self.time_buffer >= self.ms_per_tick and ticks < self.max_catch_up:
+            with PROFILER.section("update"):
+                update()
+            self.time_buffer -= self.ms_per_tick
+            ticks += 1
+        if self.time_buffer >= self.ms_per_tick:
+            # Too far behind to ever catch up, let the sim run slow instead
+            dropped = int(self.time_buffer // self.ms_per_tick)
+            self.time_buffer -= dropped * self.ms_per_tick
+            self.stats.dropped_ticks += dropped
+            logging.debug(f"Scheduler: dropped {dropped} ticks")
+        update_ms = (time.perf_counter() - start) * 1000
+        self.stats.record("update", update_ms, self.budgets["update"])
+
+        update_budget = self.budgets["update"]
+        if update_budget is not None and update_ms > update_budget and self._skipped_in_a_row < self.max_frame_skip:
+            self._skipped_in_a_row += 1
+            self.stats.skipped_renders += 1
+        else:
+            self._skipped_in_a_row = 0
+            start = time.perf_counter()
+            with PROFILER.section("render"):
+                render()
+            self.stats.record("render", (time.perf_counter() - start) * 1000, self.budgets["render"])
+
+        # Wait out the rest of the frame; the whole frame counts toward sim time owed
+        frame_ms = self.clock.tick(self.render_rate)
+        self.time_buffer += frame_ms
+        self.stats.end_frame(frame_ms, ticks)
+        return ticks
@@ -0,0 +1,180 @@
+import logging
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Hashable, Iterable
+
+from pyqtree import Index
+
+# Bounding boxes are (left, top, right, bottom), same as pyqtree
+BBox = tuple[float, float, float, float]
+
+DEFAULT_CELL_SIZE = 64
+
+class SpatialIndex(ABC):
+    """Interface for the Stage's collision index.
+    Mirrors the pyqtree Index API (insert/remove/intersect),
+    plus an incremental move for sprites changing position."""
+
+    @abstractmethod
+    def insert(self, item: Hashable, bbox: BBox):
+        pass
+
+    @abstractmethod
+    def remove(self, item: Hashable, bbox: BBox):
+        pass
+
+    @abstractmethod
+    def intersect(self, bbox: BBox) -> list:
+        pass
+
+    def move(self, item: Hashable, old_bbox: BBox, new_bbox: BBox):
+        """Relocate an item already in the index.
+        Default is a plain remove & insert, backends can do better."""
+        self.remove(item, old_bbox)
+        self.insert(item, new_bbox)
+
+class QuadtreeIndex(SpatialIndex):
+    """pyqtree backed index. Every move rebalances the tree."""
+    def __init__(self, bbox: BBox, **kwargs):
+        self._index = Index(bbox=bbox, **kwargs)
+
+    def insert(self, item: Hashable, bbox: BBox):
+        self._index.insert(item, bbox)
+
+    def remove(self, item: Hashable, bbox: BBox):
+        self._index.remove(item, bbox)
+
+    def intersect(self, bbox: BBox) -> list:
+        return self._index.intersect(bbox)
+
+class SpatialHash(SpatialIndex):
+    """Uniform grid spatial hash.
+    Items are bucketed into every cell their bbox touches.
+    Moving within the same cells is O(1), and only touched cells change otherwise."""
+    def __init__(self, bbox: BBox = None, cell_size: int = DEFAULT_CELL_SIZE):
+        # bbox kept for parity with pyqtree, grid itself is unbounded
+        self.bbox = bbox
+        self.cell_size = cell_size
+        self._cells = dict() # type: dict[tuple[int, int], set]
+        self._bboxes = dict() # type: dict[Hashable, BBox]
+
+    def __len__(self):
+        return len(self._bboxes)
+
+    def _cell_range(self, bbox: BBox) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (int(bbox[0] // size), int(bbox[1] // size), int(bbox[2] // size), int(bbox[3] // size))
+
+    def _add_to_cells(self, item, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[(cx, cy)] = {item}
+                else:
+                    cell.add(item)
+
+    def _remove_from_cells(self, item, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(item)
+                    if not cell:
+                        # Keep the grid sparse
+                        del cells[(cx, cy)]
+
+    def insert(self, item: Hashable, bbox: BBox):
+        self._bboxes[item] = bbox
+        self._add_to_cells(item, self._cell_range(bbox))
+
+    def remove(self, item: Hashable, bbox: BBox = None):
+        # Stored bbox is authoritative, passed bbox kept for API parity
+        stored = self._bboxes.pop(item, None)
+        if stored is None:
+            logging.warning(f"SpatialHash: removing unknown item {item}")
+            return
+        self._remove_from_cells(item, self._cell_range(stored))
+
+    def move(self, item: Hashable, old_bbox: BBox, new_bbox: BBox):
+        stored = self._bboxes.get(item)
+        if stored is None:
+            self.insert(item, new_bbox)
+            return
+        self._bboxes[item] = new_bbox
+
+        old_range = self._cell_range(stored)
+        new_range = self._cell_range(new_bbox)
+        if old_range == new_range:
+            # Still inside the same cells, nothing to re-bucket
+            return
+
+        self._remove_from_cells(item, old_range)
+        self._add_to_cells(item, new_range)
+
+    def intersect(self, bbox: BBox) -> list:
+        """Items whose bbox overlaps the query bbox.
+        Edges touching count as overlap, matching pyqtree."""
+        left, top, right, bottom = bbox
+        x0, y0, x1, y1 = self._cell_range(bbox)
+        cells = self._cells
+        bboxes = self._bboxes
+
+        if x0 == x1 and y0 == y1:
+            # Single cell query, common case for small sprites
+            candidates = cells.get((x0, y0), ())
+        else:
+            candidates = set()
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is not None:
+                        candidates.update(cell)
+
+        results = []
+        for item in candidates:
+            b = bboxes[item]
+            if b[0] <= right and b[2] >= left and b[1] <= bottom and b[3] >= top:
+                results.append(item)
+        return results
+
+class StaticIndex:
+    """Immutable index for geometry that never moves (Walls, Solids, etc.).
+    Baked once at map load into packed arrays sorted by left edge.
+    Queries bisect on the left edges, so no rebalancing or hashing per frame."""
+    def __init__(self, entries: Iterable[tuple[Hashable, BBox]]):
+        ordered = sorted(entries, key=lambda e: e[1][0])
+        self.items = tuple(e[0] for e in ordered)
+        self.lefts = array("d", (e[1][0] for e in ordered))
+        self.tops = array("d", (e[1][1] for e in ordered))
+        self.rights = array("d", (e[1][2] for e in ordered))
+        self.bottoms = array("d", (e[1][3] for e in ordered))
+        # Widest entry bounds how far left of a query a hit can start
+        self.max_width = max((r - l for l, r in zip(self.lefts, self.rights)), default=0)
+
+    def __len__(self):
+        return len(self.items)
+
+    def intersect(self, bbox: BBox) -> list:
+        """Items whose bbox overlaps the query bbox, edges inclusive."""
+        left, top, right, bottom = bbox
+        start = bisect_left(self.lefts, left - self.max_width)
+        end = bisect_right(self.lefts, right)
+
+        results = []
+        rights, tops, bottoms = self.rights, self.tops, self.bottoms
+        for i in range(start, end):
+            if rights[i] >= left and tops[i] <= bottom and bottoms[i] >= top:
+                results.append(self.items[i])
+        return results
+
+# Registered backends, selectable by name on the Stage
+INDEX_BACKENDS = {
+    "hash": SpatialHash,
+    "quadtree": QuadtreeIndex
+}
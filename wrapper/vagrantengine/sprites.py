@@ -1,5 +1,6 @@
 import logging
 import os
+from itertools import chain
 
 import pygame
 import pygame.image
@@ -7,21 +8,35 @@ import pygame.transform
 import pygame.mask
 from pygame import Vector2
 from pygame.sprite import DirtySprite
-from pyqtree import Index
 
 from .animators import SpriteAnimator
+from .assets import alpha_surface
+from .spatial import SpatialIndex, StaticIndex
 from .tiled import TiledType
 
 # New Set of Classes around re-vamped TileMap loading system
-class TilemapSprite(DirtySprite):
-    def __init__(self, tilemap: pygame.Surface, **kwargs):
-        super().__init__()
-
-        self.image = tilemap
-        self.rect = tilemap.get_rect()
+# (Tile layers live in tilemap.ChunkedTilemapSprite)
+# Transparent placeholder surfaces & masks, shared per size
+_PLACEHOLDERS = dict() # type: dict[tuple[int, int], tuple[pygame.Surface, pygame.mask.Mask]]
+
+def placeholder(width, height) -> tuple[pygame.Surface, pygame.mask.Mask]:
+    size = (int(width), int(height))
+    shared = _PLACEHOLDERS.get(size)
+    if shared is None:
+        image = alpha_surface(size)
+        image.fill((0, 0, 0, 0))
+        # Fully transparent, so the mask is simply empty
+        shared = (image, pygame.mask.Mask(size))
+        _PLACEHOLDERS[size] = shared
+    return shared
 
 class GameSprite(DirtySprite):
-    def __init__(self, x, y, width, height, image=None, **kwargs):
+    # DirtySprite still brings a __dict__ (its own bookkeeping), ours stays out of it
+    __slots__ = ("name", "type", "rect", "image", "mask", "last_rect", "render_rect", "bbox", "last_bbox")
+    # DirtySprite looks it up with a default
+    _layer = 0
+
+    def __init__(self, x, y, width, height, image=None, mask=None, **kwargs):
         super().__init__()
 
         self.name = kwargs.get("name", self.__class__.__name__)
@@ -29,13 +44,26 @@ class GameSprite(DirtySprite):
         # self.rect = pygame.Rect(kwargs.get("x"), kwargs.get("y"), kwargs.get("width"), kwargs.get("height"))
         self.rect = pygame.Rect(x, y, width, height)
         if image is None:
-            self.image = pygame.Surface((width, height)).convert_alpha()
-            self.image.fill((0, 0, 0, 0))
+            # Shared transparent placeholder, with its (empty) mask
+            self.image, placeholder_mask = placeholder(width, height)
+            if mask is None:
+                mask = placeholder_mask
         else:
             self.image = image
 
-        self.last_rect = None # type: pygame.Rect
-        if self.image is not None:
+        # Own rect, rolled forward in place every update
+        self.last_rect = pygame.Rect(self.rect) # type: pygame.Rect
+        # bbox tuples are cached, refreshed only when the rect changes (see refresh_bbox)
+        self.refresh_bbox()
+        self.last_bbox = self.bbox # type: tuple[int, int, int, int]
+        # Where to draw between sim ticks (see Stage.interpolate), None draws at rect
+        self.render_rect = None # type: pygame.Rect
+        # Masks are prebuilt per slice/tile and shared, only build one as a fallback
+        if self.type is not None and not self.type.pixel_collision:
+            self.mask = None
+        elif mask is not None:
+            self.mask = mask
+        else:
             self.mask = pygame.mask.from_surface(self.image)
 
         # self.images = None # type: list[pygame.Surface]
@@ -44,7 +72,29 @@ class GameSprite(DirtySprite):
         # Sprite comes with an abstract update method, override
     def update(self, *args, **kwargs) -> None:
         # Single frame is passing. Can count internally for frame/anim changes
-        self.last_rect = self.rect
+        self.last_rect.update(self.rect)
+        self.last_bbox = self.bbox
+
+    def refresh_bbox(self):
+        """Re-cache bbox, call after changing rect in place."""
+        rect = self.rect
+        self.bbox = (rect.left, rect.top, rect.right, rect.bottom)
+
+    def move_ip(self, dx, dy):
+        """Move in place, no new Rect."""
+        self.rect.move_ip(dx, dy)
+        self.refresh_bbox()
+        self.dirty = 1
+
+    def reset(self, x, y):
+        """Back to a fresh spawn at x, y, for sprites reused from a SpritePool."""
+        self.rect.topleft = (x, y)
+        self.last_rect.update(self.rect)
+        self.refresh_bbox()
+        self.last_bbox = self.bbox
+        self.render_rect = None
+        self.visible = 1
+        self.dirty = 1
 
     @property
     def x(self):
@@ -74,44 +124,73 @@ class GameSprite(DirtySprite):
     def bottom(self):
         return self.rect.bottom
 
-    # These properteis are for use with pyqtree, movement/collision detection
-    @property
-    def bbox(self):
-        return (self.rect.left, self.rect.top, self.rect.right, self.rect.bottom)
-
-    @property
-    def last_bbox(self):
-        return (self.last_rect.left, self.last_rect.top, self.last_rect.right, self.last_rect.bottom)
-
     @property
     def is_moving(self):
-        return self.rect != self.last_rect
+        return self.bbox != self.last_bbox
 
 class AnimatedSprite(GameSprite):
-    def __init__(self, images: list[pygame.Surface], animations, **kwargs):
+    # No slots of its own, ActorSprite can't lay out two sibling slot sets.
+    # images, masks & animator live in the __dict__ DirtySprite brings anyway
+    __slots__ = ()
+
+    def __init__(self, images: list[pygame.Surface], animations, masks: list[pygame.mask.Mask] = None, **kwargs):
         super().__init__(**kwargs)
 
         self.images = images
-        self.animator = SpriteAnimator(animations)
-
-    def update(self, *args, **kwargs) -> None:
-        super().update(args, kwargs)
-        self.animator.step()
-            
-        if self.animator.dirty:
-            # Change in animation frame
-            self.image = self.images[self.animator.current_slice]
-            self.mask = pygame.mask.from_surface(self.image)
-            self.dirty = 1
-            self.animator.dirty = False
+        # One mask per slice, shared with every sprite using the same sheet
+        if self.mask is None:
+            self.masks = None
+        elif masks is None:
+            self.masks = [pygame.mask.from_surface(i) for i in images]
+        else:
+            self.masks = masks
+        # Stepped in bulk by the stage's AnimationSystem, not per update
+        self.animator = SpriteAnimator(animations, on_change=self.show_slice)
+        self._initial_slice = (self.image, self.mask)
+
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.animator.reset()
+        self.image, self.mask = self._initial_slice
+
+    def show_slice(self, index: int):
+        """Change in animation frame"""
+        self.image = self.images[index]
+        if self.masks is not None:
+            self.mask = self.masks[index]
+        self.dirty = 1
 
 class MoveableSprite(GameSprite):
+    __slots__ = ("_store", "_slot", "_movement_vector", "speed")
+
     def __init__(self, **kwargs):
+        # entities.EntityStore slot, when attached the store owns position & velocity
+        self._store = None
+        self._slot = -1
+        self._movement_vector = (0, 0)
+
         super().__init__(**kwargs)
 
         self.movement_vector = (0, 0) # init, not moving
         self.speed = kwargs.get("speed", 3)
 
+    @property
+    def movement_vector(self) -> tuple:
+        if self._store is not None:
+            return self._store.get_vector(self._slot)
+        return self._movement_vector
+
+    @movement_vector.setter
+    def movement_vector(self, vector: tuple):
+        if self._store is not None:
+            self._store.set_vector(self._slot, vector)
+        else:
+            self._movement_vector = vector
+
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.movement_vector = (0, 0)
+
     def apply_movement_vector(self, x, y):
         """Build a movement vector for the actor.
         Is additive, can be called multiple times.
@@ -120,50 +199,65 @@ class MoveableSprite(GameSprite):
         dy = self.movement_vector[1] + (y * self.speed)
         self.movement_vector = (dx, dy)
 
-    def resolve_collisions(self, index: Index):
-        collisions = (o for o in index.intersect(self.bbox) if o != self)
+    def resolve_collisions(self, index: SpatialIndex, static_index: StaticIndex = None):
+        """Push the sprite out of any solids it overlaps.
+        Static geometry is checked first, then other movers in the dynamic index."""
+        static_hits = static_index.intersect(self.bbox) if static_index is not None else ()
+        collisions = chain(static_hits, (o for o in index.intersect(self.bbox) if o != self))
 
         # for o in index.intersect(self.bbox) if o != self:
 
         # TODO: Build Priority Index for movers/resolution
         for c in collisions:
-            if c.solid:
-                logging.info(f"{self.name} colliding with {c.name}")
-                index.remove(self, self.bbox)
-                # Calculate 'impact'
-                # 'Impact' is how much into the target the mover has impacted
-                # Calculate by checking solid boundaries - (minus) mover boundaries
-                # Ex: What is bigger? Solid right - mover right, or solid bottom - mover bottom
-
-                # Calculate which cardinal direction the mover is from the solid
-                cardinal = Vector2(self.center) - Vector2(c.center)
-                # Step 2: Simplify situations in which mover is only in one direction
-                if cardinal.x < 0:
-                    horizontal_impact = c.left - self.right
-                elif cardinal.x > 0:
-                    horizontal_impact = c.right - self.left
-                else: horizontal_impact = None
-                logging.info(f"Horizontal Impact: {horizontal_impact}")
-
-                if cardinal.y < 0:
-                    vertical_impact = c.top - self.bottom
-                elif cardinal.y > 0:
-                    vertical_impact = c.bottom - self.top
-                else: vertical_impact = None
-                logging.info(f"Vertical Impact: {vertical_impact}")
-
-                if vertical_impact is None or (horizontal_impact is not None and abs(horizontal_impact) < abs(vertical_impact)):
-                    self.rect = self.rect.move(horizontal_impact, 0)
-                elif horizontal_impact is None or (vertical_impact is not None and abs(vertical_impact) < abs(horizontal_impact)):
-                    self.rect = self.rect.move(0, vertical_impact)
-                index.insert(self, self.bbox)
+            if getattr(c, "solid", False):
+                old_bbox = self.bbox
+                self.push_out_of(c)
+                index.move(self, old_bbox, self.bbox)
+
+    def push_out_of(self, c: GameSprite):
+        """Move the sprite out of a solid along the axis of least impact."""
+        logging.info(f"{self.name} colliding with {c.name}")
+        # Calculate 'impact'
+        # 'Impact' is how much into the target the mover has impacted
+        # Calculate by checking solid boundaries - (minus) mover boundaries
+        # Ex: What is bigger? Solid right - mover right, or solid bottom - mover bottom
+
+        # Calculate which cardinal direction the mover is from the solid
+        cardinal = Vector2(self.center) - Vector2(c.center)
+        # Step 2: Simplify situations in which mover is only in one direction
+        if cardinal.x < 0:
+            horizontal_impact = c.left - self.right
+        elif cardinal.x > 0:
+            horizontal_impact = c.right - self.left
+        else: horizontal_impact = None
+        logging.info(f"Horizontal Impact: {horizontal_impact}")
+
+        if cardinal.y < 0:
+            vertical_impact = c.top - self.bottom
+        elif cardinal.y > 0:
+            vertical_impact = c.bottom - self.top
+        else: vertical_impact = None
+        logging.info(f"Vertical Impact: {vertical_impact}")
+
+        if horizontal_impact is None and vertical_impact is None:
+            # Dead center, no way to tell which side to leave by
+            return
+        if vertical_impact is None or (horizontal_impact is not None and abs(horizontal_impact) < abs(vertical_impact)):
+            self.move_ip(horizontal_impact, 0)
+        elif horizontal_impact is None or (vertical_impact is not None and abs(vertical_impact) < abs(horizontal_impact)):
+            self.move_ip(0, vertical_impact)
 
     def update(self, *args, **kwargs) -> None:
+        if self._store is not None:
+            # EntityStore.step integrates & rolls last_rect forward in bulk
+            return
         super().update(*args, **kwargs)
-        if any(v != 0 for v in self.movement_vector):
-            self.rect = self.rect.move(self.movement_vector)
-            self.dirty = 1
+        dx, dy = self.movement_vector
+        if dx or dy:
+            self.move_ip(dx, dy)
 
 class ActorSprite(MoveableSprite, AnimatedSprite):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
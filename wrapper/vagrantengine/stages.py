@@ -0,0 +1,104 @@
+import logging
+
+import pygame
+import pygame.display
+
+from .assets import ASSET_CACHE, AssetCache
+from .eventhandler import get_key_bindings, register_game, register_key_bindings
+from .game import Stage
+from .map_loader import MapLoader
+from .rendering import Renderer
+
+class StackedStage:
+    """A stage on the stack, with what it needs to be resumed."""
+    def __init__(self, stage: Stage, renderer: Renderer, bindings: dict[int, str]):
+        self.stage = stage
+        self.renderer = renderer # None for headless stages
+        self.bindings = bindings
+        self.frame = None # type: pygame.Surface # Last frame drawn, while suspended
+
+class StageStack:
+    """Stages stacked overworld -> menu -> battle, only the top one ticks & renders.
+    Stages underneath are suspended: never updated or drawn, their last rendered
+    frame is kept as a surface the stage above uses as its backdrop.
+    Every stage loads through the one asset cache (see loader), so pushing
+    or popping never reloads tilesets or spritesheets."""
+    def __init__(self, cache: AssetCache = None):
+        self.cache = cache if cache is not None else ASSET_CACHE
+        self._stack = [] # type: list[StackedStage]
+
+    def __len__(self):
+        return len(self._stack)
+
+    def __contains__(self, stage: Stage):
+        return any(s.stage is stage for s in self._stack)
+
+    @property
+    def top(self) -> Stage:
+        return self._stack[-1].stage if self._stack else None
+
+    @property
+    def renderer(self) -> Renderer:
+        return self._stack[-1].renderer if self._stack else None
+
+    def renderer_for(self, stage: Stage) -> Renderer:
+        for s in self._stack:
+            if s.stage is stage:
+                return s.renderer
+        return None
+
+    def loader(self, assets_path: str, **options) -> MapLoader:
+        """MapLoader on the shared cache, for stages going on this stack."""
+        return MapLoader(assets_path, cache=self.cache, **options)
+
+    def push(self, stage: Stage, renderer: Renderer = None, bindings: dict[int, str] = None, backdrop: bool = True):
+        """Suspend the current top and make stage the one running.
+        Bindings default to whatever is bound now. With backdrop, the suspended
+        stage's last frame shows wherever the new stage doesn't draw."""
+        if bindings is None:
+            bindings = get_key_bindings()
+        if self._stack:
+            suspended = self._stack[-1]
+            display = pygame.display.get_surface()
+            if suspended.renderer is not None and display is not None:
+                suspended.frame = display.copy()
+            if renderer is not None and backdrop:
+                renderer.backdrop = suspended.frame
+            logging.info(f"Stage suspended: {suspended.stage}")
+
+        self._stack.append(StackedStage(stage, renderer, bindings))
+        self._activate()
+
+    def pop(self) -> Stage:
+        """Drop the top stage and resume the one below it, where it left off."""
+        popped = self._stack.pop()
+        if self._stack:
+            resumed = self._stack[-1]
+            resumed.frame = None
+            if resumed.renderer is not None:
+                # Whatever the popped stage drew is still on the display
+                resumed.renderer.redraw()
+            self._activate()
+            logging.info(f"Stage resumed: {resumed.stage}")
+        return popped.stage
+
+    def _activate(self):
+        top = self._stack[-1]
+        register_game(top.stage)
+        if top.bindings is not None:
+            register_key_bindings(top.bindings)
+
+    def update(self):
+        self._stack[-1].stage.update()
+
+    def render(self, alpha: float = None):
+        """Render the top stage, part way to its next tick when given an alpha."""
+        top = self._stack[-1]
+        if top.renderer is None:
+            return
+        if alpha is not None:
+            top.stage.interpolate(alpha)
+        top.renderer.render()
+
+# Engine-wide stage stack, the driver runs whatever is on top
+STAGE_STACK = StageStack()
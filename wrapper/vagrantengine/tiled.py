@@ -1,10 +1,28 @@
+import base64
+import gzip
 import logging
 import os
+import zlib
 from typing import Any
 
 import pygame
 
+try:
+    import numpy as np
+except ImportError: # Optional, only needed for encoded tile layers
+    np = None
+
+# Tiled keeps flip flags in the top bits of every gid
+FLIPPED_HORIZONTALLY = 0x80000000
+FLIPPED_VERTICALLY = 0x40000000
+FLIPPED_DIAGONALLY = 0x20000000
+ROTATED_HEXAGONAL_120 = 0x10000000
+FLIP_FLAGS = 0xF0000000
+GID_MASK = 0x0FFFFFFF
+
 class TiledType:
+    """An objecttypes.json entry, shared by every sprite of the type.
+    Sprites get its properties as class attributes (see prototypes.PrototypeRegistry)."""
     def __init__(self, name: str, props: list):
         self.name = name
         self.additional_properties = dict() # type: dict[str, Any]
@@ -12,13 +30,54 @@ class TiledType:
             prop_name = p.get("name")
             self.additional_properties[prop_name] = p.get("value")
 
-class TiledObject:
-    def __init__(self, id: int, name: str, tiledtype: TiledType, x: float, y: float, width: float, height: float, **kwargs):
-        """Convert Dict to Concrete Object for Code purposes"""
-        self.id = id
-        self.name = name
-        
-        self.rect = pygame.Rect(x, y, width, height)
-        self.type = tiledtype
+        # Types that never do pixel-level tests can skip masks entirely
+        self.pixel_collision = self.additional_properties.get("pixel_collision", True)
+
+def _zstd_decompress(data: bytes) -> bytes:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compressed layers require the zstandard package")
+    # Streaming decompressor, Tiled doesn't always write the content size
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+DECOMPRESSORS = {
+    None: lambda data: data,
+    "": lambda data: data,
+    "zlib": zlib.decompress,
+    "gzip": gzip.decompress,
+    "zstd": _zstd_decompress
+}
+
+def decode_layer_data(layer: dict):
+    """Tile layer gids as a (rows, columns) uint32 array, flip flags still set.
+    Handles plain arrays as well as base64 data, optionally zlib/gzip/zstd compressed.
+    Without numpy, plain array layers are returned as the flat list they are."""
+    data = layer["data"]
+    encoding = layer.get("encoding", "csv")
+    if np is None:
+        if encoding == "csv":
+            return data
+        raise ImportError(f"{encoding} encoded layers require numpy")
+
+    shape = (layer["height"], layer["width"])
+    if encoding == "csv": # Tiled's name for the plain json array
+        return np.asarray(data, dtype=np.uint32).reshape(shape)
+    if encoding != "base64":
+        raise ValueError(f"Unsupported tile layer encoding: {encoding}")
+
+    compression = layer.get("compression")
+    decompress = DECOMPRESSORS.get(compression)
+    if decompress is None:
+        raise ValueError(f"Unsupported tile layer compression: {compression}")
+    raw = decompress(base64.b64decode(data))
+    # Little-endian u32 per cell, decoded in one go
+    return np.frombuffer(raw, dtype="<u4").astype(np.uint32, copy=False).reshape(shape)
 
-        self.gid = kwargs.get("gid")
\ No newline at end of file
+def flip_tile(tile: pygame.Surface, flags: int) -> pygame.Surface:
+    """Apply Tiled flip flags to a tile: diagonal (x/y swap) first, then horizontal & vertical.
+    Hexagonal rotation is ignored, maps are orthogonal."""
+    if flags & FLIPPED_DIAGONALLY:
+        # Transpose: a quarter turn, then flipped vertically
+        tile = pygame.transform.flip(pygame.transform.rotate(tile, 90), False, True)
+    return pygame.transform.flip(tile, bool(flags & FLIPPED_HORIZONTALLY), bool(flags & FLIPPED_VERTICALLY))
\ No newline at end of file
@@ -0,0 +1,158 @@
+import logging
+from collections import OrderedDict
+
+import pygame
+from pygame.sprite import DirtySprite
+
+from .assets import alpha_surface
+from .tiled import FLIP_FLAGS, GID_MASK, flip_tile
+
+try:
+    import numpy as np
+except ImportError: # Optional, chunks are then baked tile by tile
+    np = None
+
+DEFAULT_CHUNK_TILES = 8 # Chunk edge, in tiles
+DEFAULT_MAX_CHUNKS = 64 # LRU budget of baked chunks, per layer
+BACKGROUND = (0, 0, 0, 255)
+
+class ChunkedTilemapSprite(DirtySprite):
+    """Tile layer split into fixed-size chunks, baked lazily.
+    Only chunks the Camera actually draws are ever turned into Surfaces;
+    far away chunks are evicted LRU. There's no full-map image, the Camera
+    calls draw_region for the parts of the layer it needs.
+    Gids may be a flat list or a (rows, columns) array, with Tiled flip flags."""
+    def __init__(self, gids, columns: int, rows: int, tile_width: int, tile_height: int,
+        tileset: dict[int, pygame.Surface], chunk_tiles: int = DEFAULT_CHUNK_TILES,
+        max_chunks: int = DEFAULT_MAX_CHUNKS, **kwargs):
+        super().__init__()
+
+        self.name = kwargs.get("name", self.__class__.__name__)
+        if np is not None:
+            # 2D view, chunks slice their block out of it (no copy for arrays & buffers)
+            gids = np.asarray(gids, dtype=np.uint32).reshape(rows, columns)
+        self.gids = gids
+        self.columns = columns
+        self.rows = rows
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.tileset = tileset
+        # Flipped variants of tiles, made on first use
+        self._flipped = dict() # type: dict[int, pygame.Surface]
+
+        self.chunk_tiles = chunk_tiles
+        self.chunk_width = chunk_tiles * tile_width
+        self.chunk_height = chunk_tiles * tile_height
+        self.chunk_columns = -(-columns // chunk_tiles) # Ceiling division
+        self.chunk_rows = -(-rows // chunk_tiles)
+        self.max_chunks = max_chunks
+
+        # Full layer size in pixels
+        self.map_rect = pygame.Rect(0, 0, columns * tile_width, rows * tile_height)
+        self._chunks = OrderedDict() # type: OrderedDict[tuple[int, int], pygame.Surface]
+
+        # Nothing baked up front, image is a placeholder
+        self.image = pygame.Surface((0, 0))
+        self.rect = pygame.Rect(self.map_rect)
+
+    @property
+    def baked_chunks(self) -> int:
+        return len(self._chunks)
+
+    def tile(self, gid: int) -> pygame.Surface:
+        """Tile image for a raw gid, flip flags applied."""
+        if not gid & FLIP_FLAGS:
+            return self.tileset[gid]
+        tile = self._flipped.get(gid)
+        if tile is None:
+            tile = flip_tile(self.tileset[gid & GID_MASK], gid & FLIP_FLAGS)
+            self._flipped[gid] = tile
+        return tile
+
+    def chunk_rect(self, cx: int, cy: int) -> pygame.Rect:
+        """World-space rect of a chunk, clipped to the map."""
+        return pygame.Rect(cx * self.chunk_width, cy * self.chunk_height,
+            self.chunk_width, self.chunk_height).clip(self.map_rect)
+
+    def chunk_range(self, view: pygame.Rect) -> tuple[int, int, int, int]:
+        """Inclusive (cx0, cy0, cx1, cy1) chunk range under a world-space view."""
+        view = view.clip(self.map_rect)
+        return (
+            view.left // self.chunk_width,
+            view.top // self.chunk_height,
+            max(view.right - 1, view.left) // self.chunk_width,
+            max(view.bottom - 1, view.top) // self.chunk_height
+        )
+
+    def bake_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """Blit a chunk's tiles into its own Surface."""
+        area = self.chunk_rect(cx, cy)
+        chunk = alpha_surface(area.size)
+        chunk.fill(BACKGROUND) # Opaque, like the old full-map surface
+
+        first_column = cx * self.chunk_tiles
+        first_row = cy * self.chunk_tiles
+        last_column = min(first_column + self.chunk_tiles, self.columns)
+        last_row = min(first_row + self.chunk_tiles, self.rows)
+
+        tile = self.tile
+        if np is not None:
+            # Whole block at once, Tiled uses 0 for an empty cell
+            block = self.gids[first_row:last_row, first_column:last_column]
+            rows, columns = np.nonzero(block)
+            blits = [
+                (tile(gid), (x, y)) for gid, x, y in zip(
+                    block[rows, columns].tolist(),
+                    (columns * self.tile_width).tolist(),
+                    (rows * self.tile_height).tolist()
+                )
+            ]
+        else:
+            blits = []
+            for row in range(first_row, last_row):
+                offset = row * self.columns
+                dest_y = (row - first_row) * self.tile_height
+                for column in range(first_column, last_column):
+                    gid = self.gids[offset + column]
+                    if gid == 0:
+                        continue
+                    blits.append((tile(gid), ((column - first_column) * self.tile_width, dest_y)))
+        chunk.blits(blits, doreturn=False)
+
+        return chunk
+
+    def get_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """Fetch a baked chunk, baking it on first use and evicting LRU."""
+        key = (cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        chunk = self.bake_chunk(cx, cy)
+        self._chunks[key] = chunk
+        while len(self._chunks) > self.max_chunks:
+            evicted, _ = self._chunks.popitem(last=False)
+            logging.debug(f"{self.name}: evicted chunk {evicted}")
+        return chunk
+
+    def draw_region(self, surface: pygame.Surface, area: pygame.Rect, offset: tuple[int, int]):
+        """Blit the world-space area of the layer onto surface, shifted by offset.
+        Blits straight out of the chunks, baking any that aren't resident yet."""
+        area = area.clip(self.map_rect)
+        if area.w <= 0 or area.h <= 0:
+            return
+
+        cx0, cy0, cx1, cy1 = self.chunk_range(area)
+        # Keep every chunk of the area resident, whatever the budget
+        self.max_chunks = max(self.max_chunks, (cx1 - cx0 + 1) * (cy1 - cy0 + 1))
+
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                chunk_rect = self.chunk_rect(cx, cy)
+                part = chunk_rect.clip(area)
+                surface.blit(
+                    self.get_chunk(cx, cy),
+                    (part.x + offset[0], part.y + offset[1]),
+                    part.move(-chunk_rect.x, -chunk_rect.y)
+                )